@@ -0,0 +1,146 @@
+# =====================================================
+#  atlas.py – Atlas de textures précalculé (démarrage rapide)
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame as pg
+
+# Format d'un fichier atlas :
+#   en-tête (ENTETE) : MAGIE, VERSION, taille de l'index JSON
+#   index            : {"cle": empreinte des sources, "taille": [largeur, hauteur],
+#                       "images": [[fichier, taille, x, y, largeur, hauteur], ...]}
+#   pixels           : l'atlas en RGBA, ligne par ligne
+#
+# Toutes les images (salles, icônes, textures), déjà mises à l'échelle aux
+# tailles utilisées, sont rangées dans une seule surface : au démarrage, une
+# lecture du fichier et une conversion remplacent le décodage et la mise à
+# l'échelle de chaque image. L'atlas est reconstruit dès qu'un fichier
+# source ou une taille demandée change (voir empreinte).
+MAGIE = b"BPAT"
+VERSION = 1
+ENTETE = struct.Struct("<4sBI")
+
+# Largeur de l'atlas ; les images sont rangées par étagères
+LARGEUR = 1024
+
+Demande = Tuple[str, int]   # (fichier dans le dossier des images, côté en pixels)
+
+
+def empreinte(dossier: str, demandes: Iterable[Demande]) -> str:
+    """Empreinte du contenu des fichiers sources et des tailles demandées."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(bytes((VERSION,)))
+    for nom, taille in sorted(set(demandes)):
+        h.update(f"{nom}\0{taille}\0".encode())
+        try:
+            with open(os.path.join(dossier, nom), "rb") as f:
+                h.update(hashlib.blake2b(f.read(), digest_size=16).digest())
+        except OSError:
+            h.update(b"absent")
+    return h.hexdigest()
+
+
+def ranger(tailles: Dict[Demande, Tuple[int, int]], largeur: int = LARGEUR):
+    """
+    Place les images dans l'atlas (étagères, les plus hautes d'abord).
+    Renvoie ({demande: (x, y)}, (largeur, hauteur)).
+    """
+    positions = {}
+    x = y = hauteur_etagere = 0
+    for demande in sorted(tailles, key=lambda d: (-tailles[d][1], d)):
+        w, h = tailles[demande]
+        if x + w > largeur:
+            x, y, hauteur_etagere = 0, y + hauteur_etagere, 0
+        positions[demande] = (x, y)
+        x += w
+        hauteur_etagere = max(hauteur_etagere, h)
+    return positions, (max(largeur, max((w for w, _ in tailles.values()), default=0)), y + hauteur_etagere)
+
+
+def construire(chemin: str, images: Dict[Demande, pg.Surface], cle: str) -> int:
+    """Écrit l'atlas des images ; renvoie la taille du fichier."""
+    positions, taille = ranger({d: s.get_size() for d, s in images.items()})
+    atlas = pg.Surface(taille, pg.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    index = []
+    for (nom, cote), (x, y) in positions.items():
+        surf = images[(nom, cote)]
+        atlas.blit(surf, (x, y))
+        index.append([nom, cote, x, y, *surf.get_size()])
+    texte = json.dumps({"cle": cle, "taille": list(taille), "images": index}).encode()
+    donnees = ENTETE.pack(MAGIE, VERSION, len(texte)) + texte + pg.image.tobytes(atlas, "RGBA")
+
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    tmp = chemin + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(donnees)
+    os.replace(tmp, chemin)
+    return len(donnees)
+
+
+def charger(chemin: str, cle: str) -> Optional[Dict[Demande, pg.Surface]]:
+    """
+    Images de l'atlas, ou None s'il n'existe pas, est illisible ou a été
+    construit pour d'autres sources (cle différente). Demande un affichage
+    initialisé (convert_alpha).
+    """
+    try:
+        with open(chemin, "rb") as f:
+            donnees = f.read()
+        magie, version, n = ENTETE.unpack_from(donnees)
+        if magie != MAGIE or version != VERSION:
+            return None
+        index = json.loads(donnees[ENTETE.size:ENTETE.size + n])
+        if index["cle"] != cle:
+            return None
+        taille = tuple(index["taille"])
+        atlas = pg.image.frombytes(donnees[ENTETE.size + n:], taille, "RGBA").convert_alpha()
+    except (OSError, ValueError, KeyError, struct.error, pg.error):
+        return None
+    return {(nom, cote): atlas.subsurface((x, y, w, h)) for nom, cote, x, y, w, h in index["images"]}
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import interface
+
+    parser = argparse.ArgumentParser(description="Construit l'atlas des images de l'interface.")
+    parser.add_argument("--chemin", default=interface.ATLAS)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    demandes = [(nom, taille) for _, _, nom, taille in interface.asset_requests({}, {})]
+    cle = empreinte(interface.ASSETS, demandes)
+
+    debut = time.perf_counter()
+    images = {}
+    for nom, taille in demandes:
+        try:
+            images[(nom, taille)] = interface.load_png(nom, taille)
+        except (OSError, pg.error) as exc:
+            print(f"{nom} ignoré : {exc}")
+    octets = construire(args.chemin, images, cle)
+    print(f"{len(images)} images décodées en {time.perf_counter() - debut:.2f} s → {args.chemin} ({octets} octets)")
+
+    debut = time.perf_counter()
+    charge = charger(args.chemin, empreinte(interface.ASSETS, demandes))
+    print(f"relecture : {len(charge)} images en {(time.perf_counter() - debut) * 1000:.1f} ms (empreinte comprise)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
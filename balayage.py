@@ -0,0 +1,301 @@
+# =====================================================
+#  balayage.py – Balayages des constantes d'équilibrage
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from doors import Rooms
+from moteur import MAX_ACTIONS, VERSION_MOTEUR
+from politiques import POLITIQUES
+from regles import Regles, REGLES_DEFAUT
+from simulation import METRIQUES, _jouer_plage, lancer_lot
+from statistiques import quantile_normal
+
+# Type de chaque constante de Regles (int ou float), pour convertir les valeurs des axes
+TYPES_CONSTANTES = {f.name: type(f.default) for f in fields(Regles) if isinstance(f.default, (int, float))}
+
+# Axe « couts_gemmes.CLE » : coût en gemmes de la salle CLE (voir Regles.couts_gemmes)
+PREFIXE_COUT = "couts_gemmes."
+
+
+# ==========================
+#  GÉNÉRATION DES RÈGLES
+# ==========================
+
+def _type_axe(nom: str) -> type:
+    if nom.startswith(PREFIXE_COUT):
+        if nom[len(PREFIXE_COUT):] not in Rooms.ROOMS_DB:
+            raise ValueError(f"Salle inconnue : {nom[len(PREFIXE_COUT):]}")
+        return int
+    if nom not in TYPES_CONSTANTES:
+        raise ValueError(f"Constante inconnue : {nom}")
+    return TYPES_CONSTANTES[nom]
+
+
+def _convertir(nom: str, valeur):
+    """
+    Valeur d'un axe au type de sa constante. ValueError pour une valeur
+    non entière d'une constante entière, plutôt que de la tronquer.
+    """
+    if _type_axe(nom) is int:
+        x = float(valeur)
+        if not x.is_integer():
+            raise ValueError(f"{nom} attend un entier : {valeur}")
+        return int(x)
+    return float(valeur)
+
+
+def _regles(base: Regles, valeurs: Dict[str, object]) -> Regles:
+    """Copie de base avec les valeurs des axes, coûts de salles compris."""
+    couts = dict(base.couts_gemmes)
+    constantes = {}
+    for nom, v in valeurs.items():
+        if nom.startswith(PREFIXE_COUT):
+            couts[nom[len(PREFIXE_COUT):]] = v
+        else:
+            constantes[nom] = v
+    if couts != dict(base.couts_gemmes):
+        constantes["couts_gemmes"] = couts
+    return base.modifier(**constantes)
+
+
+def grille(axes: Dict[str, Sequence], base: Regles = REGLES_DEFAUT) -> List[Regles]:
+    """Toutes les combinaisons des valeurs des axes {constante: valeurs}."""
+    noms = list(axes)
+    return [_regles(base, {n: _convertir(n, v) for n, v in zip(noms, combinaison)})
+            for combinaison in itertools.product(*(axes[n] for n in noms))]
+
+
+def aleatoire(axes: Dict[str, Tuple[float, float]], nb: int, graine: int = 0,
+              base: Regles = REGLES_DEFAUT) -> List[Regles]:
+    """nb règles tirées uniformément dans les intervalles {constante: (min, max)}."""
+    rng = random.Random(graine)
+    regles = []
+    for _ in range(nb):
+        valeurs = {}
+        for nom, (lo, hi) in axes.items():
+            if _type_axe(nom) is int:
+                valeurs[nom] = rng.randint(_convertir(nom, lo), _convertir(nom, hi))
+            else:
+                valeurs[nom] = _convertir(nom, rng.uniform(lo, hi))
+        regles.append(_regles(base, valeurs))
+    return regles
+
+
+# ==========================
+#  CACHE DES RÉSULTATS
+# ==========================
+
+class CacheResultats:
+    """
+    Résultats agrégés par bloc de graines, stockés dans un dossier (un
+    fichier JSON par bloc). La clé d'un bloc est (version du moteur,
+    empreinte des règles, politique, graines [debut, fin), crn,
+    max_actions) : relancer un balayage ne rejoue que les blocs absents,
+    et un changement du moteur (VERSION_MOTEUR) invalide tout le cache.
+    """
+
+    def __init__(self, dossier: str):
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+
+    def _chemin(self, cle: tuple) -> str:
+        return os.path.join(self.dossier, "_".join(str(x) for x in cle) + ".json")
+
+    def lire(self, cle: tuple) -> Optional[dict]:
+        try:
+            with open(self._chemin(cle), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def ecrire(self, cle: tuple, sommes: dict) -> None:
+        # Écriture atomique : un balayage interrompu ne laisse pas de bloc à moitié écrit
+        fd, tmp = tempfile.mkstemp(dir=self.dossier, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(sommes, f)
+        os.replace(tmp, self._chemin(cle))
+
+
+def _sommes_plage(nom_politique: str, debut: int, fin: int, max_actions: int,
+                  crn: bool, regles: Regles) -> dict:
+    """Joue un bloc de graines et n'en garde que les sommes et sommes des carrés."""
+    resultats = _jouer_plage(nom_politique, debut, fin, max_actions, crn, regles)
+    valeurs = {m: [float(getattr(r, m)) for r in resultats] for m in METRIQUES}
+    return {
+        "n": len(resultats),
+        "sommes": {m: sum(v) for m, v in valeurs.items()},
+        "carres": {m: sum(x * x for x in v) for m, v in valeurs.items()},
+    }
+
+
+# ==========================
+#  BALAYAGE
+# ==========================
+
+@dataclass
+class PointBalayage:
+    """Résultats d'une configuration de règles."""
+    regles: Regles
+    parties: int
+    moyennes: Dict[str, float]
+    ecarts_types: Dict[str, float]
+    blocs_calcules: int
+
+    def demi_largeur(self, metrique: str, confiance: float = 0.95) -> float:
+        if self.parties < 2:
+            return math.inf
+        return quantile_normal(confiance) * self.ecarts_types[metrique] / math.sqrt(self.parties)
+
+
+def _point(regles: Regles, blocs: List[dict], calcules: int) -> PointBalayage:
+    n = sum(b["n"] for b in blocs)
+    moyennes, ecarts = {}, {}
+    for m in METRIQUES:
+        s = sum(b["sommes"][m] for b in blocs)
+        s2 = sum(b["carres"][m] for b in blocs)
+        moyennes[m] = s / n if n else 0.0
+        ecarts[m] = math.sqrt(max(0.0, (s2 - n * moyennes[m] ** 2) / (n - 1))) if n > 1 else 0.0
+    return PointBalayage(regles, n, moyennes, ecarts, calcules)
+
+
+def balayer(configs: Sequence[Regles], nom_politique: str, nb_parties: int,
+            graine_depart: int = 0, processus: Optional[int] = None,
+            cache: Optional[CacheResultats] = None, taille_bloc: int = 1000,
+            crn: bool = True, max_actions: int = MAX_ACTIONS) -> List[PointBalayage]:
+    """
+    Évalue chaque configuration de règles sur les mêmes graines
+    [graine_depart, graine_depart + nb_parties).
+
+    Les graines sont découpées en blocs de taille_bloc ; les blocs absents
+    du cache, toutes configurations confondues, sont répartis sur
+    `processus` processus (tous les cœurs par défaut).
+
+    Returns:
+        Un PointBalayage par configuration, dans l'ordre de configs.
+    """
+    processus = processus or os.cpu_count() or 1
+    fin = graine_depart + nb_parties
+    plages = [(d, min(d + taille_bloc, fin)) for d in range(graine_depart, fin, taille_bloc)]
+
+    def cle(regles, d, f):
+        return (f"v{VERSION_MOTEUR}", regles.empreinte(), nom_politique, d, f, int(crn), max_actions)
+
+    blocs: Dict[tuple, dict] = {}
+    manquants = []
+    for regles in configs:
+        for d, f in plages:
+            k = cle(regles, d, f)
+            if k in blocs:
+                continue
+            trouve = cache.lire(k) if cache else None
+            if trouve is None:
+                manquants.append((k, regles, d, f))
+                blocs[k] = None
+            else:
+                blocs[k] = trouve
+
+    def enregistrer(k, sommes):
+        blocs[k] = sommes
+        if cache:
+            cache.ecrire(k, sommes)
+
+    if processus <= 1:
+        for k, regles, d, f in manquants:
+            enregistrer(k, _sommes_plage(nom_politique, d, f, max_actions, crn, regles))
+    elif manquants:
+        with ProcessPoolExecutor(max_workers=processus) as pool:
+            futurs = {pool.submit(_sommes_plage, nom_politique, d, f, max_actions, crn, regles): k
+                      for k, regles, d, f in manquants}
+            for futur, k in futurs.items():
+                enregistrer(k, futur.result())
+
+    calcules = {k for k, *_ in manquants}
+    return [_point(regles, [blocs[cle(regles, d, f)] for d, f in plages],
+                   sum(cle(regles, d, f) in calcules for d, f in plages))
+            for regles in configs]
+
+
+def joueur_regles(nom_politique: str, processus: int = 1, crn: bool = True,
+                  max_actions: int = MAX_ACTIONS):
+    """
+    Fonction jouer() pour sequentiel.lancer_sequentiel / eliminer dont les
+    bras sont des Regles, jouées avec la politique nom_politique.
+    """
+    def jouer(regles, graine_depart, nb):
+        return lancer_lot(nom_politique, nb, graine_depart, processus,
+                          max_actions=max_actions, crn=crn, regles=regles)
+    return jouer
+
+# ======
+#  MAIN
+# ======
+
+def _lire_axe(texte: str):
+    """
+    'nom=v1,v2,v3' (valeurs) ou 'nom=min:max' (intervalle) ; nom est une
+    constante de Regles ou couts_gemmes.CLE pour le coût d'une salle.
+    """
+    nom, _, valeurs = texte.partition("=")
+    nom = nom.strip()
+    if ":" in valeurs:
+        lo, hi = valeurs.split(":")
+        return nom, (_convertir(nom, lo), _convertir(nom, hi))
+    return nom, [_convertir(nom, v) for v in valeurs.split(",")]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Balayage des constantes d'équilibrage BluePrince.")
+    parser.add_argument("--axe", action="append", default=[], metavar="NOM=V1,V2|MIN:MAX",
+                        help="constante de regles.Regles à faire varier, ou couts_gemmes.CLE "
+                             "pour le coût d'une salle (répétable)")
+    parser.add_argument("--aleatoire", type=int, metavar="N",
+                        help="N configurations tirées au hasard (axes en intervalles) au lieu de la grille")
+    parser.add_argument("--politique", choices=sorted(POLITIQUES), default="glouton")
+    parser.add_argument("--parties", type=int, default=1000, help="parties par configuration")
+    parser.add_argument("--graine", type=int, default=0, help="première graine")
+    parser.add_argument("--processus", type=int, default=None, help="défaut : tous les cœurs")
+    parser.add_argument("--bloc", type=int, default=1000, help="graines par bloc de cache")
+    parser.add_argument("--cache", default=".cache_balayage", help="dossier du cache ('' = sans cache)")
+    parser.add_argument("--max-actions", type=int, default=MAX_ACTIONS)
+    parser.add_argument("--crn", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--metrique", choices=METRIQUES, default="victoire", help="métrique affichée et triée")
+    args = parser.parse_args(argv)
+
+    axes = dict(_lire_axe(a) for a in args.axe)
+    if args.aleatoire:
+        if any(not isinstance(v, tuple) for v in axes.values()):
+            parser.error("--aleatoire attend des axes en intervalles NOM=MIN:MAX")
+        configs = aleatoire(axes, args.aleatoire, args.graine)
+    else:
+        if any(isinstance(v, tuple) for v in axes.values()):
+            parser.error("la grille attend des axes en valeurs NOM=V1,V2,...")
+        configs = grille(axes)
+
+    cache = CacheResultats(args.cache) if args.cache else None
+    points = balayer(configs, args.politique, args.parties, args.graine, args.processus,
+                     cache, args.bloc, args.crn, args.max_actions)
+
+    m = args.metrique
+    for p in sorted(points, key=lambda p: p.moyennes[m], reverse=True):
+        diff = ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                         for k, v in p.regles.differences().items()) or "règles par défaut"
+        print(f"{m} = {p.moyennes[m]:.4g} ± {p.demi_largeur(m):.3g}"
+              f"  ({p.parties} parties, {p.blocs_calcules} blocs calculés)  {diff}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
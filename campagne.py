@@ -0,0 +1,269 @@
+# =====================================================
+#  campagne.py – Campagnes de plusieurs jours (SQLite)
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from doors import Rooms
+from moteur import ENTRY_POS, Partie, Phase
+from politiques import POLITIQUES, creer_politique
+from regles import Regles, REGLES_DEFAUT
+
+# Salles posées qui restent dans le manoir les jours suivants
+# (tag "permanent" ; le hall d'entrée est déjà posé chaque jour)
+SALLES_PERMANENTES = frozenset(k for k, s in Rooms.ROOMS_DB.items() if "permanent" in s.tags) - {"ENTRANCE_HALL"}
+
+# Effets d'une salle posée sur le jour suivant : ressource → bonus au
+# départ, ou "reste" pour reporter la valeur de fin de journée
+EFFETS_LENDEMAIN: Dict[str, Dict[str, object]] = {
+    "MORNING_ROOM": {"pas": 2},                          # "Tomorrow you will start with +2 steps."
+    "FREEZER": {"gemmes": "reste", "orr": "reste"},      # "Fige comptes jusqu'au lendemain."
+}
+
+# Graine du jour j d'une campagne de graine g
+PAS_GRAINE = 1_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campagnes (
+    id            INTEGER PRIMARY KEY,
+    nom           TEXT    NOT NULL UNIQUE,
+    graine        INTEGER NOT NULL,
+    politique     TEXT    NOT NULL,
+    regles        TEXT    NOT NULL,
+    prochain_jour INTEGER NOT NULL DEFAULT 0,
+    report        TEXT    NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS jours (
+    campagne   INTEGER NOT NULL REFERENCES campagnes (id),
+    jour       INTEGER NOT NULL,
+    graine     INTEGER NOT NULL,
+    victoire   INTEGER NOT NULL,
+    pas        INTEGER NOT NULL,
+    gemmes     INTEGER NOT NULL,
+    cles       INTEGER NOT NULL,
+    des        INTEGER NOT NULL,
+    orr        INTEGER NOT NULL,
+    nb_actions INTEGER NOT NULL,
+    nb_salles  INTEGER NOT NULL,
+    report     TEXT    NOT NULL,
+    PRIMARY KEY (campagne, jour)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS jours_victoire ON jours (campagne, victoire);
+CREATE TABLE IF NOT EXISTS salles_permanentes (
+    campagne INTEGER NOT NULL REFERENCES campagnes (id),
+    ligne    INTEGER NOT NULL,
+    colonne  INTEGER NOT NULL,
+    salle    TEXT    NOT NULL,
+    rotation INTEGER NOT NULL,
+    jour     INTEGER NOT NULL,
+    PRIMARY KEY (campagne, ligne, colonne)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Jour:
+    """Résultat d'un jour de campagne."""
+    jour: int
+    graine: int
+    victoire: bool
+    pas: int
+    gemmes: int
+    cles: int
+    des: int
+    orr: int
+    nb_actions: int
+    nb_salles: int
+    report: Dict[str, int]   # bonus appliqués au départ de ce jour
+
+
+class Campagne:
+    """
+    Une suite de jours joués par une politique, où les salles permanentes
+    posées (SALLES_PERMANENTES) restent dans le manoir et où certaines
+    salles reportent des ressources sur le lendemain (EFFETS_LENDEMAIN).
+
+    L'état de la campagne (jour suivant, salles permanentes, report) est
+    stocké dans une base SQLite en WAL. Les jours sont joués en mémoire et
+    écrits par lots de taille_lot dans une seule transaction, avec l'état
+    de la campagne : après un arrêt, la campagne reprend au dernier lot
+    écrit et rejoue les mêmes jours (chaque jour a sa graine).
+
+    Args:
+        chemin: fichier SQLite.
+        nom: nom de la campagne (créée si elle n'existe pas).
+        graine, politique, regles: utilisés à la création seulement.
+    """
+
+    def __init__(self, chemin: str, nom: str, graine: int = 0, politique: str = "glouton",
+                 regles: Regles = REGLES_DEFAUT):
+        self.conn = sqlite3.connect(chemin, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO campagnes (nom, graine, politique, regles) VALUES (?, ?, ?, ?)",
+                          (nom, graine, politique, json.dumps(asdict(regles))))
+
+        ligne = self.conn.execute("SELECT * FROM campagnes WHERE nom = ?", (nom,)).fetchone()
+        self.id = ligne["id"]
+        self.nom = nom
+        self.graine = ligne["graine"]
+        self.politique = ligne["politique"]
+        self.regles = Regles(**json.loads(ligne["regles"]))
+        self.prochain_jour = ligne["prochain_jour"]
+        self.report: Dict[str, int] = json.loads(ligne["report"])
+        # (ligne, colonne) → (salle, rotation, jour où elle a été posée)
+        self.salles: Dict[Tuple[int, int], Tuple[str, int, int]] = {
+            (r["ligne"], r["colonne"]): (r["salle"], r["rotation"], r["jour"])
+            for r in self.conn.execute("SELECT * FROM salles_permanentes WHERE campagne = ?", (self.id,))}
+        self._jours: List[Jour] = []
+        self._nouvelles: List[tuple] = []
+
+    def fermer(self) -> None:
+        self.ecrire()
+        self.conn.close()
+
+    def __enter__(self) -> "Campagne":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    # ---------- Simulation ----------
+
+    def preparer(self, jour: int) -> Partie:
+        """Partie du jour : salles permanentes déjà posées et report de la veille appliqué."""
+        partie = Partie(self.graine * PAS_GRAINE + jour, regles=self.regles)
+        poses = set()
+        for (r, c), (salle, rotation, _) in self.salles.items():
+            partie.grille[r][c] = Rooms.generate_room(salle, row=r, rotation=rotation,
+                                                      rng=partie.aleas.flux("salle", r, c), regles=self.regles)
+            poses.add(salle)
+        partie.pioche = [spec for spec in partie.pioche if spec.key not in poses]
+        j = partie.joueur
+        for ressource, bonus in self.report.items():
+            setattr(j, ressource, getattr(j, ressource) + bonus)
+        return partie
+
+    def jouer_jour(self) -> Jour:
+        """Joue le jour suivant ; le résultat est écrit au prochain ecrire()."""
+        jour = self.prochain_jour
+        partie = self.preparer(jour)
+        partie.jouer(creer_politique(self.politique, partie.graine))
+        j = partie.joueur
+        resultat = Jour(jour, partie.graine, partie.phase == Phase.VICTOIRE, j.pas, j.gemmes, j.cles, j.des, j.orr,
+                        partie.nb_actions, partie.nb_salles(), self.report)
+
+        # Report sur le lendemain et nouvelles salles permanentes
+        report: Dict[str, int] = {}
+        for r, ligne in enumerate(partie.grille):
+            for c, room in enumerate(ligne):
+                if room is None:
+                    continue
+                cle = room.spec.key
+                for ressource, effet in EFFETS_LENDEMAIN.get(cle, {}).items():
+                    report[ressource] = report.get(ressource, 0) + (getattr(j, ressource) if effet == "reste" else effet)
+                if cle in SALLES_PERMANENTES and (r, c) not in self.salles and (r, c) != ENTRY_POS:
+                    self.salles[(r, c)] = (cle, room.rotation, jour)
+                    self._nouvelles.append((self.id, r, c, cle, room.rotation, jour))
+        self.report = report
+        self.prochain_jour = jour + 1
+        self._jours.append(resultat)
+        return resultat
+
+    def jouer(self, nb_jours: int, taille_lot: int = 256) -> List[Jour]:
+        """Joue nb_jours jours en écrivant un lot tous les taille_lot jours."""
+        resultats = []
+        for _ in range(nb_jours):
+            resultats.append(self.jouer_jour())
+            if len(self._jours) >= taille_lot:
+                self.ecrire()
+        self.ecrire()
+        return resultats
+
+    def ecrire(self) -> None:
+        """Écrit les jours joués et l'état de la campagne en une transaction."""
+        if not self._jours:
+            return
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO jours VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.id, d.jour, d.graine, int(d.victoire), d.pas, d.gemmes, d.cles, d.des, d.orr,
+                  d.nb_actions, d.nb_salles, json.dumps(d.report)) for d in self._jours])
+            self.conn.executemany("INSERT OR REPLACE INTO salles_permanentes VALUES (?, ?, ?, ?, ?, ?)",
+                                  self._nouvelles)
+            self.conn.execute("UPDATE campagnes SET prochain_jour = ?, report = ? WHERE id = ?",
+                              (self.prochain_jour, json.dumps(self.report), self.id))
+        self._jours.clear()
+        self._nouvelles.clear()
+
+    # ---------- Lecture ----------
+
+    def jour(self, n: int) -> Optional[Jour]:
+        ligne = self.conn.execute("SELECT * FROM jours WHERE campagne = ? AND jour = ?", (self.id, n)).fetchone()
+        if ligne is None:
+            return None
+        d = dict(ligne)
+        del d["campagne"]
+        d["victoire"] = bool(d["victoire"])
+        d["report"] = json.loads(d["report"])
+        return Jour(**d)
+
+    def victoires(self) -> List[int]:
+        """Jours gagnés (index jours_victoire)."""
+        return [r[0] for r in self.conn.execute(
+            "SELECT jour FROM jours WHERE campagne = ? AND victoire = 1 ORDER BY jour", (self.id,))]
+
+    def resume(self) -> Dict[str, float]:
+        ligne = self.conn.execute(
+            "SELECT COUNT(*) AS jours, SUM(victoire) AS victoires, AVG(pas) AS pas_moyens,"
+            " AVG(nb_salles) AS salles_moyennes FROM jours WHERE campagne = ?", (self.id,)).fetchone()
+        return {**dict(ligne), "salles_permanentes": len(self.salles)}
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Campagnes de plusieurs jours avec salles permanentes.")
+    parser.add_argument("base", help="fichier SQLite des campagnes")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_jouer = sous.add_parser("jouer", help="joue les jours suivants d'une campagne (créée si besoin)")
+    p_jouer.add_argument("nom")
+    p_jouer.add_argument("--jours", type=int, default=1000)
+    p_jouer.add_argument("--politique", choices=sorted(POLITIQUES), default="glouton")
+    p_jouer.add_argument("--graine", type=int, default=0)
+    p_jouer.add_argument("--lot", type=int, default=256, help="jours écrits par transaction")
+
+    p_etat = sous.add_parser("etat", help="résumé d'une campagne")
+    p_etat.add_argument("nom")
+    args = parser.parse_args(argv)
+
+    if args.commande == "jouer":
+        with Campagne(args.base, args.nom, args.graine, args.politique) as c:
+            premier = c.prochain_jour
+            debut = time.perf_counter()
+            c.jouer(args.jours, args.lot)
+            duree = time.perf_counter() - debut
+            print(f"jours {premier} à {c.prochain_jour - 1} joués en {duree:.1f} s ({args.jours / duree:.0f} jours/s)")
+    with Campagne(args.base, args.nom) as c:
+        for cle, valeur in c.resume().items():
+            print(f"{cle:>20} : {valeur}")
+        for (r, col), (salle, rotation, jour) in sorted(c.salles.items()):
+            print(f"{'':>20}   {salle} en ({r}, {col}) depuis le jour {jour}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# =====================================================
+#  corpus.py – Corpus de rejeux projeté en mémoire
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from evenements import SalleTiree
+from moteur import CODE_SALLE, SALLES, Phase
+from rejeu import PHASES, Rejeu, _Lecture, _Prefixe, lire_actions, lire_entete, lire_fin, verifier
+
+# Un corpus est un dossier contenant :
+#   rejeux.bin  les rejeux concaténés, octet pour octet (voir rejeu.py)
+#   index.bin   un enregistrement DTYPE_INDEX par partie
+#   salles.bin  par partie, la ligne où chaque salle de SALLES a été
+#               posée (int8, -1 = jamais posée)
+#   meta.json   la table des salles
+# Les trois fichiers binaires ne font que grandir : ajouter des parties
+# revient à écrire à leur fin.
+DTYPE_INDEX = np.dtype([
+    ("offset", "u8"),       # position du rejeu dans rejeux.bin
+    ("taille", "u4"),       # taille du rejeu en octets
+    ("graine", "i8"),
+    ("crn", "u1"),
+    ("phase", "u1"),        # indice dans rejeu.PHASES
+    ("victoire", "u1"),
+    ("conforme", "u1"),     # le rejeu a été vérifié (voir rejeu.verifier)
+    ("nb_actions", "u4"),
+    ("nb_salles", "u1"),    # salles posées par le joueur
+    ("pas", "i2"),
+    ("gemmes", "i2"),
+    ("cles", "i2"),
+    ("des", "i2"),
+    ("orr", "i4"),
+])
+
+FICHIERS = ("rejeux.bin", "index.bin", "salles.bin")
+
+
+# ==========================
+#  CONSTRUCTION
+# ==========================
+
+def _decouper(donnees: bytes) -> Iterator[Tuple[int, int, Rejeu]]:
+    """(offset, taille, rejeu) de chaque rejeu complet d'un bloc d'octets."""
+    flux = io.BytesIO(donnees)
+    while True:
+        debut = flux.tell()
+        premier = flux.read(1)
+        if not premier:
+            return
+        lecture = _Lecture(_Prefixe(premier, flux))
+        try:
+            rejeu = lire_entete(lecture)
+            rejeu.actions.extend(lire_actions(lecture))
+            rejeu.etat_final = lire_fin(lecture)
+        except EOFError:
+            # Rejeu incomplet en fin de fichier (en-tête, actions, état final
+            # ou CRC coupés) : ignoré
+            return
+        yield debut, flux.tell() - debut, rejeu
+
+
+def _analyser(rejeu: Rejeu) -> Tuple[tuple, np.ndarray]:
+    """Rejoue la partie pour relever les salles posées ; renvoie (ligne d'index sans offset, salles)."""
+    lignes = np.full(len(SALLES), -1, dtype=np.int8)
+
+    def salle_tiree(evt):
+        lignes[CODE_SALLE[evt.salle]] = evt.ligne
+
+    partie = rejeu.partie()
+    partie.bus.abonner(SalleTiree, salle_tiree)
+    conforme, _ = verifier(rejeu, partie)
+
+    e = rejeu.etat_final
+    ligne = (rejeu.graine, rejeu.crn, PHASES.index(e.phase), e.phase == Phase.VICTOIRE, conforme,
+             e.nb_actions, int((lignes >= 0).sum()), e.pas, e.gemmes, e.cles, e.des, e.orr)
+    return ligne, lignes
+
+
+def _analyser_fichier(chemin: str) -> Tuple[bytes, np.ndarray, np.ndarray]:
+    """Unité de travail des processus : lit un fichier de rejeux et l'analyse."""
+    with open(chemin, "rb") as f:
+        donnees = f.read()
+    index, salles = [], []
+    fin = 0
+    for offset, taille, rejeu in _decouper(donnees):
+        ligne, lignes = _analyser(rejeu)
+        index.append((offset, taille) + ligne)
+        salles.append(lignes)
+        fin = offset + taille
+    return (donnees[:fin], np.array(index, dtype=DTYPE_INDEX),
+            np.array(salles, dtype=np.int8).reshape(-1, len(SALLES)))
+
+
+def ajouter(dossier: str, fichiers: Sequence[str], processus: int = 1) -> int:
+    """
+    Ajoute au corpus (créé si besoin) les rejeux complets des fichiers donnés.
+
+    Returns:
+        Le nombre de parties ajoutées.
+    """
+    os.makedirs(dossier, exist_ok=True)
+    meta = os.path.join(dossier, "meta.json")
+    if not os.path.exists(meta):
+        with open(meta, "w", encoding="utf-8") as f:
+            json.dump({"salles": SALLES}, f)
+    else:
+        with open(meta, encoding="utf-8") as f:
+            if json.load(f)["salles"] != list(SALLES):
+                raise ValueError("Table des salles du corpus différente de celle du jeu")
+
+    _reparer(dossier)
+    chemins = [os.path.join(dossier, f) for f in FICHIERS]
+    offset = os.path.getsize(chemins[0])
+    ajoutees = 0
+
+    if processus > 1:
+        pool = ProcessPoolExecutor(max_workers=processus)
+        resultats: Iterable = pool.map(_analyser_fichier, fichiers)
+    else:
+        pool = None
+        resultats = map(_analyser_fichier, fichiers)
+    try:
+        with open(chemins[0], "ab") as f_rejeux, open(chemins[1], "ab") as f_index, \
+                open(chemins[2], "ab") as f_salles:
+            for donnees, index, salles in resultats:
+                index["offset"] += offset
+                # Rejeux d'abord, index en dernier : un arrêt brutal laisse au
+                # pire des octets orphelins, jamais un index vers du vide
+                f_rejeux.write(donnees)
+                f_rejeux.flush()
+                f_salles.write(salles.tobytes())
+                f_salles.flush()
+                f_index.write(index.tobytes())
+                f_index.flush()
+                offset += len(donnees)
+                ajoutees += len(index)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return ajoutees
+
+
+def _reparer(dossier: str) -> None:
+    """Tronque index.bin et salles.bin au dernier enregistrement complet commun."""
+    chemins = [os.path.join(dossier, f) for f in FICHIERS]
+    for c in chemins:
+        if not os.path.exists(c):
+            open(c, "wb").close()
+    n = min(os.path.getsize(chemins[1]) // DTYPE_INDEX.itemsize,
+            os.path.getsize(chemins[2]) // len(SALLES))
+    for c, taille in ((chemins[1], n * DTYPE_INDEX.itemsize), (chemins[2], n * len(SALLES))):
+        if os.path.getsize(c) != taille:
+            with open(c, "r+b") as f:
+                f.truncate(taille)
+
+
+# ==========================
+#  LECTURE
+# ==========================
+
+class Corpus:
+    """
+    Corpus ouvert en lecture. Rien n'est chargé à l'ouverture : les
+    rejeux sont lus par mmap et les colonnes de l'index par np.memmap,
+    le système ne charge que les pages effectivement parcourues.
+
+    Exemple :
+        c = Corpus("corpus/")
+        m = c.a_pose("WEIGHT_ROOM", ligne_min=4) & (c.index["victoire"] == 1)
+        for rejeu in c.rejeux(c.selection(m)):
+            ...
+    """
+
+    def __init__(self, dossier: str):
+        self.dossier = dossier
+        with open(os.path.join(dossier, "meta.json"), encoding="utf-8") as f:
+            self.noms_salles: List[str] = json.load(f)["salles"]
+        self._code = {cle: i for i, cle in enumerate(self.noms_salles)}
+
+        chemin = os.path.join(dossier, "index.bin")
+        n = min(os.path.getsize(chemin) // DTYPE_INDEX.itemsize,
+                os.path.getsize(os.path.join(dossier, "salles.bin")) // len(self.noms_salles))
+        self._fichier = open(os.path.join(dossier, "rejeux.bin"), "rb")
+        if n == 0:
+            self.index = np.empty(0, dtype=DTYPE_INDEX)
+            self.lignes_salles = np.empty((0, len(self.noms_salles)), dtype=np.int8)
+            self._mm = None
+            return
+        self.index = np.memmap(chemin, dtype=DTYPE_INDEX, mode="r", shape=(n,))
+        self.lignes_salles = np.memmap(os.path.join(dossier, "salles.bin"), dtype=np.int8, mode="r",
+                                       shape=(n, len(self.noms_salles)))
+        self._mm = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def fermer(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._fichier.close()
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    # ---------- Accès aux parties ----------
+
+    def octets(self, i: int) -> bytes:
+        """Octets bruts du rejeu i."""
+        e = self.index[i]
+        debut = int(e["offset"])
+        return self._mm[debut:debut + int(e["taille"])]
+
+    def rejeu(self, i: int) -> Rejeu:
+        """Rejeu i décodé (accès direct, sans parcourir les précédents)."""
+        _, _, rejeu = next(_decouper(self.octets(i)))
+        return rejeu
+
+    def rejeux(self, indices: Optional[Iterable[int]] = None) -> Iterator[Rejeu]:
+        """Rejeux des indices donnés (tous par défaut)."""
+        for i in (range(len(self)) if indices is None else indices):
+            yield self.rejeu(int(i))
+
+    def echantillon(self, k: int, graine: int = 0, masque: Optional[np.ndarray] = None) -> np.ndarray:
+        """k indices tirés sans remise, parmi ceux du masque s'il est donné."""
+        candidats = self.selection(masque) if masque is not None else np.arange(len(self))
+        rng = np.random.default_rng(graine)
+        return np.sort(rng.choice(candidats, size=min(k, len(candidats)), replace=False))
+
+    # ---------- Filtres ----------
+
+    @staticmethod
+    def selection(masque: np.ndarray) -> np.ndarray:
+        """Indices des parties retenues par un masque booléen."""
+        return np.flatnonzero(masque)
+
+    def a_pose(self, salle: str, ligne_min: int = 0, ligne_max: Optional[int] = None) -> np.ndarray:
+        """
+        Masque des parties où la salle a été posée sur une ligne de
+        [ligne_min, ligne_max] (ligne 0 = antichambre en haut, le joueur
+        part de la dernière ligne et monte).
+        """
+        lignes = self.lignes_salles[:, self._code[salle]]
+        masque = lignes >= max(ligne_min, 0)
+        if ligne_max is not None:
+            masque &= lignes <= ligne_max
+        return np.asarray(masque)
+
+    def salles_posees(self, i: int) -> List[Tuple[str, int]]:
+        """(salle, ligne) des salles posées pendant la partie i."""
+        lignes = self.lignes_salles[i]
+        return [(self.noms_salles[k], int(lignes[k])) for k in np.flatnonzero(lignes >= 0)]
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Corpus de rejeux BluePrince.")
+    parser.add_argument("corpus", help="dossier du corpus")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_ajout = sous.add_parser("ajouter", help="ajoute des fichiers de rejeux au corpus")
+    p_ajout.add_argument("fichiers", nargs="+")
+    p_ajout.add_argument("--processus", type=int, default=1)
+    p_filtre = sous.add_parser("filtrer", help="compte et liste les parties retenues")
+    p_filtre.add_argument("--salle", action="append", default=[], metavar="CLE[:LIGNE_MIN:LIGNE_MAX]",
+                          help="la salle a été posée (entre ces lignes), répétable")
+    p_filtre.add_argument("--victoire", action=argparse.BooleanOptionalAction, default=None)
+    p_filtre.add_argument("--max-actions", type=int)
+    p_filtre.add_argument("--echantillon", type=int, default=5, help="parties affichées")
+    args = parser.parse_args(argv)
+
+    if args.commande == "ajouter":
+        n = ajouter(args.corpus, args.fichiers, args.processus)
+        print(f"{n} parties ajoutées")
+        return 0
+
+    with Corpus(args.corpus) as c:
+        masque = np.ones(len(c), dtype=bool)
+        for texte in args.salle:
+            cle, *bornes = texte.split(":")
+            ligne_min = int(bornes[0]) if bornes and bornes[0] else 0
+            ligne_max = int(bornes[1]) if len(bornes) > 1 and bornes[1] else None
+            masque &= c.a_pose(cle, ligne_min, ligne_max)
+        if args.victoire is not None:
+            masque &= c.index["victoire"] == int(args.victoire)
+        if args.max_actions is not None:
+            masque &= c.index["nb_actions"] <= args.max_actions
+
+        print(f"{int(masque.sum())} / {len(c)} parties")
+        for i in c.echantillon(args.echantillon, masque=masque):
+            e = c.index[i]
+            print(f"  #{i} graine {e['graine']} {PHASES[e['phase']].name} {e['nb_actions']} actions"
+                  f"  salles : {', '.join(f'{s}@{l}' for s, l in c.salles_posees(i))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
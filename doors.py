@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import os
 import random
+from functools import lru_cache
 from dataclasses import dataclass, field
 from enum import Enum, IntEnum, auto
 from typing import Dict, Optional, Any, Tuple, List
+from regles import Regles, REGLES_DEFAUT
+from traces import trace
 from objets import (
     Pelle, Marteau, Kit_de_crochetage, Detecteur_de_metaux, Patte_de_lapin,
     Pomme, Banane, Gateau, Sandwich, Repas, 
@@ -338,10 +341,12 @@ class Doors:
         return dir
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def shape_orientations(shape: RoomShape, rotation: int) -> Tuple[Orientation, ...]:
         """
         Renvoie les orientations actives pour une forme ET une rotation données.
         Les formes de base sont (par convention) orientées au Nord.
+        Le résultat est mis en cache : il ne dépend que de (shape, rotation).
         """
         base_dirs = []
         if shape == RoomShape.FOUR_WAY:
@@ -361,10 +366,12 @@ class Doors:
     
     
     @staticmethod
-    def level_by_row(row: int, rows: int = ROWS_DEFAULT, rng: random.Random = rng_default) -> int:
+    def level_by_row(row: int, rows: int = ROWS_DEFAULT, rng: random.Random = rng_default,
+                     regles: Regles = REGLES_DEFAUT) -> int:
         """
         Niveau de difficulté en fonction de la ligne.
         0: commun, 1: rare, 2: épique.
+        Les poids (commun décroît, rare en cloche, épique croît) viennent de regles.
         """
         if row == 0:
             return 2
@@ -373,9 +380,7 @@ class Doors:
         
         x = (rows - 1 - row) / (rows - 1)
         
-        w0 = max(0.0, 1.0 - 1.5 * x)         # décroît
-        w1 = 0.5 + 0.5 * (1 - abs(2 * x - 1))# cloche centrale
-        w2 = 0.2 + 1.3 * x                   # croît
+        w0, w1, w2 = regles.poids_rarete(x)
         return rng.choices([0, 1, 2], weights=[w0, w1, w2], k=1)[0]
 
     @staticmethod
@@ -388,7 +393,8 @@ class Doors:
         }[r]
 
     @staticmethod
-    def make_for_shape(shape: RoomShape, row: int, rotation: int, rng: Optional[random.Random]) -> Dict[Orientation, Door]:
+    def make_for_shape(shape: RoomShape, row: int, rotation: int, rng: Optional[random.Random],
+                       regles: Regles = REGLES_DEFAUT) -> Dict[Orientation, Door]:
         """
         Génère les portes d'une salle suivant sa forme, 
         sa rotation, et sa rareté (rangée).
@@ -400,7 +406,7 @@ class Doors:
         
         for d in dirs:
             # 2. Détermine le niveau de difficulté
-            level = Doors.level_by_row(row, rng=rng)
+            level = Doors.level_by_row(row, rng=rng, regles=regles)
             rarity = Rarity(level)
             
             # 3. Détermine l'état de verrouillage
@@ -937,17 +943,19 @@ class Rooms:
 
     # ---------- Usines / Générateurs ----------
     @staticmethod
-    def generate_room(spec_key: str, row: int,rotation: int = 0, rng: Optional[random.Random] = None) -> Room:
+    @trace("doors.generate_room")
+    def generate_room(spec_key: str, row: int,rotation: int = 0, rng: Optional[random.Random] = None,
+                      regles: Regles = REGLES_DEFAUT) -> Room:
         """
         Instancie une Room depuis sa RoomSpec, génère ses portes et applique la logique dentrée.
         """
         rng = rng or random.Random()
         spec = Rooms.ROOMS_DB[spec_key]
-        doors = Doors.make_for_shape(spec.shape, row, rotation, rng)
+        doors = Doors.make_for_shape(spec.shape, row, rotation, rng, regles)
         room = Room(spec=spec, rotation=rotation,doors=doors, effects=spec.effects.copy())
         room.on_enter(rng)
         if spec.effects and spec.effects.get("dig_spots"):
-            nb = random.randint(2, 5)
+            nb = rng.randint(2, 5)
 
             # Ajouter nb endroits où creuser dans room.effects
             room.effects["interactifs"] = [endroits_ou_creuser() for _ in range(nb)]
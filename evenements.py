@@ -0,0 +1,189 @@
+# =====================================================
+#  evenements.py – Bus d'événements du jeu
+# =====================================================
+
+from __future__ import annotations
+
+import logging
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# ==========================
+#  ÉVÉNEMENTS
+# ==========================
+
+class JoueurDeplace(NamedTuple):
+    """Le joueur a changé de case (joueur.move)."""
+    ligne: int
+    colonne: int
+    pas: int
+
+    def texte(self) -> str:
+        return f"Le joueur avance en ({self.ligne}, {self.colonne}), il reste {self.pas} pas."
+
+
+class GemmesDepensees(NamedTuple):
+    """Des gemmes ont été dépensées (joueur.utiliser_gems)."""
+    quantite: int
+    reste: int
+
+    def texte(self) -> str:
+        return f"Le joueur a depense {self.quantite} gemmes !"
+
+
+class GemmesInsuffisantes(NamedTuple):
+    """Une dépense de gemmes a été refusée."""
+    demandees: int
+    disponibles: int
+
+    def texte(self) -> str:
+        return "Pas assez de gemmes !"
+
+
+class ObjetAjoute(NamedTuple):
+    """Un objet ou une ressource a été ajouté à l'inventaire (joueur.add_item)."""
+    objet: str
+    quantite: int
+    permanent: bool
+    deja_possede: bool = False
+
+    def texte(self) -> str:
+        if not self.permanent:
+            return f"Le joueur a ramassé {self.quantite} {self.objet} !"
+        if self.deja_possede:
+            return f"Vous possédez déjà {self.objet}."
+        return f"{self.objet} a été ajouté aux objets permanents."
+
+
+class ObjetUtilise(NamedTuple):
+    """Le joueur a utilisé un objet sans effet propre (permanent, consommable générique)."""
+    objet: str
+    permanent: bool
+
+    def texte(self) -> str:
+        if self.permanent:
+            return f"L'objet {self.objet} est un objet permanent"
+        return f"Le joueur utilise L'objet {self.objet}"
+
+
+class PorteOuverte(NamedTuple):
+    """Le joueur a franchi une porte depuis la case (ligne, colonne)."""
+    ligne: int
+    colonne: int
+    direction: object   # doors.Orientation
+    rarete: int         # doors.Rarity
+    cle_utilisee: bool
+
+    def texte(self) -> str:
+        cle = " avec une clé" if self.cle_utilisee else ""
+        return f"Porte {self.direction.name} ouverte{cle} en ({self.ligne}, {self.colonne})."
+
+
+class SalleTiree(NamedTuple):
+    """Une salle du tirage a été posée sur la case (ligne, colonne)."""
+    ligne: int
+    colonne: int
+    salle: str          # clé de la RoomSpec
+    rotation: int
+    cout: int
+
+    def texte(self) -> str:
+        return f"Salle {self.salle} posée en ({self.ligne}, {self.colonne}) pour {self.cout} gemmes."
+
+
+class CoupJoue(NamedTuple):
+    """
+    Une action vient d'être appliquée par moteur.Partie.appliquer.
+    avant = (pas, gemmes, cles, des, orr) juste avant l'action.
+    """
+    partie: object
+    action: object
+    avant: tuple
+
+    def texte(self) -> str:
+        return f"Action {self.action.type.name} {self.action.arg}"
+
+
+class PartieTerminee(NamedTuple):
+    """La partie vient de se terminer (victoire ou défaite)."""
+    partie: object
+    victoire: bool
+
+    def texte(self) -> str:
+        return "Victoire !" if self.victoire else "Partie perdue."
+
+
+class InventaireModifie(NamedTuple):
+    """
+    Une ressource du joueur (pas, orr, gemmes, cles, des) ou ses objets
+    permanents ont changé ; version = joueur.version après le changement.
+    """
+    champ: str
+    valeur: object
+    version: int
+
+    def texte(self) -> str:
+        return f"{self.champ} : {self.valeur}"
+
+
+EVENEMENTS = (JoueurDeplace, GemmesDepensees, GemmesInsuffisantes, ObjetAjoute, ObjetUtilise,
+              PorteOuverte, SalleTiree, CoupJoue, PartieTerminee, InventaireModifie)
+
+# Événements écrits par défaut dans le journal (CoupJoue est réservé à la
+# télémétrie, InventaireModifie à l'affichage de l'inventaire)
+EVENEMENTS_JOURNAL = tuple(t for t in EVENEMENTS if t not in (CoupJoue, InventaireModifie))
+
+# ==========================
+#  BUS
+# ==========================
+
+class Bus:
+    """
+    Bus d'événements synchrone, un par partie.
+
+    Les abonnés (ligne de message de l'interface, journal, télémétrie...)
+    s'inscrivent par type d'événement. emettre() ne construit l'événement
+    que si quelqu'un l'écoute : sans abonné, une émission coûte un accès
+    à un dict.
+    """
+    __slots__ = ("_abonnes",)
+
+    def __init__(self):
+        self._abonnes: Dict[type, List[Callable]] = {}
+
+    def abonner(self, type_evt: type, fonction: Callable) -> Callable[[], None]:
+        """Inscrit fonction(evt) pour type_evt ; renvoie de quoi la désinscrire."""
+        self._abonnes.setdefault(type_evt, []).append(fonction)
+        return lambda: self.desabonner(type_evt, fonction)
+
+    def desabonner(self, type_evt: type, fonction: Callable) -> None:
+        abonnes = self._abonnes.get(type_evt)
+        if abonnes and fonction in abonnes:
+            abonnes.remove(fonction)
+            if not abonnes:
+                del self._abonnes[type_evt]
+
+    def ecoute(self, type_evt: type) -> bool:
+        """True si au moins un abonné attend ce type d'événement."""
+        return type_evt in self._abonnes
+
+    def emettre(self, type_evt: type, *args) -> None:
+        """Construit type_evt(*args) et le transmet aux abonnés, s'il y en a."""
+        abonnes = self._abonnes.get(type_evt)
+        if not abonnes:
+            return
+        evt = type_evt(*args)
+        for fonction in tuple(abonnes):
+            fonction(evt)
+
+
+def journaliser(bus: Bus, logger: Optional[logging.Logger] = None,
+                niveau: int = logging.INFO, types=EVENEMENTS_JOURNAL) -> None:
+    """Écrit le texte des événements dans un logger (remplace les anciens print)."""
+    logger = logger or logging.getLogger("blueprince")
+
+    def ecrire(evt):
+        if logger.isEnabledFor(niveau):
+            logger.log(niveau, evt.texte())
+
+    for type_evt in types:
+        bus.abonner(type_evt, ecrire)
@@ -0,0 +1,282 @@
+# =====================================================
+#  file_travaux.py – File de travaux reprenable (SQLite)
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional, Sequence
+
+from moteur import MAX_ACTIONS
+from politiques import POLITIQUES
+from regles import Regles
+from simulation import METRIQUES
+from balayage import PointBalayage, _lire_axe, _point, _sommes_plage, aleatoire, grille
+
+# États d'un travail
+ATTENTE, EN_COURS, FINI, ECHEC = "attente", "en_cours", "fini", "echec"
+
+# Secondes après lesquelles un travail réclamé est tenu pour abandonné par
+# son travailleur (un bloc de 1000 parties prend quelques secondes)
+DELAI_REPRISE = 900.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS travaux (
+    id          INTEGER PRIMARY KEY,
+    campagne    TEXT    NOT NULL,
+    empreinte   TEXT    NOT NULL,
+    regles      TEXT    NOT NULL,
+    politique   TEXT    NOT NULL,
+    debut       INTEGER NOT NULL,
+    fin         INTEGER NOT NULL,
+    crn         INTEGER NOT NULL,
+    max_actions INTEGER NOT NULL,
+    etat        TEXT    NOT NULL DEFAULT 'attente',
+    travailleur TEXT,
+    reclame_le  REAL,
+    tentatives  INTEGER NOT NULL DEFAULT 0,
+    erreur      TEXT,
+    resultat    TEXT,
+    UNIQUE (campagne, empreinte, politique, debut, fin, crn, max_actions)
+);
+CREATE INDEX IF NOT EXISTS travaux_etat ON travaux (etat);
+"""
+
+
+class FileTravaux:
+    """
+    Liste de travaux (règles, politique, plage de graines) stockée dans
+    une base SQLite, partagée par plusieurs processus travailleurs.
+
+    Chaque travail est réclamé puis terminé dans une transaction, donc un
+    arrêt brutal ne perd au plus que les blocs en cours : au redémarrage,
+    reprendre() les remet en attente et les blocs finis ne sont pas rejoués.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self.conn = sqlite3.connect(chemin, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def fermer(self) -> None:
+        self.conn.close()
+
+    # ---------- Remplissage ----------
+
+    def ajouter(self, campagne: str, configs: Sequence[Regles], nom_politique: str,
+                nb_parties: int, graine_depart: int = 0, taille_bloc: int = 1000,
+                crn: bool = True, max_actions: int = MAX_ACTIONS) -> int:
+        """
+        Ajoute un travail par (configuration, bloc de graines). Les travaux
+        déjà présents sont ignorés, donc ajouter deux fois la même campagne
+        (ou l'agrandir) est sans danger.
+
+        Returns:
+            Le nombre de travaux réellement ajoutés.
+        """
+        fin = graine_depart + nb_parties
+        lignes = [(campagne, r.empreinte(), json.dumps(asdict(r)), nom_politique,
+                   d, min(d + taille_bloc, fin), int(crn), max_actions)
+                  for r in configs for d in range(graine_depart, fin, taille_bloc)]
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            avant = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO travaux (campagne, empreinte, regles, politique, debut, fin, crn, max_actions)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", lignes)
+            return self.conn.total_changes - avant
+
+    # ---------- Travailleurs ----------
+
+    def reclamer(self, travailleur: str) -> Optional[sqlite3.Row]:
+        """Réserve atomiquement le prochain travail en attente (None s'il n'y en a plus)."""
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            ligne = self.conn.execute(
+                "SELECT * FROM travaux WHERE etat = ? ORDER BY id LIMIT 1", (ATTENTE,)).fetchone()
+            if ligne is None:
+                return None
+            self.conn.execute(
+                "UPDATE travaux SET etat = ?, travailleur = ?, reclame_le = ?, tentatives = tentatives + 1"
+                " WHERE id = ?", (EN_COURS, travailleur, time.time(), ligne["id"]))
+            return ligne
+
+    def terminer(self, id_travail: int, sommes: dict) -> None:
+        with self.conn:
+            self.conn.execute("UPDATE travaux SET etat = ?, resultat = ?, erreur = NULL WHERE id = ?",
+                              (FINI, json.dumps(sommes), id_travail))
+
+    def echouer(self, id_travail: int, erreur: str, max_tentatives: int = 3) -> None:
+        """Remet le travail en attente, ou le marque en échec après max_tentatives."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE travaux SET etat = CASE WHEN tentatives >= ? THEN ? ELSE ? END, erreur = ?"
+                " WHERE id = ?", (max_tentatives, ECHEC, ATTENTE, erreur, id_travail))
+
+    def reprendre(self, delai: float = DELAI_REPRISE, max_tentatives: int = 3) -> int:
+        """
+        Reprend les travaux réclamés depuis plus de `delai` secondes, ceux
+        d'un travailleur interrompu : chaque réclamation compte une
+        tentative, et comme dans echouer() le travail est remis en attente,
+        ou marqué en échec après max_tentatives (un travail qui tue son
+        travailleur n'est pas rejoué sans fin). delai=0 reprend aussi les
+        travaux en cours : seulement si aucun travailleur ne tourne.
+
+        Returns:
+            Le nombre de travaux repris (remis en attente ou en échec).
+        """
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE travaux SET etat = CASE WHEN tentatives >= ? THEN ? ELSE ? END, erreur = ?"
+                " WHERE etat = ? AND reclame_le <= ?",
+                (max_tentatives, ECHEC, ATTENTE, "travailleur interrompu", EN_COURS, time.time() - delai))
+            return cur.rowcount
+
+    # ---------- Résultats ----------
+
+    def etat(self, campagne: Optional[str] = None) -> Dict[str, int]:
+        """Nombre de travaux par état."""
+        requete = "SELECT etat, COUNT(*) FROM travaux"
+        params: tuple = ()
+        if campagne is not None:
+            requete += " WHERE campagne = ?"
+            params = (campagne,)
+        return dict(self.conn.execute(requete + " GROUP BY etat", params).fetchall())
+
+    def resultats(self, campagne: str) -> List[PointBalayage]:
+        """Résultats agrégés par configuration, sur les blocs finis uniquement."""
+        blocs: Dict[str, list] = {}
+        regles: Dict[str, Regles] = {}
+        for empreinte, texte, resultat in self.conn.execute(
+                "SELECT empreinte, regles, resultat FROM travaux WHERE campagne = ? AND etat = ? ORDER BY id",
+                (campagne, FINI)):
+            if empreinte not in regles:
+                regles[empreinte] = Regles(**json.loads(texte))
+            blocs.setdefault(empreinte, []).append(json.loads(resultat))
+        return [_point(regles[e], b, 0) for e, b in blocs.items()]
+
+
+def travailleur(chemin: str, max_tentatives: int = 3) -> int:
+    """
+    Boucle d'un processus travailleur : réclame et joue des travaux
+    jusqu'à ce que la file soit vide.
+
+    Returns:
+        Le nombre de travaux terminés.
+    """
+    file = FileTravaux(chemin)
+    nom = f"{os.uname().nodename if hasattr(os, 'uname') else 'local'}:{os.getpid()}"
+    faits = 0
+    try:
+        while True:
+            t = file.reclamer(nom)
+            if t is None:
+                return faits
+            try:
+                sommes = _sommes_plage(t["politique"], t["debut"], t["fin"], t["max_actions"],
+                                       bool(t["crn"]), Regles(**json.loads(t["regles"])))
+            except Exception as exc:
+                file.echouer(t["id"], repr(exc), max_tentatives)
+                continue
+            file.terminer(t["id"], sommes)
+            faits += 1
+    finally:
+        file.fermer()
+
+
+def lancer(chemin: str, processus: Optional[int] = None, max_tentatives: int = 3,
+           delai_reprise: float = DELAI_REPRISE) -> None:
+    """
+    Reprend les travaux réclamés depuis plus de `delai_reprise` secondes
+    (voir FileTravaux.reprendre), puis vide la file avec `processus`
+    travailleurs (tous les cœurs par défaut). Un second lancer sur la même
+    base ne prend donc pas les travaux en cours du premier.
+    """
+    file = FileTravaux(chemin)
+    file.reprendre(delai_reprise, max_tentatives)
+    file.fermer()
+
+    processus = processus or os.cpu_count() or 1
+    if processus <= 1:
+        travailleur(chemin, max_tentatives)
+        return
+    procs = [multiprocessing.Process(target=travailleur, args=(chemin, max_tentatives))
+             for _ in range(processus)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="File de travaux reprenable pour les campagnes de simulation.")
+    parser.add_argument("base", help="fichier SQLite de la file")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_ajout = sous.add_parser("ajouter", help="ajoute les travaux d'un balayage")
+    p_ajout.add_argument("campagne")
+    p_ajout.add_argument("--axe", action="append", default=[], metavar="NOM=V1,V2|MIN:MAX")
+    p_ajout.add_argument("--aleatoire", type=int, metavar="N")
+    p_ajout.add_argument("--politique", choices=sorted(POLITIQUES), default="glouton")
+    p_ajout.add_argument("--parties", type=int, default=10000)
+    p_ajout.add_argument("--graine", type=int, default=0)
+    p_ajout.add_argument("--bloc", type=int, default=1000)
+    p_ajout.add_argument("--max-actions", type=int, default=MAX_ACTIONS)
+    p_ajout.add_argument("--crn", action=argparse.BooleanOptionalAction, default=True)
+
+    p_lancer = sous.add_parser("lancer", help="joue les travaux en attente (reprend après un arrêt)")
+    p_lancer.add_argument("--processus", type=int, default=None, help="défaut : tous les cœurs")
+    p_lancer.add_argument("--tentatives", type=int, default=3)
+    p_lancer.add_argument("--delai-reprise", type=float, default=DELAI_REPRISE, metavar="SECONDES",
+                          help="reprend les travaux réclamés depuis plus longtemps (0 : tous, "
+                               "si aucun autre lancer ne tourne)")
+
+    p_etat = sous.add_parser("etat", help="avancement des travaux")
+    p_etat.add_argument("campagne", nargs="?")
+
+    p_res = sous.add_parser("resultats", help="résultats agrégés d'une campagne")
+    p_res.add_argument("campagne")
+    p_res.add_argument("--metrique", choices=METRIQUES, default="victoire")
+    args = parser.parse_args(argv)
+
+    if args.commande == "lancer":
+        lancer(args.base, args.processus, args.tentatives, args.delai_reprise)
+        args.campagne = None
+
+    file = FileTravaux(args.base)
+    try:
+        if args.commande == "ajouter":
+            axes = dict(_lire_axe(a) for a in args.axe)
+            configs = aleatoire(axes, args.aleatoire, args.graine) if args.aleatoire else grille(axes)
+            n = file.ajouter(args.campagne, configs, args.politique, args.parties, args.graine,
+                             args.bloc, args.crn, args.max_actions)
+            print(f"{n} travaux ajoutés ({len(configs)} configurations)")
+        elif args.commande in ("etat", "lancer"):
+            for etat, n in sorted(file.etat(args.campagne).items()):
+                print(f"{etat:>10} : {n}")
+        else:
+            m = args.metrique
+            for p in sorted(file.resultats(args.campagne), key=lambda p: p.moyennes[m], reverse=True):
+                diff = ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}"
+                                 for k, v in p.regles.differences().items()) or "règles par défaut"
+                print(f"{m} = {p.moyennes[m]:.4g} ± {p.demi_largeur(m):.3g}  ({p.parties} parties)  {diff}")
+    finally:
+        file.fermer()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
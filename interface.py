@@ -2,23 +2,35 @@
 #  interfacepy – Interface graphique du jeu BluePrince
 # =====================================================
 
+import csv
+import logging
+import math
 import os
 import sys
+import time
 import pygame as pg
 import random
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from doors import Rooms, Doors, Orientation, Room, DoorState
-from joueur import joueur
+from typing import Optional
+from doors import Rooms, Doors, Orientation
+from joueur import JoueurObserve, joueur
 from objets import (
-    objetpermanent,
     Pelle, Marteau, Kit_de_crochetage, Detecteur_de_metaux, Patte_de_lapin,
     Pomme, Banane, Gateau, Sandwich, Repas, 
     coffre, endroits_ou_creuser, casier)
+from moteur import ROWS, COLS, ENTRY_POS, ANTI_POS, Action, Partie, Phase, allowed_room_positions
+from politiques import POLITIQUES, creer_politique
+from regles import REGLES_DEFAUT
+from evenements import GemmesDepensees, GemmesInsuffisantes, ObjetAjoute, ObjetUtilise, journaliser
+from rejeu import enregistrer
+from sauvegarde import SauvegardeAuto, lire_fichier as lire_sauvegarde
+import atlas
 # ======================
 #  CONSTANTES GÉNÉRALES
 # ======================
 
-ROWS, COLS = 9, 5
 CELL, GAP, PAD = 64, 4, 40
 BOARD_W = COLS * (CELL + GAP) + PAD * 2 - GAP
 BOARD_H = ROWS * (CELL + GAP) + PAD * 2 - GAP
@@ -27,6 +39,22 @@ W = BOARD_W + SIDEBAR_W
 H = BOARD_H + 72
 FPS = 60
 
+# Plafonds d'images par seconde proposés dans les options (0 : sans plafond),
+# et attente maximale sans événement quand rien ne bouge à l'écran (ms)
+PLAFONDS_FPS = (30, 60, 120, 144, 0)
+REPOS_MAX = 1000
+
+# Agrandissement de l'écran virtuel par un facteur entier (plus rapide, bandes plus larges)
+ECHELLE_ENTIERE = os.environ.get("BLUEPRINCE_ECHELLE_ENTIERE", "") == "1"
+
+# Profileur d'images (F3) : BLUEPRINCE_PROFIL=fichier.csv écrit aussi la
+# durée de chaque phase de chaque image dans ce fichier
+PROFIL_CSV = os.environ.get("BLUEPRINCE_PROFIL", "")
+
+# Autoplay : délai entre deux coups du bot, et pause sur l'écran de fin
+AUTOPLAY_DELAI = 250
+AUTOPLAY_PAUSE_FIN = 2000
+
 INV_ICON = 24
 
 BG1   = (255,255,255)
@@ -36,11 +64,11 @@ MUTED     = (120,120,120)
 ROOM_COL  = (70,160,120)
 WHITE     = (255,255,255)
 
-ENTRY_POS = (ROWS - 1, COLS // 2)
-ANTI_POS  = (0,         COLS // 2)
-
 BASE_DIR = os.path.dirname(__file__)
 ASSETS   = os.path.join(BASE_DIR, "assets")
+REJEU_DERNIERE_PARTIE = os.path.join(BASE_DIR, "rejeux", "derniere_partie.bpr")
+SAUVEGARDE_AUTO = os.path.join(BASE_DIR, "sauvegardes", "auto.bps")
+ATLAS = os.path.join(BASE_DIR, ".cache_atlas", "atlas.bpa")
 
 
 # Résumé court des effets utiles, basés sur spec.desc
@@ -78,22 +106,125 @@ ROOM_SHORT_EFFECT = {
 
 ROOM_IMAGES = {}
 
-def load_room_images():
+def room_image_files():
     """
-    Charge les images des salles (.webp ou .png) selon Rooms.ROOMS_DB.
+    Fichier image (.webp ou .png) de chaque salle de Rooms.ROOMS_DB qui en a
+    un, sans tenir compte de la casse (KITCHEN → Kitchen.webp).
     """
+    fichiers = {nom.lower(): nom for nom in os.listdir(ASSETS)} if os.path.isdir(ASSETS) else {}
+    resultat = {}
     for key in Rooms.ROOMS_DB.keys():
-
-        img = None
         # On teste .webp puis .png
         for ext in ("webp", "png"):
-            filename = f"{key}.{ext}"
-            path = os.path.join(ASSETS, filename)
-            if os.path.exists(path):
-                img = load_png(filename, CELL - 8)
+            filename = fichiers.get(f"{key}.{ext}".lower())
+            if filename:
+                resultat[key] = filename
                 break
+    return resultat
+
+def load_room_images(chargeur=None):
+    """
+    Charge les images des salles (.webp ou .png) selon Rooms.ROOMS_DB.
+    Avec un ChargeurImages, elles arrivent en arrière-plan (None en attendant).
+    """
+    fichiers = room_image_files()
+    for key in Rooms.ROOMS_DB.keys():
+        ROOM_IMAGES[key] = None
+        filename = fichiers.get(key)
+        if filename:
+            if chargeur:
+                chargeur.demander(ROOM_IMAGES, key, filename, CELL - 8)
+            else:
+                ROOM_IMAGES[key] = load_png(filename, CELL - 8)
+    SPRITES.vider()
+
+
+class CacheSprites:
+    """
+    Images des salles tournées et mises à l'échelle, construites une fois
+    puis réutilisées d'une image à l'autre, au lieu d'appeler
+    pg.transform à chaque dessin.
+
+    Clé : (salle, rotation, taille). Au plus `capacite` images sont gardées
+    (les moins récemment utilisées sont oubliées) ; tout est vidé quand les
+    images sources sont rechargées ou que la résolution change.
+    """
+
+    def __init__(self, images, capacite=512):
+        self.images = images
+        self.capacite = capacite
+        self.resolution = None
+        self._sprites = OrderedDict()
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def vider(self):
+        self._sprites.clear()
+
+    def changer_resolution(self, taille):
+        """ À appeler avec la taille de l'écran : vide le cache si elle a changé """
+        if taille != self.resolution:
+            self.resolution = taille
+            self.vider()
+
+    def sprite(self, key, rotation=0, taille=None):
+        """ Image de la salle `key` tournée de `rotation` degrés (horaire) et de côté `taille`, ou None """
+        cle = (key, rotation % 360, taille)
+        img = self._sprites.get(cle)
+        if img is not None:
+            self._sprites.move_to_end(cle)
+            return img
+        img = self.images.get(key)
+        if img is None:
+            return None
+        if taille is not None and img.get_size() != (taille, taille):
+            img = pg.transform.smoothscale(img, (taille, taille))
+        if cle[1]:
+            img = pg.transform.rotate(img, -cle[1])
+        self._sprites[cle] = img
+        if len(self._sprites) > self.capacite:
+            self._sprites.popitem(last=False)
+        return img
+
+
+SPRITES = CacheSprites(ROOM_IMAGES)
+
+
+class CacheTextes:
+    """
+    Surfaces de texte déjà rendues, clé (police, texte, couleur, lissage) :
+    un libellé ou un compteur inchangé n'est pas rastérisé à nouveau.
+    Au plus `capacite` surfaces, les moins récemment utilisées sont oubliées.
+    """
+
+    def __init__(self, capacite=1024):
+        self.capacite = capacite
+        self._textes = OrderedDict()
+
+    def __len__(self):
+        return len(self._textes)
+
+    def vider(self):
+        self._textes.clear()
+
+    def render(self, font, text, color, antialias=True):
+        cle = (font, text, tuple(color), antialias)
+        surf = self._textes.get(cle)
+        if surf is not None:
+            self._textes.move_to_end(cle)
+            return surf
+        surf = self._textes[cle] = font.render(text, antialias, color)
+        if len(self._textes) > self.capacite:
+            self._textes.popitem(last=False)
+        return surf
 
-        ROOM_IMAGES[key] = img
+
+TEXTES = CacheTextes()
+
+def render_text(font, text, color, antialias=True):
+    """ font.render(text, antialias, color), via le cache TEXTES """
+    return TEXTES.render(font, text, color, antialias)
 
 
 # ============================================================
@@ -111,6 +242,8 @@ class UIState(Enum):
     - QUITTING : sortie du jeu.
     - GAME_OVER : plus de pas.
     - WIN : victoire.
+    - INTERACT : choix d'un objet avec lequel interagir.
+    - LOAD : chargement de la sauvegarde automatique.
     """
     MENU     = 0
     PLAYING  = 1
@@ -120,6 +253,156 @@ class UIState(Enum):
     GAME_OVER = 5
     WIN = 6
     INTERACT = 7
+    LOAD = 8
+# ==========
+#  CADENCE
+# ==========
+
+class Cadence:
+    """
+    Rythme des boucles d'affichage.
+
+    Pendant une animation (anime=True), tick() limite la boucle à `fps`
+    images par seconde, comme clock.tick. Sinon rien ne bouge à l'écran :
+    tick() dort dans pg.event.wait jusqu'au prochain événement (remis dans
+    la file pour la boucle) ou jusqu'à `reveil` (date pg.time.get_ticks(),
+    par exemple le prochain coup de l'autoplay), au plus REPOS_MAX ms.
+
+    dt : durée écoulée depuis l'image précédente, en secondes.
+    """
+
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.clock = pg.time.Clock()
+        self.dt = 0.0
+
+    def tick(self, anime=False, reveil=None):
+        if not anime:
+            delai = REPOS_MAX if reveil is None else min(REPOS_MAX, reveil - pg.time.get_ticks())
+            if delai > 0:
+                evt = pg.event.wait(delai)
+                if evt.type != pg.NOEVENT:
+                    pg.event.post(evt)
+        self.dt = self.clock.tick(self.fps) / 1000
+        return self.dt
+
+# ====================
+#  PROFILEUR D'IMAGES
+# ====================
+
+# Phases d'une image de la boucle de jeu, dans l'ordre, et leur libellé
+PHASES = (
+    ("evenements", "Événements"),
+    ("logique", "Logique"),
+    ("plateau", "Plateau"),
+    ("barre", "Barre latérale / tirage"),
+    ("echelle", "Mise à l'échelle"),
+    ("affichage", "Affichage (flip)"),
+    ("profil", "Profileur"),
+)
+PERCENTILES = (50, 95, 99)
+
+class ProfilImages:
+    """
+    Durée de chaque phase des dernières images de la boucle de jeu.
+
+    Le temps est compté par tours de chronomètre : marquer(phase) attribue
+    à `phase` le temps écoulé depuis la marque précédente. debut() ouvre
+    une image (celle en cours, non terminée, est abandonnée : menu, écran
+    d'options), fin() la range dans la fenêtre glissante des `taille`
+    dernières images (avant l'attente de cadence.tick, qui n'est pas
+    comptée) et l'écrit dans le CSV s'il y en a un.
+
+    visible : calque F3 affiché (voir draw_profil).
+    """
+
+    def __init__(self, taille=240, chemin_csv=""):
+        self.index = {phase: i for i, (phase, _) in enumerate(PHASES)}
+        self.images = deque(maxlen=taille)
+        self.nombre = 0
+        self.visible = False
+        self.chemin_csv = chemin_csv
+        self._csv = None
+        self._fichier = None
+        self._courante = [0.0] * len(PHASES)
+        self._t = time.perf_counter()
+
+    def vider(self, taille=None):
+        """ Oublie les images mesurées (taille : nouvelle fenêtre glissante) """
+        self.images = deque(maxlen=taille or self.images.maxlen)
+        self.nombre = 0
+        self.debut()
+
+    def debut(self):
+        self._courante = [0.0] * len(PHASES)
+        self._t = time.perf_counter()
+
+    def marquer(self, phase):
+        t = time.perf_counter()
+        self._courante[self.index[phase]] += t - self._t
+        self._t = t
+
+    def fin(self, etat=""):
+        image = self._courante
+        self.images.append(image)
+        self.nombre += 1
+        if self.chemin_csv:
+            self._ecrire(etat, image)
+        self.debut()
+
+    def _ecrire(self, etat, image):
+        if self._csv is None:
+            self._fichier = open(self.chemin_csv, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._fichier)
+            self._csv.writerow(["image", "etat", *(phase + "_ms" for phase, _ in PHASES), "total_ms"])
+        self._csv.writerow([self.nombre, etat, *(f"{d * 1000:.3f}" for d in image), f"{sum(image) * 1000:.3f}"])
+
+    def percentiles(self):
+        """ {phase ou "total": [p50, p95, p99, max]} en ms sur la fenêtre """
+        colonnes = list(zip(*self.images)) if self.images else [()] * len(PHASES)
+        resultat = {}
+        for (phase, _), valeurs in zip(PHASES + (("total", ""),), colonnes + [list(map(sum, self.images))]):
+            valeurs = sorted(valeurs)
+            n = len(valeurs)
+            resultat[phase] = [valeurs[min(n - 1, n * q // 100)] * 1000 if n else 0.0 for q in PERCENTILES] \
+                              + [valeurs[-1] * 1000 if n else 0.0]
+        return resultat
+
+    def fermer(self):
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = self._csv = None
+
+PROFIL = ProfilImages(chemin_csv=PROFIL_CSV)
+
+def draw_profil(screen, font, profil: ProfilImages):
+    """
+    Calque F3, dessiné directement sur l'écran (pas l'écran virtuel) : en
+    haut à gauche, à la résolution du moniteur. Renvoie le rectangle dessiné.
+    """
+    stats = profil.percentiles()
+    # Valeurs nouvelles à chaque image : font.render plutôt que render_text,
+    # pour ne pas vider le cache des textes de l'interface
+    lignes = [(f"{len(profil.images)} images (ms)", [f"p{q}" for q in PERCENTILES] + ["max"])]
+    lignes += [(libelle, [f"{v:.2f}" for v in stats[phase]]) for phase, libelle in PHASES + (("total", "Total"),)]
+    if profil.chemin_csv:
+        lignes.append((f"CSV : {profil.chemin_csv}", []))
+    hauteur = font.get_linesize()
+    largeur_libelle = max(font.size(libelle)[0] for libelle, valeurs in lignes if valeurs) + 16
+    largeur_valeur = font.size("000.00")[0] + 12
+    largeur = max([largeur_libelle + largeur_valeur * (len(PERCENTILES) + 1)]
+                  + [font.size(libelle)[0] for libelle, valeurs in lignes if not valeurs])
+    rect = pg.Rect(8, 8, largeur + 16, hauteur * len(lignes) + 12)
+    screen.fill((20, 20, 20), rect)
+    for i, (libelle, valeurs) in enumerate(lignes):
+        y = rect.y + 6 + i * hauteur
+        screen.blit(font.render(libelle, True, (255, 255, 255)), (rect.x + 8, y))
+        for j, valeur in enumerate(valeurs):
+            surf = font.render(valeur, True, (255, 255, 255))
+            droite = rect.x + 8 + largeur_libelle + largeur_valeur * (j + 1)
+            screen.blit(surf, (droite - surf.get_width(), y))
+    return rect
+
 # ===============
 #  MENU PRINCIPAL 
 # ===============
@@ -160,7 +443,7 @@ def draw_main_menu(screen, big, font, bg_img, focus_idx):
     for i, (r, label) in enumerate(zip(rects, labels)):
         hovered = r.collidepoint(mx, my) or (i == focus_idx)
         draw_pill_button(screen, r, hovered)
-        txt = font.render(label, True, ACCENT_DARK if hovered else TEXT_DARK)
+        txt = render_text(font, label, ACCENT_DARK if hovered else TEXT_DARK)
         screen.blit(txt, txt.get_rect(center=r.center))
 
     return rects
@@ -183,7 +466,7 @@ def draw_pill_button(screen, rect, hovered):
     screen.blit(btn, rect.topleft)
 
 
-def run_main_menu(screen,surface, big, font, clock, assets_dir,monitor_size):
+def run_main_menu(screen,surface, big, font, cadence, assets_dir,monitor_size):
     """
     Affiche et gère le menu principal du jeu.
     """
@@ -195,8 +478,9 @@ def run_main_menu(screen,surface, big, font, clock, assets_dir,monitor_size):
             break
 
     labels = ["Nouvelle partie", "Charger", "Options", "Quitter"]
-    actions = [UIState.PLAYING, "LOAD", UIState.OPTIONS, UIState.QUITTING]
+    actions = [UIState.PLAYING, UIState.LOAD, UIState.OPTIONS, UIState.QUITTING]
     focus_idx = 0
+    affiche = None
 
     while True:
         for event in pg.event.get():
@@ -228,70 +512,218 @@ def run_main_menu(screen,surface, big, font, clock, assets_dir,monitor_size):
                         act = actions[i]
                         return act if isinstance(act, UIState) else UIState.MENU
 
-        draw_main_menu(surface, big, font, bg_img, focus_idx)
-        MONITOR_W, MONITOR_H = monitor_size
-        scaled_surface = pg.transform.smoothscale(surface, (MONITOR_W, MONITOR_H))
-        screen.blit(scaled_surface, (0, 0))
-        pg.display.flip()
-        clock.tick(FPS)
-
-def scale_and_blit(screen, v_screen, monitor_size, border_texture=None):
+        # Redessiné seulement quand le bouton en surbrillance change
+        mx, my = pg.mouse.get_pos()
+        survol = [r.collidepoint(mx, my) for r in _button_rects(center_x=surface.get_width() // 2, start_y=400)]
+        if (focus_idx, survol) != affiche:
+            affiche = (focus_idx, survol)
+            draw_main_menu(surface, big, font, bg_img, focus_idx)
+            MONITOR_W, MONITOR_H = monitor_size
+            pg.transform.smoothscale(surface, (MONITOR_W, MONITOR_H), screen)
+            pg.display.flip()
+        cadence.tick()
+
+# ============
+#  COMPOSITION
+# ============
+
+def placement(virtual_size, monitor_size, entier=False):
     """
-    Centre l'écran virtuel sur le moniteur,
-    ajoute une texture dans les bandes noires autour,
+    Échelle, position et taille de l'écran virtuel centré sur le moniteur.
+    entier=True arrondit l'échelle à l'entier inférieur (au moins 1).
     """
+    W, H = virtual_size
     MON_W, MON_H = monitor_size
-    W, H = v_screen.get_size()
-
     scale = min(MON_W / W, MON_H / H)
+    if entier:
+        scale = max(1, int(scale))
     new_w = int(W * scale)
     new_h = int(H * scale)
+    return scale, (MON_W - new_w) // 2, (MON_H - new_h) // 2, new_w, new_h
 
-    # Position centrée de l’interface
-    x = (MON_W - new_w) // 2
-    y = (MON_H - new_h) // 2
-
-    # Efface l’écran
-    screen.fill((0, 0, 0))
-
-    # === Appliquer fond mural UNIQUEMENT dans les bandes noires ===
+def build_letterbox(monitor_size, rect, border_texture=None):
+    """
+    Fond du moniteur : noir, avec la texture répétée dans les bandes
+    autour de `rect` (l'emplacement de l'écran virtuel).
+    """
+    MON_W, MON_H = monitor_size
+    fond = pg.Surface(monitor_size)
+    fond.fill((0, 0, 0))
     if border_texture:
         tex_w, tex_h = border_texture.get_size()
-
-        # Zone AU-DESSUS
-        for yy in range(0, y, tex_h):
+        for yy in range(0, MON_H, tex_h):
             for xx in range(0, MON_W, tex_w):
-                screen.blit(border_texture, (xx, yy))
+                fond.blit(border_texture, (xx, yy))
+        fond.fill((0, 0, 0), rect)
+    return fond
 
-        # Zone EN-DESSOUS
-        bottom_h = MON_H - (y + new_h)
-        for yy in range(y + new_h, MON_H, tex_h):
-            for xx in range(0, MON_W, tex_w):
-                screen.blit(border_texture, (xx, yy))
+class Compositeur:
+    """
+    Compose l'image du moniteur à partir de l'écran virtuel.
 
-        # Zone GAUCHE
-        for yy in range(y, y + new_h, tex_h):
-            for xx in range(0, x, tex_w):
-                screen.blit(border_texture, (xx, yy))
+    Le fond des bandes autour de l'écran virtuel est construit une fois
+    (build_letterbox). L'écran virtuel mis à l'échelle est gardé dans
+    `image` : presenter() n'en recalcule que les zones modifiées, et
+    rafraichir() réaffiche le tout sans rien recalculer.
 
-        # Zone DROITE
-        for yy in range(y, y + new_h, tex_h):
-            for xx in range(x + new_w, MON_W, tex_w):
-                screen.blit(border_texture, (xx, yy))
+    Avec entier=True, l'échelle est entière : agrandissement par
+    pg.transform.scale (sans filtrage, bien plus rapide que smoothscale et
+    exact zone par zone), ou simple copie à l'échelle 1, au prix de bandes
+    plus larges.
+    """
 
-    # === Affiche l'écran virtuel AU CENTRE ===
-    scaled = pg.transform.smoothscale(v_screen, (new_w, new_h))
-    screen.blit(scaled, (x, y))
+    def __init__(self, virtual_size, monitor_size, border_texture=None, entier=False):
+        self.virtual_size = virtual_size
+        self.monitor_size = monitor_size
+        self.scale, x, y, w, h = placement(virtual_size, monitor_size, entier)
+        self.entier = entier
+        self.rect = pg.Rect(x, y, w, h)
+        self.fond = build_letterbox(monitor_size, self.rect, border_texture)
+        self.image = pg.Surface((w, h))
+
+    def _echelle(self, source, cible):
+        if self.scale == 1:
+            cible.blit(source, (0, 0))
+        elif self.entier:
+            pg.transform.scale(source, cible.get_size(), cible)
+        else:
+            pg.transform.smoothscale(source, cible.get_size(), cible)
+
+    def zone_image(self, rect):
+        """ Rectangle de `image` couvert par un rectangle de l'écran virtuel """
+        left, top = int(rect.left * self.scale), int(rect.top * self.scale)
+        right, bottom = math.ceil(rect.right * self.scale), math.ceil(rect.bottom * self.scale)
+        return pg.Rect(left, top, right - left, bottom - top).clip(self.image.get_rect())
+
+    def presenter(self, screen, v_screen, zones=None):
+        """
+        Met à l'échelle les zones (rectangles de l'écran virtuel) et les
+        envoie à l'écran avec pg.display.update ; zones=None : tout l'écran.
+        """
+        if zones is None:
+            self._echelle(v_screen, self.image)
+            self.rafraichir(screen)
+            return
+        modifies = []
+        for rect in zones:
+            cible = self.zone_image(rect)
+            self._echelle(v_screen.subsurface(rect), self.image.subsurface(cible))
+            modifies.append(screen.blit(self.image, cible.move(self.rect.topleft), cible))
+        PROFIL.marquer("echelle")
+        pg.display.update(modifies)
+        PROFIL.marquer("affichage")
+
+    def rafraichir(self, screen):
+        """ Réaffiche le fond et la dernière image, sans mise à l'échelle """
+        screen.blit(self.fond, (0, 0))
+        screen.blit(self.image, self.rect)
+        PROFIL.marquer("echelle")
+        pg.display.flip()
+        PROFIL.marquer("affichage")
 
-    pg.display.flip()
+_COMPOSITEURS = {}
 
+def compositeur(virtual_size, monitor_size, border_texture=None, entier=None):
+    """ Compositeur partagé pour ces tailles et cette texture (un seul fond construit) """
+    entier = ECHELLE_ENTIERE if entier is None else entier
+    cle = (tuple(virtual_size), tuple(monitor_size), id(border_texture), entier)
+    comp = _COMPOSITEURS.get(cle)
+    if comp is None:
+        if len(_COMPOSITEURS) >= 8:
+            _COMPOSITEURS.clear()
+        comp = _COMPOSITEURS[cle] = Compositeur(virtual_size, monitor_size, border_texture, entier)
+    return comp
 
+def scale_and_blit(screen, v_screen, monitor_size, border_texture=None):
+    """
+    Centre l'écran virtuel sur le moniteur,
+    ajoute une texture dans les bandes noires autour (voir Compositeur)
+    """
+    compositeur(v_screen.get_size(), monitor_size, border_texture).presenter(screen, v_screen)
+
+# ===============
+#  RENDU PARTIEL
+# ===============
+
+class RenduPartiel:
+    """
+    Ne redessine que les zones de l'écran virtuel dont le contenu a changé.
+
+    Chaque zone (case du plateau, bloc de la barre latérale, ligne de
+    message...) a une clé, un rectangle et une signature : les valeurs
+    qu'elle affiche. zone() ne la redessine que si sa signature a changé
+    depuis l'image précédente, et presenter() ne met à l'échelle et
+    n'envoie à l'écran (pg.display.update) que ces rectangles. Une image
+    identique à la précédente ne coûte presque rien.
 
+    invalider() force à tout redessiner (changement d'écran, retour du menu).
+    """
 
-def _run_options(screen, font, big, clock):
+    def __init__(self):
+        self.signatures = {}
+        self.zones = []
+        self.complet = True
+
+    def invalider(self):
+        self.signatures.clear()
+        self.complet = True
+
+    def zone(self, cle, rect, signature, dessiner, *args):
+        """ Appelle dessiner(*args) si la signature de la zone a changé """
+        if not self.complet and cle in self.signatures and self.signatures[cle] == signature:
+            return
+        self.signatures[cle] = signature
+        dessiner(*args)
+        self.zones.append(rect)
+
+    def presenter(self, screen, v_screen, monitor_size, border_texture=None):
+        """ Envoie à l'écran les zones redessinées (tout l'écran après invalider()) """
+        if self.complet or self.zones:
+            compositeur(v_screen.get_size(), monitor_size, border_texture).presenter(
+                screen, v_screen, None if self.complet else self.zones)
+        self.zones.clear()
+        self.complet = False
+
+def render_board(rendu, screen, room_grid, player: joueur, img_entree, img_anti, active_direction):
+    """ draw_board, case par case, pour les cases qui ont changé """
+    if rendu.complet:
+        screen.fill(BG2, pg.Rect(0,0,BOARD_W,H))
+    for r in range(ROWS):
+        for c in range(COLS):
+            room = room_grid[r][c]
+            actif = (r,c) == (player.ligne, player.colonne)
+            # (l'image de la salle peut arriver après la salle, voir ChargeurImages)
+            salle = (room.spec.key, room.rotation, ROOM_IMAGES.get(room.spec.key) is not None) if room else None
+            signature = (salle, actif, actif and active_direction)
+            rendu.zone(("case", r, c), grid_rect(r,c), signature,
+                       draw_cell, screen, r, c, room, player, img_entree, img_anti, active_direction)
+
+def render_sidebar(rendu, screen, font, big, player: joueur, current_room_name, icons, last_message, step_flash, step_flash_time):
+    """ draw_sidebar, bloc par bloc, pour les blocs qui ont changé """
+    if rendu.complet:
+        screen.fill(BG1, pg.Rect(BOARD_W,0,SIDEBAR_W,H))
+    flash = step_flash if step_flash and step_flash_time > 0 else None
+    # Chaque bloc de l'inventaire suit la version de son champ (joueur observé,
+    # voir Partie(observe=True)) et la présence de son icône (voir ChargeurImages)
+    assert isinstance(player, JoueurObserve), "render_sidebar demande un joueur observé"
+    rendu.zone("entete", SIDEBAR_ENTETE, None, draw_inventory_header, screen, font, big)
+    icones = tuple(icons.get(champ) is not None for champ, _, _ in INVENTAIRE_PERMANENTS)
+    rendu.zone("permanents", SIDEBAR_PERMANENTS, (player, player.versions["objet_permanents"], icones),
+               draw_permanents, screen, font, player, icons)
+    for i, (champ, _, _) in enumerate(INVENTAIRE_CONSOMMABLES):
+        rendu.zone(("compteur", champ), counter_rect(i), (player, player.versions[champ], icons.get(champ) is not None),
+                   draw_counter, screen, font, big, player, icons, i)
+    rendu.zone("salle", SIDEBAR_SALLE, (current_room_name, flash),
+               draw_room_name, screen, big, current_room_name, flash, step_flash_time)
+    rendu.zone("message", SIDEBAR_MESSAGE, last_message, draw_message, screen, font, last_message)
+
+
+def _run_options(screen, font, big, cadence):
     """
-    Affiche et gère la section "options".
+    Affiche et gère la section "options" : plafond d'images par seconde
+    (Gauche / Droite).
     """
+    choix = PLAFONDS_FPS.index(cadence.fps) if cadence.fps in PLAFONDS_FPS else 0
     running = True
     while running:
         for e in pg.event.get():
@@ -299,14 +731,22 @@ def _run_options(screen, font, big, clock):
                 running = False
             if e.type == pg.KEYDOWN and e.key == pg.K_ESCAPE:
                 running = False
+            if e.type == pg.KEYDOWN and e.key in (pg.K_LEFT, pg.K_q):
+                choix = max(0, choix - 1)
+            if e.type == pg.KEYDOWN and e.key in (pg.K_RIGHT, pg.K_d):
+                choix = min(len(PLAFONDS_FPS) - 1, choix + 1)
             if e.type == pg.MOUSEBUTTONDOWN and e.button == 1:
                 running = False
+        cadence.fps = PLAFONDS_FPS[choix]
 
+        plafond = str(cadence.fps) if cadence.fps else "sans limite"
         screen.fill((240,244,248))
-        screen.blit(big.render("Options", True, TEXT_DARK), (40,40))
-        screen.blit(font.render("Paramètres à implémenter...", True, MUTED), (40,110))
+        screen.blit(render_text(big, "Options", TEXT_DARK), (40,40))
+        screen.blit(render_text(font, f"Images par seconde max :  < {plafond} >", TEXT_DARK), (40,110))
+        screen.blit(render_text(font, "Au repos, l'écran n'est redessiné qu'à chaque événement.", MUTED), (40,140))
+        screen.blit(render_text(font, "Gauche / Droite : changer    Échap : retour", MUTED), (40,190))
         pg.display.flip()
-        clock.tick(FPS)
+        cadence.tick()
 
 # ==================
 #  MUSIQUE + IMAGES
@@ -330,162 +770,110 @@ def opt_obj(name):
     p = os.path.join(ASSETS, name)
     return load_png(name, INV_ICON) if os.path.exists(p) else None
 
-# ====================
-#  TIRAGE DE 3 SALLES
-# ====================
-
-def get_opposite_dir(dir: Orientation):
-    """Retourne l'orientation opposée"""
-    if dir == Orientation.N: return Orientation.S
-    if dir == Orientation.S: return Orientation.N
-    if dir == Orientation.E: return Orientation.O
-    if dir == Orientation.O: return Orientation.E
-    return None
-
-def draft_three_rooms(row: int, col: int, entrance_direction: Orientation , pioche: list):
-    """ Tire trois salles compatibles avec la rareté. """
-    
-    needed_door = get_opposite_dir(entrance_direction)
-    
-    valid_options = []
-    for spec in pioche:
-        if spec.key in {"ROOM_46", "ANTECHAMBER"}:
-            continue
-            
-        # On teste les 4 rotations
-        for rotation in [0, 90, 180, 270]:
-            room_doors = Doors.shape_orientations(spec.shape, rotation)
-            
-            if needed_door not in room_doors:
-                continue 
-
-            if not allowed_room_positions(spec, row, col, rotation):
-                continue 
-            
-            valid_options.append( (spec, rotation) )
-            break
-            
-    lvl = Doors.level_by_row(row)
-    if lvl == 0:
-        rare_ok = ("Common","Commonplace","Standard",None)
-    elif lvl == 1:
-        rare_ok = ("Unusual","Rare","Standard")
-    else:
-        rare_ok = ("Rumored","Epic","Very Rare","Rare")
-    
-    pool = valid_options
-    if len(pool) < 3:
-        return random.choices(pool, k=3)
-    else:
-        return random.sample(pool, 3)
-
-def reroll_draft(row: int, col: int, player: joueur, draft_list,pioche: list, entrance_dir: Orientation):
-    """ Reroll du draft si joueur possède un dé. """
-    if player.des <= 0:
-        return draft_list, False
-    player.des -= 1
-    return draft_three_rooms(row, col, entrance_dir, pioche), True
-
-def apply_room_loot(player: joueur, room: Room, room_grid):
+# Inventaire de la barre latérale : (champ du joueur, libellé, icône).
+# Consommables : attributs de joueur ; permanents : clés de objet_permanents
+INVENTAIRE_CONSOMMABLES = (
+    ("pas", "Pas", "footstep.png"),
+    ("orr", "Pièces", "money.png"),
+    ("gemmes", "Gems", "diamond.png"),
+    ("cles", "Clés", "key.png"),
+    ("des", "Dés", "dice.png"),
+)
+INVENTAIRE_PERMANENTS = (
+    ("Pelle", "Pelle", "shovel.png"),
+    ("Detecteur de meteaux", "Détecteur", "metal-detector.png"),
+    ("Patte de lapin", "Patte de lapin", "rabbit_foot.png"),
+    ("Kit de crochetage", "KC", "lockpick.png"),
+    ("Marteau", "Marteau", "hammer.png"),
+)
+ICONES = {champ: fichier for champ, _, fichier in INVENTAIRE_CONSOMMABLES + INVENTAIRE_PERMANENTS}
+
+def asset_requests(images, icons):
     """
-    Applique les effets immédiats : pas, pièces, gemmes, malus.
+    Images de l'interface : (dictionnaire, clé, fichier, taille) pour la
+    texture de brick, l'entrée et l'antichambre (images), les salles
+    (ROOM_IMAGES) et les icônes (icons).
     """
-    eff = room.effects
-    if not eff:
-        return None
-
-    # --- Gains simples de pas ---
-    if "regain_steps" in eff:
-        g = eff["regain_steps"]
-        player.pas += g
-        return f"You gain {g} step(s)."
-
-    # --- Pertes simples ---
-    if "penalty_steps" in eff:
-        p = eff["penalty_steps"]
-        player.pas -= p
-        return f"You lose {p} step(s)."
-
-    # --- Perte de la moitié ---
-    if eff.get("penalty_half"):
-        lost = player.pas // 2
-        player.pas -= lost
-        return f"You lose {lost} step(s)."
-
-    # --- +1 pas par salle dans la maison ---
-    if "regain_steps_per_room" in eff:
-        total = sum(1 for row in room_grid for r in row if r)
-        g = total * eff["regain_steps_per_room"]
-        player.pas += g
-        return f"You gain {g} step(s) from Master Bedroom."
-
-    # --- +1 pas par chambre (Bedroom) ---
-    if "regain_steps_per_bedroom" in eff:
-        total = sum(
-            1 for row in room_grid for r in row
-            if r and "bedroom" in r.spec.tags
-        )
-        g = total * eff["regain_steps_per_bedroom"]
-        player.pas += g
-        return f"You gain {g} step(s) from Servant's Quarters."
-
-    # --- Vault / pièces ---
-    if "loot_coins" in eff:
-        coins = eff["loot_coins"]
-        player.add_item("orr", coins)
-        return f"You gain {coins} coin(s)."
-    
-    # --- TELEPORT PAD ---
-    if "teleport" in eff:
-    # liste des salles déjà construites (sauf la salle actuelle)
-        possible = [
-        (r, c) 
-        for r in range(ROWS) 
-        for c in range(COLS)
-        if room_grid[r][c] is not None and (r, c) != (player.ligne, player.colonne)
-        ]
-
-        if possible:
-            # téléportation aléatoire
-            r2, c2 = random.choice(possible)
-            player.ligne, player.colonne = r2, c2
-            return "You were teleported to another room!"
-        else:
-            return "Teleportation failed (no other room discovered)."
+    icon = CELL - 8
+    demandes = [(images, "brick", "bluep.jpg", 200),
+                (images, "entree", "entree.webp", icon),
+                (images, "anti", "antichambre.webp", icon)]
+    demandes += [(ROOM_IMAGES, key, filename, icon) for key, filename in room_image_files().items()]
+    demandes += [(icons, key, filename, INV_ICON) for key, filename in ICONES.items()]
+    return demandes
+
+# Événement posté quand une image a fini d'être décodée (réveille Cadence)
+IMAGE_DECODEE = pg.event.custom_type()
+
+def _decoder(path, size):
+    """ Décodage (thread du pool) : surface brute, mise à l'échelle si possible """
+    surf = pg.image.load(path)
+    if surf.get_bitsize() >= 24:
+        surf = pg.transform.smoothscale(surf, (size, size))
+    return surf
+
+class ChargeurImages:
+    """
+    Charge les images de assets/ en arrière-plan.
 
+    Le décodage (webp, png, jpg) et la mise à l'échelle se font dans un
+    pool de threads ; convert_alpha, qui a besoin de l'affichage, se fait
+    sur le fil principal dans recevoir(), appelé à chaque tour de boucle.
+    En attendant, l'image vaut None et les dessins utilisent leur rendu de
+    secours (rectangle de couleur, pas d'icône).
+    """
 
-    return None
+    def __init__(self, threads=None):
+        self._pool = ThreadPoolExecutor(max_workers=threads or min(8, os.cpu_count() or 1),
+                                        thread_name_prefix="images")
+        self._attente = []
+
+    def __len__(self):
+        return len(self._attente)
+
+    def demander(self, destination, cle, name, size):
+        """ Charge assets/name en size x size dans destination[cle] """
+        destination.setdefault(cle, None)
+        path = os.path.join(ASSETS, name)
+        if not os.path.exists(path):
+            return
+        future = self._pool.submit(_decoder, path, size)
+        future.add_done_callback(lambda _: pg.event.post(pg.event.Event(IMAGE_DECODEE)))
+        self._attente.append((future, destination, cle, size))
+
+    def recevoir(self):
+        """ Range les images décodées depuis le dernier appel ; renvoie leurs clés """
+        arrivees, reste = [], []
+        for future, destination, cle, size in self._attente:
+            if not future.done():
+                reste.append((future, destination, cle, size))
+                continue
+            try:
+                surf = future.result().convert_alpha()
+            except (OSError, pg.error) as exc:
+                logging.getLogger("blueprince").warning("Image %s illisible : %s", cle, exc)
+                continue
+            if surf.get_size() != (size, size):
+                surf = pg.transform.smoothscale(surf, (size, size))
+            destination[cle] = surf
+            arrivees.append(cle)
+        self._attente = reste
+        return arrivees
 
+    def fermer(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
+# ====================
+#  TIRAGE DE 3 SALLES
+# ====================
+# Le tirage lui-même (draft_three_rooms, reroll_draft, apply_room_loot)
+# est dans moteur.py, partagé avec les simulations sans affichage.
 
 def room_has_opening(spec, orientation):
     """Retourne True si la salle possède une porte dans l'orientation demandée."""
     dirs = Doors.shape_orientations(spec.shape)
     return orientation in dirs
 
-def allowed_room_positions(spec, new_r, new_c,rotation):
-    """Filtre géographique : vérifie que la salle peut exister à la position."""
-    dirs = Doors.shape_orientations(spec.shape, rotation)
-
-    # bord du haut → pas de porte Nord
-    if new_r == 0 and Orientation.N in dirs:
-        return False
-
-    # bord du bas
-    if new_r == ROWS - 1 and Orientation.S in dirs:
-        return False
-
-    # bord gauche
-    if new_c == 0 and Orientation.O in dirs:
-        return False
-
-    # bord droit
-    if new_c == COLS - 1 and Orientation.E in dirs:
-        return False
-
-    return True
-
-
 def rotate_shape_to_fit(spec, entrance_dir):
     """
     Retourne une nouvelle RoomSpec avec rotation effectuée
@@ -576,120 +964,130 @@ def grid_rect(r, c):
     y = PAD + r * (CELL + GAP)
     return pg.Rect(x, y, CELL, CELL)
 
+def draw_cell(screen, r, c, room, player: joueur, img_entree, img_anti, active_direction):
+    """ Dessine une case du plateau (fond compris) """
+    rect = grid_rect(r,c)
+    screen.fill(BG2, rect)
+
+    # entrée
+    if (r,c) == ENTRY_POS:
+        if img_entree:
+            screen.blit(img_entree, img_entree.get_rect(center=rect.center))
+        else:
+            pg.draw.rect(screen, (90,200,255), rect, border_radius=10)
+
+    # anti-chambre
+    elif (r,c) == ANTI_POS:
+        if img_anti:
+            screen.blit(img_anti, img_anti.get_rect(center=rect.center))
+        else:
+            pg.draw.rect(screen, (255,160,90), rect, border_radius=10)
+
+    else:
+        if room:
+            # AJOUT : afficher l'image de la salle si disponible
+            rotated_img = SPRITES.sprite(room.spec.key, room.rotation)
+            if rotated_img:
+                screen.blit(rotated_img, rotated_img.get_rect(center=rect.center))
+            else:
+                pg.draw.rect(screen, ROOM_COL, rect, border_radius=8)
+
+    # salle active
+    if (r,c) == (player.ligne, player.colonne):
+        pg.draw.rect(screen, WHITE, rect, width=3, border_radius=10)
+        if active_direction:
+            draw_direction_hint(screen, rect, active_direction)
+
 def draw_board(screen, room_grid, player: joueur, img_entree, img_anti, active_direction):
     """ Construire le plateau de jeu à gauche de l'écran  """
     screen.fill(BG2, pg.Rect(0,0,BOARD_W,H))
 
     for r in range(ROWS):
         for c in range(COLS):
-            rect = grid_rect(r,c)
-            room = room_grid[r][c]
-
-            # entrée
-            if (r,c) == ENTRY_POS:
-                if img_entree:
-                    screen.blit(img_entree, img_entree.get_rect(center=rect.center))
-                else:
-                    pg.draw.rect(screen, (90,200,255), rect, border_radius=10)
-
-            # anti-chambre
-            elif (r,c) == ANTI_POS:
-                if img_anti:
-                    screen.blit(img_anti, img_anti.get_rect(center=rect.center))
-                else:
-                    pg.draw.rect(screen, (255,160,90), rect, border_radius=10)
-
-            else:
-                if room:
-                    # AJOUT : afficher l'image de la salle si disponible
-                    img = ROOM_IMAGES.get(room.spec.key)
-                    if img:
-                        rotation = room.rotation
-                        rotated_img = pg.transform.rotate(img, -rotation)
-                        screen.blit(rotated_img, rotated_img.get_rect(center=rect.center))
-                    else:
-                        pg.draw.rect(screen, ROOM_COL, rect, border_radius=8)
-
-            # salle active
-            if (r,c) == (player.ligne, player.colonne):
-                pg.draw.rect(screen, WHITE, rect, width=3, border_radius=10)
-                if active_direction:
-                    draw_direction_hint(screen, rect, active_direction)
+            draw_cell(screen, r, c, room_grid[r][c], player, img_entree, img_anti, active_direction)
 
 # ======================
 #  SIDEBAR / INVENTAIRE 
 # ======================
 
-def draw_sidebar(screen, font, big, player: joueur, current_room_name, icons, last_message, step_flash, step_flash_time):
-    """ Construire l'inventaire à droite de l'écran  """
-    x0 = BOARD_W
-    screen.fill(BG1, pg.Rect(x0,0,SIDEBAR_W,H))
-
-    screen.blit(big.render("Inventory:", True, TEXT_DARK), (x0+24,24))
-
-    inventory = {
-        "pas": player.pas,
-        "pièces": player.orr,
-        "gems": player.gemmes,
-        "clés": player.cles,
-        "dés": player.des,
-        "pelle": 1 if "Pelle" in player.objet_permanents else 0,
-        "detecteur de meteaux": 1 if "Detecteur de meteaux" in player.objet_permanents else 0,
-        "patte de lapin": 1 if "Patte de lapin" in player.objet_permanents else 0,
-        "kit de crochetage": 1 if "Kit de crochetage" in player.objet_permanents else 0,
-        "marteau": 1 if "Marteau" in player.objet_permanents else 0,
-    }
-
-    permanents = [
-        ("pelle","Pelle"), ("detecteur de meteaux","Détecteur"),
-        ("patte de lapin","Patte de lapin"), ("kit de crochetage","KC"),
-        ("marteau","Marteau")
-    ]
-
-    conso = [
-        ("pas","Pas"), ("pièces","Pièces"),
-        ("gems","Gems"), ("clés","Clés"), ("dés","Dés")
-    ]
-
-    colL = x0+24
-    colR = x0+SIDEBAR_W//2+20
+# Blocs de la barre latérale (redessinés séparément, voir RenduPartiel)
+INV_ROW = INV_ICON + 24
+SIDEBAR_ENTETE     = pg.Rect(BOARD_W, 0, SIDEBAR_W, 80)
+SIDEBAR_PERMANENTS = pg.Rect(BOARD_W, 80, SIDEBAR_W//2, 252)
+SIDEBAR_INVENTAIRE = pg.Rect(BOARD_W, 0, SIDEBAR_W, 332)
+SIDEBAR_SALLE      = pg.Rect(BOARD_W, 332, SIDEBAR_W, 80)
+SIDEBAR_MESSAGE    = pg.Rect(BOARD_W, H-48, SIDEBAR_W, 48)
+
+def counter_rect(i):
+    """ Ligne du i-ème consommable (colonne de droite) """
+    return pg.Rect(BOARD_W + SIDEBAR_W//2, 80 + i * INV_ROW, SIDEBAR_W//2, INV_ROW)
+
+def draw_inventory_header(screen, font, big):
+    screen.fill(BG1, SIDEBAR_ENTETE)
+    screen.blit(render_text(big, "Inventory:", TEXT_DARK), (BOARD_W+24,24))
+    screen.blit(render_text(font, "Permanents", MUTED), (BOARD_W+24,56))
+    screen.blit(render_text(font, "Consommables", MUTED), (BOARD_W+SIDEBAR_W//2+20,56))
+
+def draw_permanents(screen, font, player: joueur, icons):
+    """ Objets permanents possédés, les uns sous les autres """
+    screen.fill(BG1, SIDEBAR_PERMANENTS)
+    colL = BOARD_W+24
     dx = INV_ICON + 10
-    valdx = 120
-
-    screen.blit(font.render("Permanents", True, MUTED), (colL,56))
-    screen.blit(font.render("Consommables", True, MUTED), (colR,56))
-
     yL = 80
-    for key,label in permanents:
-        if inventory[key] > 0:
-            ico = icons.get(key)
+    for champ, label, _ in INVENTAIRE_PERMANENTS:
+        if champ in player.objet_permanents:
+            ico = icons.get(champ)
             if ico: screen.blit(ico, (colL,yL))
-            screen.blit(font.render(label,True,TEXT_DARK),(colL+dx,yL+6))
-            yL += INV_ICON + 24
-
-    yR = 80
-    for key,label in conso:
-        ico = icons.get(key)
-        if ico: screen.blit(pg.transform.smoothscale(ico,(INV_ICON,INV_ICON)),(colR,yR+4))
-        screen.blit(font.render(label,True,TEXT_DARK),(colR+dx,yR+6))
-        screen.blit(big.render(str(inventory[key]),True,TEXT_DARK),(colR+valdx,yR+2))
-        yR += INV_ICON + 24
-
-    yb = max(yL,yR) + 12
-    screen.blit(big.render(current_room_name, True, TEXT_DARK),(x0+24,yb))
+            screen.blit(render_text(font, label, TEXT_DARK),(colL+dx,yL+6))
+            yL += INV_ROW
+
+def draw_counter(screen, font, big, player: joueur, icons, i):
+    """ i-ème consommable : icône, libellé, valeur """
+    champ, label, _ = INVENTAIRE_CONSOMMABLES[i]
+    rect = counter_rect(i)
+    screen.fill(BG1, rect)
+    colR, yR = rect.x + 20, rect.y
+    ico = icons.get(champ)
+    if ico: screen.blit(ico,(colR,yR+4))
+    screen.blit(render_text(font, label, TEXT_DARK),(colR+INV_ICON+10,yR+6))
+    screen.blit(render_text(big, str(getattr(player, champ)), TEXT_DARK),(colR+120,yR+2))
+
+def draw_inventory(screen, font, big, player: joueur, icons):
+    """ Compteurs et objets permanents du joueur """
+    screen.fill(BG1, SIDEBAR_INVENTAIRE)
+    draw_inventory_header(screen, font, big)
+    draw_permanents(screen, font, player, icons)
+    for i in range(len(INVENTAIRE_CONSOMMABLES)):
+        draw_counter(screen, font, big, player, icons, i)
+
+def draw_room_name(screen, big, current_room_name, step_flash, step_flash_time):
+    """ Nom de la salle courante et variation de pas """
+    x0, yb = SIDEBAR_SALLE.topleft
+    screen.fill(BG1, SIDEBAR_SALLE)
+    screen.blit(render_text(big, current_room_name, TEXT_DARK),(x0+24,yb))
 
     if step_flash and step_flash_time > 0:
         color = (0,180,0) if step_flash.startswith("+") else (220,40,40)
-        screen.blit(big.render(step_flash, True, color), (x0+24, yb+40))
+        screen.blit(render_text(big, step_flash, color), (x0+24, yb+40))
 
+def draw_message(screen, font, last_message):
+    """ Ligne de message en bas de la barre latérale """
+    screen.fill(BG1, SIDEBAR_MESSAGE)
     if last_message:
-        screen.blit(font.render(last_message, True, (0,0,0)), (x0+24, H-40))
+        screen.blit(render_text(font, last_message, (0,0,0)), (BOARD_W+24, H-40))
+
+def draw_sidebar(screen, font, big, player: joueur, current_room_name, icons, last_message, step_flash, step_flash_time):
+    """ Construire l'inventaire à droite de l'écran  """
+    screen.fill(BG1, pg.Rect(BOARD_W,0,SIDEBAR_W,H))
+    draw_inventory(screen, font, big, player, icons)
+    draw_room_name(screen, big, current_room_name, step_flash, step_flash_time)
+    draw_message(screen, font, last_message)
 
 # =======
 #  DRAFT
 # =======
 
-def draw_draft(screen, font, big, draft_list, focus_idx, icons):
+def draw_draft(screen, font, big, draft_list, focus_idx, icons, regles=REGLES_DEFAUT):
     """
     Affiche les 3 salles du draft :
        
@@ -699,7 +1097,7 @@ def draw_draft(screen, font, big, draft_list, focus_idx, icons):
     screen.fill((240,240,240), pg.Rect(x0,0,SIDEBAR_W,H))
 
     # Titre du draft
-    title = big.render("Choose a Room to Draft", True, TEXT_DARK)
+    title = render_text(big, "Choose a Room to Draft", TEXT_DARK)
     screen.blit(title, (x0 + 90, 40))
 
     # Position des 3 emplacements (espacés)
@@ -708,7 +1106,7 @@ def draw_draft(screen, font, big, draft_list, focus_idx, icons):
     img_size = 100   # taille des vignettes
 
     # Icône gemmes
-    gem_icon = icons.get("gems")
+    gem_icon = icons.get("gemmes")
 
     for i, entry in enumerate(draft_list):
 
@@ -718,9 +1116,8 @@ def draw_draft(screen, font, big, draft_list, focus_idx, icons):
         # ============================
         # 1) Image de la salle (centrée)
         # ============================
-        img = ROOM_IMAGES.get(spec.key)
-        if img:
-            room_img = pg.transform.smoothscale(img, (img_size, img_size))
+        room_img = SPRITES.sprite(spec.key, taille=img_size)
+        if room_img:
             pos = room_img.get_rect(center=(xs[i], slot_y))
             screen.blit(room_img, pos)
         else:
@@ -738,19 +1135,19 @@ def draw_draft(screen, font, big, draft_list, focus_idx, icons):
         if len(spec.name) > 14:
             name_y += 10
 
-        name_txt = font.render(spec.name, True, name_color)
+        name_txt = render_text(font, spec.name, name_color)
         screen.blit(name_txt, name_txt.get_rect(center=(xs[i], name_y)))
 
         # ============================
         # 3) Coût en gemmes
         # ============================
-        cost = spec.cost_gems or 0
+        cost = regles.cout(spec)
         if cost > 0 and gem_icon:
             gem_y = name_y + 20
             # icône
             screen.blit(gem_icon, gem_icon.get_rect(center=(xs[i] - 12, gem_y)))
             # nombre
-            cost_txt = font.render(str(cost), True, (0,0,0))
+            cost_txt = render_text(font, str(cost), (0,0,0))
             screen.blit(cost_txt, cost_txt.get_rect(center=(xs[i] + 12, gem_y)))
 
         # ============================
@@ -776,15 +1173,15 @@ def draw_draft(screen, font, big, draft_list, focus_idx, icons):
             x_pos = x0 + (SIDEBAR_W // 2)
             y_pos = 280
             
-            txt = font.render(effect_description, True, TEXT_DARK)
+            txt = render_text(font, effect_description, TEXT_DARK)
             screen.blit(txt, txt.get_rect(center=(x_pos, y_pos)))
     # ====================================
     # Boutons Reroll / Use Object (bas)
     # ====================================
-    rr = big.render("Redraw (R)", True, (60,60,60))
+    rr = render_text(big, "Redraw (R)", (60,60,60))
     screen.blit(rr, rr.get_rect(center=(x0 + SIDEBAR_W//2, 360)))
 
-    use = big.render("Use Object (U)", True, (28,160,110))
+    use = render_text(big, "Use Object (U)", (28,160,110))
     screen.blit(use, use.get_rect(center=(x0 + SIDEBAR_W//2, 400)))
 
 # ===========
@@ -805,7 +1202,7 @@ def draw_interact_menu(screen, font, big, interact_list, focus_idx):
     pg.draw.rect(screen, BG2, menu_rect, border_radius=10) 
     pg.draw.rect(screen, WHITE, menu_rect, width=2, border_radius=10)
     
-    title = big.render("Actions:", True, WHITE)
+    title = render_text(big, "Actions:", WHITE)
     screen.blit(title, title.get_rect(center=(x0, y0 + 20)))
     
     current_y = y0 + 50
@@ -838,10 +1235,16 @@ def draw_interact_menu(screen, font, big, interact_list, focus_idx):
         text = f"{display_action} {display_name}"      
         color = (0, 150, 255) if i == focus_idx else WHITE
         
-        txt = font.render(text, True, color)
+        txt = render_text(font, text, color)
         screen.blit(txt, txt.get_rect(center=(x0, current_y)))
         current_y += h
     
+def _draw_interact_screen(screen, font, big, player, current_room_name, icons, step_flash, step_flash_time,
+                          interact_list, focus_idx):
+    """ Barre latérale sous le menu d'interactions """
+    draw_sidebar(screen, font, big, player, current_room_name, icons, None, step_flash, step_flash_time)
+    draw_interact_menu(screen, font, big, interact_list, focus_idx)
+
 # ===========
 #  GAME OVER
 # ===========
@@ -851,8 +1254,8 @@ def draw_game_over(screen, font, big):
     Affiche l'écran Game Over lorsque le joueur n'a plus de pas.
     """
     screen.fill((0,0,0))
-    txt = big.render("NO STEPS LEFT", True, (255,60,60))
-    sub = font.render("GAME OVER — Press SPACE to return to menu", True, (220,220,220))
+    txt = render_text(big, "NO STEPS LEFT", (255,60,60))
+    sub = render_text(font, "GAME OVER — Press SPACE to return to menu", (220,220,220))
     screen.blit(txt, txt.get_rect(center=(W//2, H//2 - 20)))
     screen.blit(sub, sub.get_rect(center=(W//2, H//2 + 20)))
 
@@ -865,11 +1268,99 @@ def draw_win(screen, font, big):
     Affiche l'écran WIN lorsque le joueur rentre dans l'anti-chambre.
     """
     screen.fill((0,0,0))
-    txt = big.render("Welcome to the anti-chamber", True, (80, 200, 120))
-    sub = font.render("YOU WIN ! — Press SPACE to return to menu", True, (220,220,220))
+    txt = render_text(big, "Welcome to the anti-chamber", (80, 200, 120))
+    sub = render_text(font, "YOU WIN ! — Press SPACE to return to menu", (220,220,220))
     screen.blit(txt, txt.get_rect(center=(W//2, H//2 - 20)))
     screen.blit(sub, sub.get_rect(center=(W//2, H//2 + 20)))
 
+# ==========
+#  AUTOPLAY
+# ==========
+
+def etat_depuis_phase(phase: Phase) -> UIState:
+    """ État de l'interface correspondant à la phase du moteur. """
+    return {
+        Phase.DEPLACEMENT: UIState.PLAYING,
+        Phase.TIRAGE: UIState.DRAFT,
+        Phase.VICTOIRE: UIState.WIN,
+        Phase.DEFAITE: UIState.GAME_OVER,
+    }[phase]
+
+def toggle_autoplay(key, autoplay, autoplay_nom):
+    """
+    A : active / désactive l'autoplay. P : passe à la politique suivante.
+    Renvoie (politique ou None, nom de la politique, message à afficher).
+    """
+    noms = list(POLITIQUES)
+    if key == pg.K_p:
+        autoplay_nom = noms[(noms.index(autoplay_nom) + 1) % len(noms)]
+        if autoplay is None:
+            return None, autoplay_nom, f"Politique : {autoplay_nom}"
+    elif autoplay is not None:
+        return None, autoplay_nom, "Autoplay désactivé"
+    return creer_politique(autoplay_nom), autoplay_nom, f"Autoplay : {autoplay_nom}"
+
+def brancher_partie(partie: Partie, messages: list, sauvegarde: SauvegardeAuto) -> Partie:
+    """
+    Écrit les événements de la partie dans la console (journal), envoie
+    les dépenses de gemmes dans `messages`, la file de la ligne de message
+    de la barre latérale, et sauvegarde la partie après chaque salle posée.
+    La partie est créée avec observe=True (voir render_sidebar).
+    """
+    journaliser(partie.bus, types=(GemmesDepensees, GemmesInsuffisantes, ObjetAjoute, ObjetUtilise))
+    partie.bus.abonner(GemmesDepensees, lambda evt: messages.append(evt.texte()))
+    sauvegarde.brancher(partie)
+    return partie
+
+class RejeuCourant:
+    """Fichier REJEU_DERNIERE_PARTIE de la partie en cours : un seul ouvert à la fois."""
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self.fichier = None
+
+    def enregistrer(self, partie: Partie) -> None:
+        """Ferme le rejeu précédent et enregistre partie coup par coup."""
+        self.fermer()
+        try:
+            os.makedirs(os.path.dirname(self.chemin), exist_ok=True)
+            self.fichier = open(self.chemin, "wb", buffering=0)
+            enregistrer(partie, self.fichier, tampon=1)
+        except OSError as exc:
+            logging.getLogger("blueprince").info("Rejeu non enregistré : %s", exc)
+            self.fermer()
+
+    def fermer(self) -> None:
+        if self.fichier is not None:
+            self.fichier.close()
+            self.fichier = None
+
+
+REJEU = RejeuCourant(REJEU_DERNIERE_PARTIE)
+
+def nouvelle_partie(messages: list, sauvegarde: SauvegardeAuto) -> Partie:
+    """
+    Crée une partie (voir brancher_partie), enregistrée coup par coup
+    dans REJEU_DERNIERE_PARTIE (à joindre aux rapports de bug, voir rejeu.py).
+    """
+    partie = Partie(random.randrange(2**31), observe=True)
+    REJEU.enregistrer(partie)
+    return brancher_partie(partie, messages, sauvegarde)
+
+def charger_partie(messages: list, sauvegarde: SauvegardeAuto) -> Optional[Partie]:
+    """
+    Reprend la partie de SAUVEGARDE_AUTO, ou None s'il n'y en a pas.
+    Une partie reprise n'est pas enregistrée en rejeu (le rejeu part
+    de l'état initial).
+    """
+    try:
+        partie = lire_sauvegarde(SAUVEGARDE_AUTO, observe=True)
+    except (OSError, ValueError) as exc:
+        logging.getLogger("blueprince").info("Pas de sauvegarde chargée : %s", exc)
+        return None
+    REJEU.fermer()
+    return brancher_partie(partie, messages, sauvegarde)
+
 # ======
 #  MAIN
 # ======
@@ -877,6 +1368,7 @@ def draw_win(screen, font, big):
 def main():
     """ main (test) """
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     pg.init()
     init_music()
     screen = pg.display.set_mode((0, 0), pg.FULLSCREEN)
@@ -884,49 +1376,37 @@ def main():
     v_screen = pg.Surface((W, H))
     
     pg.display.set_caption("Blue Prince — Jeux + Inventaire")
-    clock = pg.time.Clock()
+    cadence = Cadence()
     font = pg.font.SysFont(None,24)
     big  = pg.font.SysFont(None,28)
 
-    # chargement image de brick
-    brick_texture = load_png("bluep.jpg", 200)  
+    # Images : lues d'un bloc dans l'atlas s'il est à jour ; sinon décodées
+    # en arrière-plan (texture de brick, salles, entrée, antichambre et
+    # icônes valent None jusqu'à leur arrivée) puis écrites dans l'atlas
+    images, icons = {key: None for key in ("brick", "entree", "anti")}, {}
+    demandes = asset_requests(images, icons)
+    cle_atlas = atlas.empreinte(ASSETS, [(name, size) for _, _, name, size in demandes])
+    charge = atlas.charger(ATLAS, cle_atlas)
+    chargeur = ChargeurImages()
+    for destination, key, name, size in demandes:
+        if charge is not None:
+            destination[key] = charge.get((name, size))
+        else:
+            chargeur.demander(destination, key, name, size)
+    SPRITES.vider()
+    atlas_a_ecrire = charge is None
+    brick_texture, img_entree, img_anti = images["brick"], images["entree"], images["anti"]
 
-    # AJOUT : chargement images des salles
-    load_room_images()
+    messages = []
+    sauvegarde = SauvegardeAuto(SAUVEGARDE_AUTO)
+    partie = nouvelle_partie(messages, sauvegarde)
+    player = partie.joueur
+    room_grid = partie.grille
 
-    icon = CELL - 8
-    img_entree = load_png("entree.webp", icon) if os.path.exists(ASSETS) else None
-    img_anti   = load_png("antichambre.webp", icon) if os.path.exists(ASSETS) else None
-
-    icons = {
-        "pelle": opt_obj("shovel.png"),
-        "detecteur de meteaux": opt_obj("metal-detector.png"),
-        "patte de lapin": opt_obj("rabbit_foot.png"),
-        "kit de crochetage": opt_obj("lockpick.png"),
-        "marteau": opt_obj("hammer.png"),
-        "pas": opt_obj("footstep.png"),
-        "pièces": opt_obj("money.png"),
-        "gems": opt_obj("diamond.png"),
-        "clés": opt_obj("key.png"),
-        "dés": opt_obj("dice.png"),
-    }
-
-    player = joueur(ENTRY_POS[0], ENTRY_POS[1])
-
-    room_grid = [[None for _ in range(COLS)] for _ in range(ROWS)]
-    room_grid[ENTRY_POS[0]][ENTRY_POS[1]] = Rooms.generate_room("ENTRANCE_HALL", row=ENTRY_POS[0],rotation=180)
-    room_grid[ANTI_POS[0]][ANTI_POS[1]]   = Rooms.generate_room("ANTECHAMBER",   row=0)
-
-    # PIOCHE 
-    pioche = list(Rooms.ROOMS_DB.values())
-    pioche = [spec for spec in pioche if spec.key not in {"ENTRANCE_HALL", "ANTECHAMBER", "ROOM_46"}]
-    
     state = UIState.MENU
     active_direction = None
     last_message = None
-    draft_list = None
     focus_idx = 0
-    entrance_direction_for_draft = None
     
     interact_list = [] 
     interact_focus_idx = 0
@@ -934,47 +1414,163 @@ def main():
     step_flash = None
     step_flash_time = 0
 
+    # Autoplay : politique en cours (None = désactivé) et date du prochain coup
+    autoplay = None
+    autoplay_nom = next(iter(POLITIQUES))
+    autoplay_t = 0
+
+    # Seules les zones modifiées sont redessinées ; tout l'écran à chaque changement d'état
+    rendu = RenduPartiel()
+    etat_affiche = None
+
+    def lire_evenements():
+        """ pg.event.get, sans les appuis sur F3 (calque du profileur d'images) """
+        PROFIL.marquer("logique")
+        evenements = []
+        for e in pg.event.get():
+            if e.type == pg.KEYDOWN and e.key == pg.K_F3:
+                PROFIL.visible = not PROFIL.visible
+                rendu.invalider()
+            else:
+                evenements.append(e)
+        PROFIL.marquer("evenements")
+        return evenements
+
+    def attendre_image():
+        """
+        Fin d'image : tout de suite si l'état vient de changer ou si l'écran
+        est à redessiner (ou à la sortie), sinon au prochain événement, au
+        prochain coup de l'autoplay ou quand le flash de pas disparaît.
+        """
+        PROFIL.marquer("logique")
+        if PROFIL.visible:
+            pg.display.update(draw_profil(screen, font, PROFIL))
+            PROFIL.marquer("profil")
+        PROFIL.fin(state.name)
+        reveils = []
+        if autoplay:
+            fin = state in (UIState.GAME_OVER, UIState.WIN)
+            reveils.append(autoplay_t + (AUTOPLAY_PAUSE_FIN if fin else 0))
+        if step_flash_time > 0:
+            reveils.append(pg.time.get_ticks() + math.ceil(step_flash_time * 1000))
+        cadence.tick(anime=state != etat_affiche or rendu.complet or not running, reveil=min(reveils, default=None))
+
     running = True
     while running:
+        PROFIL.debut()
+
+        # ------------ AUTOPLAY ----------------
+        if autoplay and state in (UIState.PLAYING, UIState.DRAFT) and pg.time.get_ticks() >= autoplay_t:
+            autoplay_t = pg.time.get_ticks() + AUTOPLAY_DELAI
+            pas_avant = player.pas
+            msg = partie.appliquer(autoplay.decider(partie.vue()))
+            if player.pas != pas_avant:
+                step_flash = f"{player.pas - pas_avant:+d}"
+                step_flash_time = 1.0
+            if msg:
+                last_message = msg
+            messages.clear()
+            state = etat_depuis_phase(partie.phase)
+            focus_idx = 0
+
+        if autoplay and state in (UIState.GAME_OVER, UIState.WIN) and pg.time.get_ticks() >= autoplay_t + AUTOPLAY_PAUSE_FIN:
+            partie = nouvelle_partie(messages, sauvegarde)
+            player, room_grid = partie.joueur, partie.grille
+            autoplay = creer_politique(autoplay_nom)
+            last_message = f"Autoplay : {autoplay_nom}"
+            state = UIState.PLAYING
+
+        arrivees = chargeur.recevoir()
+        if arrivees:
+            brick_texture, img_entree, img_anti = images["brick"], images["entree"], images["anti"]
+            if {"brick", "entree", "anti"} & set(arrivees):
+                rendu.invalider()
+        if atlas_a_ecrire and not len(chargeur):
+            atlas_a_ecrire = False
+            try:
+                atlas.construire(ATLAS, {(name, size): destination[key] for destination, key, name, size in demandes
+                                         if destination.get(key) is not None}, cle_atlas)
+            except OSError as exc:
+                logging.getLogger("blueprince").info("Atlas non écrit : %s", exc)
+        if state != etat_affiche:
+            rendu.invalider()
+            etat_affiche = state
+        if screen.get_size() != SPRITES.resolution:
+            MONITOR_W, MONITOR_H = screen.get_size()
+            SPRITES.changer_resolution((MONITOR_W, MONITOR_H))
+            rendu.invalider()
+
+        # Le flash de pas s'éteint quel que soit l'écran affiché
+        if step_flash_time > 0:
+            step_flash_time -= cadence.dt
+        else:
+            step_flash = None
 
         # ------------ GAME OVER ----------------
         if state == UIState.GAME_OVER:
-            draw_game_over(v_screen, font, big)
-            scale_and_blit(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
+            rendu.zone("fin", v_screen.get_rect(), state, draw_game_over, v_screen, font, big)
+            rendu.presenter(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
 
-            for e in pg.event.get():
+            for e in lire_evenements():
                 if e.type == pg.QUIT:
+                    sauvegarde.fermer()
+                    chargeur.fermer()
+                    PROFIL.fermer()
+                    REJEU.fermer()
                     return 0
                 if e.type == pg.KEYDOWN and e.key in (pg.K_SPACE, pg.K_RETURN):
+                    autoplay = None
                     state = UIState.MENU
                     continue
 
-            clock.tick(FPS)
+            attendre_image()
             continue
 
         # ------------ WINNER ----------------
         if state == UIState.WIN:
-            draw_win(v_screen, font, big)
-            scale_and_blit(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
+            rendu.zone("fin", v_screen.get_rect(), state, draw_win, v_screen, font, big)
+            rendu.presenter(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
 
-            for e in pg.event.get():
+            for e in lire_evenements():
                 if e.type == pg.QUIT:
+                    sauvegarde.fermer()
+                    chargeur.fermer()
+                    PROFIL.fermer()
+                    REJEU.fermer()
                     return 0
                 if e.type == pg.KEYDOWN and e.key in (pg.K_SPACE, pg.K_RETURN):
+                    autoplay = None
                     state = UIState.MENU
                     continue
 
-            clock.tick(FPS)
+            attendre_image()
             continue
 
         # ------------ MENU ----------------
         if state == UIState.MENU:
-            choice = run_main_menu(screen, v_screen, big, font, clock, ASSETS, (MONITOR_W, MONITOR_H))
+            choice = run_main_menu(screen, v_screen, big, font, cadence, ASSETS, (MONITOR_W, MONITOR_H))
             if choice == UIState.PLAYING:
-                state = UIState.PLAYING
+                # Nouvelle partie seulement si la précédente est terminée
+                if partie.terminee:
+                    partie = nouvelle_partie(messages, sauvegarde)
+                    player, room_grid = partie.joueur, partie.grille
+                    last_message = None
+                state = etat_depuis_phase(partie.phase)
+                continue
+            if choice == UIState.LOAD:
+                chargee = charger_partie(messages, sauvegarde)
+                if chargee is None or chargee.terminee:
+                    state = UIState.MENU
+                    continue
+                partie = chargee
+                player, room_grid = partie.joueur, partie.grille
+                autoplay = None
+                last_message = "Partie chargée"
+                state = etat_depuis_phase(partie.phase)
+                focus_idx = 0
                 continue
             if choice == UIState.OPTIONS:
-                _run_options(screen, font, big, clock)
+                _run_options(screen, font, big, cadence)
                 state = UIState.MENU
                 continue
             if choice == UIState.QUITTING:
@@ -983,12 +1579,7 @@ def main():
         # ------------ PLAYING ----------------
         if state == UIState.PLAYING:
 
-            if step_flash_time > 0:
-                step_flash_time -= 1 / FPS
-            else:
-                step_flash = None
-
-            for e in pg.event.get():
+            for e in lire_evenements():
 
                 if e.type == pg.QUIT:
                     state = UIState.QUITTING
@@ -996,15 +1587,7 @@ def main():
                 elif e.type == pg.KEYDOWN:
                     
                     if e.key == pg.K_u: 
-                        r, c = player.ligne, player.colonne
-                        room = room_grid[r][c]
-                        interact_list = []
-                        
-                        for item in room.effects.get("objets_a_ramasser", []):
-                            interact_list.append( ("Ramasser", item) )
-                                
-                        for item in room.effects.get("interactifs", []):
-                            interact_list.append( ("Utiliser", item) )
+                        interact_list = partie.interactions()
                         
                         if not interact_list:
                             last_message = "Il n'y a rien à utiliser ici."
@@ -1012,6 +1595,9 @@ def main():
                             interact_focus_idx = 0
                             state = UIState.INTERACT
                             last_message = None
+
+                    elif e.key in (pg.K_a, pg.K_p):
+                        autoplay, autoplay_nom, last_message = toggle_autoplay(e.key, autoplay, autoplay_nom)
     
                     elif e.key == pg.K_ESCAPE:
                         state = UIState.MENU
@@ -1027,122 +1613,50 @@ def main():
 
                     elif e.key in (pg.K_SPACE, pg.K_RETURN) and active_direction:
 
-                        r, c = player.ligne, player.colonne
-                        room = room_grid[r][c]
-                        dir  = active_direction
-                        
-                        if room is None:
-                            last_message = "No room here."
-                            active_direction = None
-                            continue
-                        
-                        # bords
-                        if (dir==Orientation.N and r==0) \
-                        or (dir==Orientation.S and r==ROWS-1) \
-                        or (dir==Orientation.E and c==COLS-1) \
-                        or (dir==Orientation.O and c==0):
-                            last_message = "You cannot exit the manor."
-                            active_direction = None
-                            continue
-
-                        door = room.doors.get(dir)
-                        if door is None:
-                            last_message = "No door in this direction."
-                            active_direction = None
-                            continue
-
-                        resources = {
-                            "keys": player.cles,
-                            "kit de crochetage": ("Kit de crochetage" in player.objet_permanents)
-                        }
-
-                        ok = door.open(resources)
-                        player.cles = resources["keys"]
-
-                        if not ok:
-                            last_message = "The door is locked."
-                            active_direction = None
-                            continue
+                        pos_avant = (player.ligne, player.colonne)
+                        msg = partie.appliquer(Action.deplacer(active_direction))
+                        active_direction = None
+                        state = etat_depuis_phase(partie.phase)
 
-                        dep_ligne, dep_colonne = 0, 0
-                        
-                        if dir == Orientation.N: dep_ligne = -1 
-                        if dir == Orientation.S: dep_ligne = 1
-                        if dir == Orientation.E: dep_colonne = 1
-                        if dir == Orientation.O: dep_colonne = -1
-         
                         # perte de 1 pas
-                        try:
-                            player.move(dep_ligne, dep_colonne)
+                        if (player.ligne, player.colonne) != pos_avant:
                             step_flash = "-1"
                             step_flash_time = 1.0
 
-                            # victoire : entrée dans l’antichambre
-
-                            if (player.ligne, player.colonne) == ANTI_POS:
-                                state = UIState.WIN
-                                continue
-
-                            
-                        except ValueError:
-                            last_message = "Plus de pas !"
-                            state = UIState.GAME_OVER
-                            active_direction = None
-                            continue
-                    
-                        if player.pas <= 0:
-                            state = UIState.GAME_OVER
-                            continue
-                        
-                        new_r, new_c = player.ligne, player.colonne
-                        new_room = room_grid[new_r][new_c]
-                        
-                        if new_room: # S'assure que la nouvelle salle existe
-                            opposite_dir = get_opposite_dir(dir)
-                            return_door = new_room.doors.get(opposite_dir)
-                            if return_door:
-                                # On force l'ouverture, car on vient de la passer
-                                return_door.state = DoorState.UNLOCKED
-
-                        # nouvelle salle
-                        if room_grid[player.ligne][player.colonne] is None:
-                            entrance_direction_for_draft = active_direction
-                            draft_list = draft_three_rooms(player.ligne, player.colonne, entrance_direction_for_draft, pioche)
+                        if state == UIState.DRAFT:
                             focus_idx = 0
-                            active_direction = None
-                            state = UIState.DRAFT
                             continue
 
-                        # salle connuet
-                        msg = apply_room_loot(player, room_grid[player.ligne][player.colonne],room_grid)
-
                         if msg and msg.startswith("You gain"):
                             gain = int(msg.split()[2])
                             step_flash = f"+{gain}"
                             step_flash_time = 1.0
 
-                        last_message = msg
-                        active_direction = None
+                        if msg or state == UIState.PLAYING:
+                            last_message = msg
             
             if room_grid[player.ligne][player.colonne] is None:
                 pg.display.flip()
-                clock.tick(FPS)
+                attendre_image()
                 continue
 
-            draw_board(v_screen, room_grid, player, img_entree, img_anti, active_direction)
+            PROFIL.marquer("logique")
+            render_board(rendu, v_screen, room_grid, player, img_entree, img_anti, active_direction)
+            PROFIL.marquer("plateau")
             
             current_room = room_grid[player.ligne][player.colonne]
             name = current_room.spec.name if current_room else "Unknown room"
 
-            draw_sidebar(v_screen, font, big, player, name, icons, last_message, step_flash, step_flash_time)
-            scale_and_blit(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
-            clock.tick(FPS)
+            render_sidebar(rendu, v_screen, font, big, player, name, icons, last_message, step_flash, step_flash_time)
+            PROFIL.marquer("barre")
+            rendu.presenter(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
+            attendre_image()
             continue
   
         # ------------ DRAFT ----------------
         if state == UIState.DRAFT:
 
-            for e in pg.event.get():
+            for e in lire_evenements():
 
                 if e.type == pg.QUIT:
                     state = UIState.QUITTING
@@ -1152,46 +1666,44 @@ def main():
                     if e.key == pg.K_ESCAPE:
                         state = UIState.PLAYING
 
+                    elif e.key in (pg.K_a, pg.K_p):
+                        autoplay, autoplay_nom, last_message = toggle_autoplay(e.key, autoplay, autoplay_nom)
+
                     elif e.key in (pg.K_LEFT, pg.K_q):
                         focus_idx = max(0, focus_idx - 1)
                     elif e.key in (pg.K_RIGHT, pg.K_d):
                         focus_idx = min(2, focus_idx + 1)
 
                     elif e.key == pg.K_r:
-                        draft_list, _ = reroll_draft(player.ligne, player.colonne, player, draft_list, pioche, entrance_direction_for_draft)    
+                        partie.appliquer(Action.relancer())
+                        state = etat_depuis_phase(partie.phase)
                     elif e.key in (pg.K_SPACE, pg.K_RETURN):
-                        spec, rotation = draft_list[focus_idx]
-                        cost = spec.cost_gems or 0
-                        
-                        if not player.utiliser_gems(cost):
-                            last_message = "Pas assez de gems!"
+                        msg = partie.appliquer(Action.choisir(focus_idx))
+                        if partie.phase == Phase.TIRAGE:
+                            last_message = msg
                             continue
-                        
-                        if spec in pioche:
-                            pioche.remove(spec)
 
-                        room = Rooms.generate_room(spec.key, row=player.ligne, rotation=rotation)
-                        room_grid[player.ligne][player.colonne] = room
-                        
-                        opposite_dir = get_opposite_dir(entrance_direction_for_draft)
-                        return_door = room.doors.get(opposite_dir)
-                        
-                        if return_door:
-                            return_door.state = DoorState.UNLOCKED
-                            
-                        msg = apply_room_loot(player, room, room_grid)
                         if msg and msg.startswith("You gain"):
                             gain = int(msg.split()[2])
                             step_flash = f"+{gain}"
                             step_flash_time = 1.0
 
-                        last_message = msg
                         state = UIState.PLAYING
-                        last_message = f"Le joueur a depense {cost} gemmes !"
-            draw_board(v_screen, room_grid, player, img_entree, img_anti, None)
-            draw_draft(v_screen, font, big, draft_list, focus_idx, icons)
-            scale_and_blit(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
-            clock.tick(FPS)
+                        last_message = messages[-1] if messages else None
+                        messages.clear()
+
+            if state != UIState.DRAFT:
+                continue
+            PROFIL.marquer("logique")
+            render_board(rendu, v_screen, room_grid, player, img_entree, img_anti, None)
+            PROFIL.marquer("plateau")
+            rendu.zone("tirage", pg.Rect(BOARD_W,0,SIDEBAR_W,H),
+                       (tuple((spec.key, rot, ROOM_IMAGES.get(spec.key) is not None) for spec, rot in partie.tirage),
+                        focus_idx, icons.get("gemmes") is not None),
+                       draw_draft, v_screen, font, big, partie.tirage, focus_idx, icons, partie.regles)
+            PROFIL.marquer("barre")
+            rendu.presenter(screen, v_screen, (MONITOR_W, MONITOR_H), border_texture=brick_texture)
+            attendre_image()
             continue
 
         if state == UIState.QUITTING:
@@ -1200,7 +1712,7 @@ def main():
         # ------------ INTERACT -----------
         if state == UIState.INTERACT:
             
-            for e in pg.event.get():
+            for e in lire_evenements():
                 if e.type == pg.QUIT:
                     state = UIState.QUITTING
                 
@@ -1214,33 +1726,27 @@ def main():
                         state = UIState.PLAYING
 
                     elif e.key in (pg.K_SPACE, pg.K_RETURN, pg.K_u):
-
-                        action, item = interact_list[interact_focus_idx]
-                        room = room_grid[player.ligne][player.colonne]
-
-                        if action == "Ramasser":
-                            if isinstance(item, objetpermanent):
-                                player.add_item(item.nom, 1)
-                                last_message = f"Vous ramassez : {item.nom}"
-                            else:
-                                last_message = player.utiliser_objet(item)
-
-                            room.effects["objets_a_ramasser"].remove(item)
-
-                        elif action == "Utiliser":
-                            last_message = player.utiliser_objet(item)
-
+                        last_message = partie.appliquer(Action.interagir(interact_focus_idx))
                         state = UIState.PLAYING
                         
-        draw_board(v_screen, room_grid, player, img_entree, img_anti, active_direction)
+        PROFIL.marquer("logique")
+        render_board(rendu, v_screen, room_grid, player, img_entree, img_anti, active_direction)
+        PROFIL.marquer("plateau")
         current_room = room_grid[player.ligne][player.colonne]
         name = current_room.spec.name if current_room else "Unknown room"
-        draw_sidebar(v_screen, font, big, player, name, icons, None, step_flash, step_flash_time)
-        draw_interact_menu(v_screen, font, big, interact_list, interact_focus_idx)
-        scale_and_blit(screen, v_screen, (MONITOR_W, MONITOR_H))
-        clock.tick(FPS)
+        rendu.zone("interactions", pg.Rect(BOARD_W,0,SIDEBAR_W,H),
+                   (name, player, player.version, step_flash_time > 0 and step_flash, len(interact_list), interact_focus_idx),
+                   _draw_interact_screen, v_screen, font, big, player, name, icons, step_flash, step_flash_time,
+                   interact_list, interact_focus_idx)
+        PROFIL.marquer("barre")
+        rendu.presenter(screen, v_screen, (MONITOR_W, MONITOR_H))
+        attendre_image()
         continue
     
+    sauvegarde.fermer()
+    chargeur.fermer()
+    PROFIL.fermer()
+    REJEU.fermer()
     pg.quit()
     return 0
 
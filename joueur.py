@@ -1,22 +1,71 @@
 from objets import Pelle, Marteau, Kit_de_crochetage, Detecteur_de_metaux, Patte_de_lapin
+from regles import REGLES_DEFAUT
+from evenements import Bus, GemmesDepensees, GemmesInsuffisantes, InventaireModifie, JoueurDeplace, ObjetAjoute
+
+# Ressources du joueur (compteurs entiers) et objets permanents possibles
+RESSOURCES = ("pas", "orr", "gemmes", "cles", "des")
+PERMANENTS = ("Pelle", "Detecteur de meteaux", "Patte de lapin", "Kit de crochetage", "Marteau")
+
+class Ressource:
+    """
+    Champ typé observable du joueur (voir JoueurObserve) : une écriture qui
+    change la valeur incrémente la version de l'inventaire et émet
+    InventaireModifie sur le bus du joueur (voir joueur._signaler).
+
+    Pas de __get__ : la valeur est rangée dans le __dict__ de l'instance
+    sous le même nom, et la lecture reste un accès d'attribut ordinaire.
+    """
+    __slots__ = ("nom", "type")
+
+    def __init__(self, type_=int):
+        self.type = type_
+
+    def __set_name__(self, owner, nom):
+        self.nom = nom
+
+    def __set__(self, j, valeur):
+        if not isinstance(valeur, self.type):
+            raise TypeError(f"L'attribut {self.nom} doit être de type {self.type.__name__}")
+        d = j.__dict__
+        if d.get(self.nom) != valeur:
+            d[self.nom] = valeur
+            j._signaler(self.nom, valeur)
 
 class joueur:
-    def __init__(self,ligne_depart,colonne_depart):
+    def __init__(self,ligne_depart,colonne_depart, regles=None, bus=None):
         # Position du joueur dans la grille 
         
         self.ligne = ligne_depart
         self.colonne = colonne_depart
         
+        # Règles d'équilibrage (ressources de départ, butin des objets)
+        self.regles = regles or REGLES_DEFAUT
+        
+        # Bus d'événements de la partie (voir evenements.py)
+        self.bus = bus if bus is not None else Bus()
+        
+        # Version de l'inventaire : incrémentée à chaque changement d'une
+        # ressource ou des objets permanents d'un joueur observé (voir
+        # JoueurObserve) ; versions[champ] = version de son dernier changement
+        self.version = 0
+        self.versions = dict.fromkeys(RESSOURCES + ("objet_permanents",), 0)
+        
         # Objets Consomables
-        self.pas = 70
+        self.pas = self.regles.pas_depart
         self.orr = 0
-        self.gemmes = 2
+        self.gemmes = self.regles.gemmes_depart
         self.cles = 0
         self.des = 0
         
         # Objets permanants que le joueur trouvera 
         self.objet_permanents={}
 
+    def _signaler(self, champ, valeur):
+        """ Nouvelle version de l'inventaire, publiée sur le bus """
+        self.version += 1
+        self.versions[champ] = self.version
+        self.bus.emettre(InventaireModifie, champ, valeur, self.version)
+
     def move (self, dep_ligne, dep_colonne) :
         """ Déplacement du joueur sur la grille
         Args:
@@ -27,6 +76,7 @@ class joueur:
             self.pas -= 1 
             self.ligne += dep_ligne
             self.colonne += dep_colonne
+            self.bus.emettre(JoueurDeplace, self.ligne, self.colonne, self.pas)
             return True
         
         raise ValueError("L'attribut pas doit être positif ")
@@ -41,9 +91,9 @@ class joueur:
         
         if self.gemmes >= nb_gems : 
             self.gemmes -= nb_gems
-            print(f"Le joueur a depense {nb_gems} gemmes !")  
+            self.bus.emettre(GemmesDepensees, nb_gems, self.gemmes)
             return True
-        print(f"Pas assez de gemmes !")  
+        self.bus.emettre(GemmesInsuffisantes, nb_gems, self.gemmes)
         return False
     
     def add_item(self, item, quantite):
@@ -56,8 +106,6 @@ class joueur:
             True si l'ajout a bien été fait, False sinon
         """
         
-        items = {'Pelle', 'Marteau', 'Kit de crochetage', 'Detecteur de meteaux', 'Patte de lapin'}
-        
         # Si la quatité est pas un entier ou si elle est négative : ERREUR !!
         if not isinstance(quantite, int) :
             raise TypeError ("L'attribut quantité doit être un entier")    
@@ -65,7 +113,7 @@ class joueur:
             raise ValueError("L'attribut quantité doit être positif ")
         
         # Objets permanants
-        if item in items :
+        if item in PERMANENTS :
             if item not in self.objet_permanents:
                 if item == 'Pelle':
                     self.objet_permanents[item] = Pelle()
@@ -82,10 +130,11 @@ class joueur:
                 elif item == 'Patte de lapin':
                     self.objet_permanents[item] = Patte_de_lapin()
                     
-                print(f"{item} a été ajouté aux objets permanents.")
+                self._signaler("objet_permanents", tuple(self.objet_permanents))
+                self.bus.emettre(ObjetAjoute, item, quantite, True)
                 
             else:
-                print(f"Vous possédez déjà {item}.")
+                self.bus.emettre(ObjetAjoute, item, quantite, True, True)
             return True
         
         # Objets consommables
@@ -93,26 +142,29 @@ class joueur:
         if hasattr(self, item):
             if isinstance(getattr(self, item), int):
                 setattr(self, item, getattr(self, item) + quantite)
-                print(f"Le joueur a ramassé {quantite} {item} !")      
+                self.bus.emettre(ObjetAjoute, item, quantite, False)
                 return True
             return False
         
-    def synchroniser_inventaire(self, inventaire : dict):
-        # Met a jour l'inventaire affiché dans la barre latérale a partir des valeurs réelles du joueur
-        inventaire["pas"]=self.pas #copie le nombre de pas du joueur vers l'UI
-        inventaire["piéces"]=self.orr
-        inventaire["gems"]=self.gemmes
-        inventaire["clés"]=self.cles
-        inventaire["dés"]=self.des   
-        
-        inventaire["pelle"] = 1 if "Pelle" in self.objet_permanents else 0
-        inventaire["marteau"] = 1 if "Marteau" in self.objet_permanents else 0
-        inventaire["kit de crochetage"] = 1 if "Kit de crochetage" in self.objet_permanents else 0
-        inventaire["detecteur de meteaux"] = 1 if "Detecteur de meteaux" in self.objet_permanents else 0
-        inventaire["patte de lapin"] = 1 if "Patte de lapin" in self.objet_permanents else 0
-        
-    def utiliser_objet(self, objet):
+    def utiliser_objet(self, objet, rng=None):
         """
         Méthode pour que le joueur utilise un objet de l'inventaire
+        (rng : générateur aléatoire des tirages de butin, optionnel)
         """
-        return objet.utiliser(self)
+        return objet.utiliser(self, rng)
+
+class JoueurObserve(joueur):
+    """
+    Joueur dont chaque changement de ressource ou d'objets permanents
+    incrémente version / versions[champ] et émet InventaireModifie sur le
+    bus : l'interface s'y abonne ou compare les versions au lieu de relire
+    tout l'inventaire à chaque image. Créé par Partie(observe=True) ; les
+    simulations gardent un joueur ordinaire, dont les compteurs restent
+    des attributs simples.
+    """
+    pas = Ressource(int)
+    orr = Ressource(int)
+    gemmes = Ressource(int)
+    cles = Ressource(int)
+    des = Ressource(int)
+    objet_permanents = Ressource(dict)
@@ -0,0 +1,397 @@
+# =====================================================
+#  memoire_partagee.py – Positions en mémoire partagée pour l'analyse multi-processus
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import multiprocessing.util
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from doors import Door, Room, Rooms
+from moteur import CODE_SALLE, COLS, DIRECTIONS, MAX_ACTIONS, ROWS, SALLES, Partie, Phase
+from objets import objets_interactifs
+from politiques import POLITIQUES, creer_politique
+from regles import Regles, REGLES_DEFAUT
+from simulation import METRIQUES
+from sauvegarde import CODE_OBJET, ETATS_PORTE, OBJETS, PHASES
+from traces import trace
+
+# Objets permanents du joueur (bit i de la colonne "permanents")
+PERMANENTS = ("Pelle", "Marteau", "Kit de crochetage", "Detecteur de meteaux", "Patte de lapin")
+TAILLE_TIRAGE = 3
+
+CODE_PHASE = {phase: i for i, phase in enumerate(PHASES)}
+CODE_DIRECTION = {d: i for i, d in enumerate(DIRECTIONS)}
+CODE_ETAT_PORTE = {etat: i for i, etat in enumerate(ETATS_PORTE)}
+
+# Une position, à taille fixe : aucune allocation ni désérialisation pour la lire
+DTYPE_ETAT = np.dtype([
+    ("graine", "i8"),
+    ("crn", "u1"),
+    ("phase", "u1"),                                # index dans PHASES
+    ("direction", "i1"),                            # direction d'entrée (DIRECTIONS) ou -1
+    ("nb_actions", "u2"),
+    ("ligne", "u1"),
+    ("colonne", "u1"),
+    ("pas", "i2"),
+    ("gemmes", "i2"),
+    ("cles", "i2"),
+    ("des", "i2"),
+    ("orr", "i4"),
+    ("permanents", "u1"),                           # masque sur PERMANENTS
+    ("salle", "i2", (ROWS, COLS)),                  # code SALLES ou -1
+    ("rotation", "u2", (ROWS, COLS)),               # degrés
+    ("rarete", "i1", (ROWS, COLS, 4)),              # par direction : doors.Rarity ou -1 sans porte
+    ("verrou", "u1", (ROWS, COLS, 4)),              # index dans ETATS_PORTE
+    ("objets", "u1", (ROWS, COLS, len(OBJETS))),    # objets restants par classe (sauvegarde.OBJETS)
+    ("pioche", "u1", (len(SALLES),)),               # 1 si la salle est encore dans la pioche
+    ("tirage", "i2", (TAILLE_TIRAGE,)),             # salles proposées ou -1
+    ("tirage_rotation", "u2", (TAILLE_TIRAGE,)),
+])
+
+
+# ==========================
+#  ENCODAGE D'UNE POSITION
+# ==========================
+
+@trace("memoire_partagee.encoder")
+def encoder(partie: Partie, etat: np.void) -> None:
+    """Écrit la partie dans l'enregistrement etat (vue sur un tableau DTYPE_ETAT)."""
+    j = partie.joueur
+    etat["graine"] = partie.graine or 0
+    etat["crn"] = partie.aleas.crn
+    etat["phase"] = CODE_PHASE[partie.phase]
+    etat["direction"] = CODE_DIRECTION[partie.direction_entree] if partie.direction_entree is not None else -1
+    etat["nb_actions"] = partie.nb_actions
+    etat["ligne"], etat["colonne"] = j.ligne, j.colonne
+    etat["pas"], etat["gemmes"], etat["cles"], etat["des"], etat["orr"] = j.pas, j.gemmes, j.cles, j.des, j.orr
+    etat["permanents"] = sum(1 << i for i, nom in enumerate(PERMANENTS) if nom in j.objet_permanents)
+
+    salle, rotation, rarete, verrou, objets = (etat[c] for c in ("salle", "rotation", "rarete", "verrou", "objets"))
+    salle.fill(-1)
+    rotation.fill(0)
+    rarete.fill(-1)
+    verrou.fill(0)
+    objets.fill(0)
+    for r, ligne in enumerate(partie.grille):
+        for c, room in enumerate(ligne):
+            if room is None:
+                continue
+            salle[r, c] = CODE_SALLE[room.spec.key]
+            rotation[r, c] = room.rotation
+            for d, porte in room.doors.items():
+                k = CODE_DIRECTION[d]
+                rarete[r, c, k] = porte.rarity
+                verrou[r, c, k] = CODE_ETAT_PORTE[porte.state]
+            for cle in ("interactifs", "objets_a_ramasser"):
+                for o in room.effects.get(cle) or ():
+                    if not getattr(o, "deja_utilise", False):
+                        objets[r, c, CODE_OBJET[type(o)]] += 1
+
+    pioche = etat["pioche"]
+    pioche.fill(0)
+    pioche[[CODE_SALLE[spec.key] for spec in partie.pioche]] = 1
+
+    tirage, tirage_rotation = etat["tirage"], etat["tirage_rotation"]
+    tirage.fill(-1)
+    tirage_rotation.fill(0)
+    for k, (spec, rot) in enumerate(partie.tirage or ()):
+        tirage[k] = CODE_SALLE[spec.key]
+        tirage_rotation[k] = rot
+
+
+def vers_partie(etat: np.void, graine: Optional[int] = None, regles: Regles = REGLES_DEFAUT) -> Partie:
+    """
+    Reconstruit une partie jouable depuis une position, pour l'évaluer
+    (rollouts, solveur). La reconstruction ne garde ni l'état du générateur
+    aléatoire ni les effets tirés à l'entrée des salles (ROTUNDA, VESTIBULE...) :
+    pour reprendre exactement une partie, voir sauvegarde.py.
+
+    graine : graine des tirages à venir (par défaut celle de la position).
+    """
+    partie = Partie(int(etat["graine"]) if graine is None else graine, crn=bool(etat["crn"]), regles=regles)
+    partie.phase = PHASES[etat["phase"]]
+    d = int(etat["direction"])
+    partie.direction_entree = DIRECTIONS[d] if d >= 0 else None
+    partie.nb_actions = int(etat["nb_actions"])
+
+    j = partie.joueur
+    j.ligne, j.colonne = int(etat["ligne"]), int(etat["colonne"])
+    j.pas, j.gemmes, j.cles, j.des, j.orr = (int(etat[c]) for c in ("pas", "gemmes", "cles", "des", "orr"))
+    masque = int(etat["permanents"])
+    j.objet_permanents = {nom: OBJETS[i]() for i, nom in enumerate(PERMANENTS) if masque >> i & 1}
+
+    db = Rooms.ROOMS_DB
+    salle, rotation, rarete, verrou, objets = (etat[c].tolist() for c in ("salle", "rotation", "rarete", "verrou", "objets"))
+    for r in range(ROWS):
+        for c in range(COLS):
+            code = salle[r][c]
+            if code < 0:
+                partie.grille[r][c] = None
+                continue
+            spec = db[SALLES[code]]
+            portes = {DIRECTIONS[k]: Door(rarity=rar, state=ETATS_PORTE[verrou[r][c][k]])
+                      for k, rar in enumerate(rarete[r][c]) if rar >= 0}
+            effets = spec.effects.copy()
+            interactifs, a_ramasser = [], []
+            for code_objet, n in enumerate(objets[r][c]):
+                classe = OBJETS[code_objet]
+                (interactifs if issubclass(classe, objets_interactifs) else a_ramasser).extend(classe() for _ in range(n))
+            effets["interactifs"], effets["objets_a_ramasser"] = interactifs, a_ramasser
+            partie.grille[r][c] = Room(spec=spec, rotation=rotation[r][c], doors=portes, effects=effets)
+
+    # La pioche garde l'ordre de Rooms.ROOMS_DB, comme à la création de la partie
+    pioche = etat["pioche"]
+    partie.pioche = [spec for spec in db.values() if pioche[CODE_SALLE[spec.key]]]
+    tirage = [(db[SALLES[code]], int(rot)) for code, rot in zip(etat["tirage"].tolist(), etat["tirage_rotation"].tolist())
+              if code >= 0]
+    partie.tirage = tirage if partie.phase == Phase.TIRAGE else None
+    return partie
+
+
+# ==========================
+#  LOT EN MÉMOIRE PARTAGÉE
+# ==========================
+
+def _attacher(nom: str) -> shared_memory.SharedMemory:
+    """Ouvre un segment existant sans le confier au resource_tracker (seul le créateur le détruit)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nom, track=False)
+    # Avant 3.13 le segment est enregistré une seconde fois, mais auprès du
+    # resource_tracker du créateur (fork, spawn et forkserver le partagent) :
+    # l'enregistrement est ignoré. Le désenregistrer ici retirerait celui du
+    # créateur, et son unlink échouerait dans le tracker.
+    return shared_memory.SharedMemory(name=nom)
+
+
+class LotPositions:
+    """
+    Un lot de positions (tableau DTYPE_ETAT) et le tableau des résultats
+    (float64, nb x nb_sorties), dans un seul segment de mémoire partagée.
+
+    Le processus qui crée le lot y écrit les positions (encoder), les
+    travailleurs s'y attachent par son nom (LotPositions.attacher), lisent
+    les positions sans copie et écrivent leurs résultats à leur place.
+    Seuls le nom du segment et des bornes d'indices passent par les pipes.
+    """
+
+    def __init__(self, nb: int, nb_sorties: int = 1, nom: Optional[str] = None):
+        self.nb = nb
+        self.nb_sorties = nb_sorties
+        self._createur = nom is None
+        taille = self._decalage_sorties(nb) + 8 * nb * nb_sorties
+        self.shm = (shared_memory.SharedMemory(create=True, size=max(taille, 1)) if nom is None
+                    else _attacher(nom))
+        self.etats = np.ndarray(nb, dtype=DTYPE_ETAT, buffer=self.shm.buf)
+        self.sorties = np.ndarray((nb, nb_sorties), dtype=np.float64, buffer=self.shm.buf,
+                                  offset=self._decalage_sorties(nb))
+
+    @staticmethod
+    def _decalage_sorties(nb: int) -> int:
+        return -(-nb * DTYPE_ETAT.itemsize // 8) * 8
+
+    @property
+    def nom(self) -> str:
+        return self.shm.name
+
+    def description(self) -> Tuple[str, int, int]:
+        """De quoi s'attacher au lot depuis un autre processus."""
+        return self.nom, self.nb, self.nb_sorties
+
+    @classmethod
+    def attacher(cls, nom: str, nb: int, nb_sorties: int = 1) -> "LotPositions":
+        return cls(nb, nb_sorties, nom)
+
+    def ecrire(self, i: int, partie: Partie) -> None:
+        encoder(partie, self.etats[i])
+
+    def partie(self, i: int, graine: Optional[int] = None, regles: Regles = REGLES_DEFAUT) -> Partie:
+        return vers_partie(self.etats[i], graine, regles)
+
+    def fermer(self) -> None:
+        """Libère les vues puis le segment ; le créateur le détruit."""
+        self.etats = self.sorties = None
+        self.shm.close()
+        if self._createur:
+            self.shm.unlink()
+
+    def __enter__(self) -> "LotPositions":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+
+# ==========================
+#  ÉVALUATION PARALLÈLE
+# ==========================
+
+# Lots déjà ouverts par ce processus travailleur
+_LOTS: Dict[str, LotPositions] = {}
+
+
+def _fermer_lots() -> None:
+    """Ferme les lots ouverts par ce processus travailleur."""
+    while _LOTS:
+        _LOTS.popitem()[1].fermer()
+
+
+def _initialiser_travailleur() -> None:
+    # Finalize plutôt qu'atexit : un travailleur lancé par fork sort par
+    # os._exit, sans passer par atexit
+    multiprocessing.util.Finalize(None, _fermer_lots, exitpriority=10)
+
+
+def _evaluer_plage(description: Tuple[str, int, int], fonction: Callable, debut: int, fin: int) -> int:
+    """Unité de travail : sorties[i] = fonction(etats[i]) pour i dans [debut, fin)."""
+    lot = _LOTS.get(description[0])
+    if lot is None:
+        lot = _LOTS[description[0]] = LotPositions.attacher(*description)
+    for i in range(debut, fin):
+        lot.sorties[i] = fonction(lot.etats[i])
+    return fin - debut
+
+
+def evaluer(lot: LotPositions, fonction: Callable[[np.void], object],
+            processus: Optional[int] = None, taille_bloc: int = 64) -> np.ndarray:
+    """
+    Applique fonction à chaque position du lot et range le résultat dans
+    lot.sorties. fonction doit être picklable (fonction de module ou
+    instance d'une classe de module) : elle est envoyée une fois par bloc.
+    processus=1 évalue dans le processus courant.
+    """
+    plages = [(d, min(d + taille_bloc, lot.nb)) for d in range(0, lot.nb, taille_bloc)]
+    if processus == 1:
+        for debut, fin in plages:
+            for i in range(debut, fin):
+                lot.sorties[i] = fonction(lot.etats[i])
+        return lot.sorties
+    with ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_travailleur) as pool:
+        list(pool.map(_evaluer_plage, *zip(*((lot.description(), fonction, d, f) for d, f in plages))))
+    return lot.sorties
+
+
+def _metrique(partie: Partie, nom: str) -> float:
+    if nom == "victoire":
+        return float(partie.phase == Phase.VICTOIRE)
+    if nom == "nb_salles":
+        return float(partie.nb_salles())
+    if nom == "nb_actions":
+        return float(partie.nb_actions)
+    return float(getattr(partie.joueur, nom))
+
+
+class ValeurRollouts:
+    """
+    Évaluation d'une position par rollouts : moyenne de chaque métrique
+    (voir simulation.METRIQUES) sur nb parties jouées par la politique
+    depuis la position, chacune avec sa propre graine pour les tirages
+    à venir. Le lot doit avoir une sortie par métrique.
+    """
+
+    def __init__(self, politique: str = "glouton", nb: int = 8, metriques: Tuple[str, ...] = ("victoire",),
+                 max_actions: int = MAX_ACTIONS, regles: Regles = REGLES_DEFAUT):
+        inconnues = set(metriques) - set(METRIQUES)
+        if inconnues:
+            raise ValueError(f"Métriques inconnues : {sorted(inconnues)}")
+        self.politique = politique
+        self.nb = nb
+        self.metriques = tuple(metriques)
+        self.max_actions = max_actions
+        self.regles = regles
+
+    def __call__(self, etat: np.void) -> np.ndarray:
+        base = int(etat["graine"]) * self.nb
+        sommes = np.zeros(len(self.metriques))
+        for k in range(self.nb):
+            partie = vers_partie(etat, base + k, self.regles)
+            partie.jouer(creer_politique(self.politique, base + k), self.max_actions)
+            sommes += [_metrique(partie, m) for m in self.metriques]
+        return sommes / self.nb
+
+
+# ==========================
+#  POSITIONS DE TEST
+# ==========================
+
+def positions(nb: int, politique: str = "glouton", graine: int = 0) -> List[Partie]:
+    """nb parties en cours, arrêtées après un nombre aléatoire de coups de la politique."""
+    rng = random.Random(graine)
+    resultat = []
+    g = graine
+    while len(resultat) < nb:
+        partie = Partie(g)
+        pol = creer_politique(politique, g)
+        vue = partie.vue()
+        for _ in range(rng.randint(1, 60)):
+            if partie.terminee:
+                break
+            partie.appliquer(pol.decider(vue))
+        if not partie.terminee:
+            resultat.append(partie)
+        g += 1
+    return resultat
+
+
+def _evaluer_pickle(donnees: bytes, fonction: Callable) -> np.ndarray:
+    """Référence : positions envoyées comme objets Partie picklés."""
+    parties = pickle.loads(donnees)
+    etats = np.zeros(len(parties), dtype=DTYPE_ETAT)
+    for i, p in enumerate(parties):
+        encoder(p, etats[i])
+    return np.array([fonction(etats[i]) for i in range(len(parties))], dtype=np.float64).reshape(len(parties), -1)
+
+
+def _texte(metriques: Tuple[str, ...], moyennes: np.ndarray) -> str:
+    return ", ".join(f"{m} {v:.4f}" for m, v in zip(metriques, moyennes))
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Évaluation parallèle de positions en mémoire partagée.")
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--politique", default="glouton", choices=list(POLITIQUES))
+    parser.add_argument("--rollouts", type=int, default=4, help="parties jouées depuis chaque position")
+    parser.add_argument("--metrique", nargs="+", default=["victoire", "nb_salles"], choices=METRIQUES)
+    parser.add_argument("--processus", type=int, default=None)
+    parser.add_argument("--taille-bloc", type=int, default=64)
+    parser.add_argument("--pickle", action="store_true",
+                        help="mesure aussi l'envoi des positions en objets picklés, pour comparaison")
+    args = parser.parse_args(argv)
+
+    parties = positions(args.positions, args.politique)
+    fonction = ValeurRollouts(args.politique, args.rollouts, tuple(args.metrique))
+    with LotPositions(len(parties), len(fonction.metriques)) as lot:
+        debut = time.perf_counter()
+        for i, p in enumerate(parties):
+            lot.ecrire(i, p)
+        encodage = time.perf_counter() - debut
+        debut = time.perf_counter()
+        moyennes = evaluer(lot, fonction, args.processus, args.taille_bloc).mean(axis=0)
+        duree = time.perf_counter() - debut
+        print(f"{lot.nb} positions ({DTYPE_ETAT.itemsize} octets chacune), encodage {encodage:.2f} s")
+        print(f"mémoire partagée : {duree:.2f} s, {_texte(fonction.metriques, moyennes)}")
+
+    if args.pickle:
+        debut = time.perf_counter()
+        blocs = [pickle.dumps(parties[d:d + args.taille_bloc]) for d in range(0, len(parties), args.taille_bloc)]
+        with ProcessPoolExecutor(max_workers=args.processus) as pool:
+            moyennes = np.concatenate(list(pool.map(_evaluer_pickle, blocs, [fonction] * len(blocs)))).mean(axis=0)
+        print(f"objets picklés   : {time.perf_counter() - debut:.2f} s, {_texte(fonction.metriques, moyennes)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
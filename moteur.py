@@ -0,0 +1,755 @@
+# =====================================================
+#  moteur.py – Moteur de jeu sans affichage (headless)
+# =====================================================
+
+from __future__ import annotations
+
+import random
+from functools import lru_cache
+from enum import Enum, IntEnum
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from doors import Rooms, Doors, Orientation, Room, RoomSpec, DoorState
+from joueur import JoueurObserve, joueur
+from objets import objetpermanent, coffre, casier, endroits_ou_creuser
+from regles import Regles, REGLES_DEFAUT
+from evenements import Bus, CoupJoue, PartieTerminee, PorteOuverte, SalleTiree
+from traces import trace
+
+# ======================
+#  CONSTANTES GÉNÉRALES
+# ======================
+
+ROWS, COLS = 9, 5
+
+ENTRY_POS = (ROWS - 1, COLS // 2)
+ANTI_POS  = (0,         COLS // 2)
+
+# Ordre canonique des directions (sert aussi d'encodage des actions)
+DIRECTIONS = (Orientation.N, Orientation.E, Orientation.S, Orientation.O)
+
+DEPLACEMENTS = {
+    Orientation.N: (-1, 0),
+    Orientation.S: (1, 0),
+    Orientation.E: (0, 1),
+    Orientation.O: (0, -1),
+}
+
+# Directions qui ne sortent pas du manoir, depuis chaque case
+SORTIES = tuple(tuple(tuple(d for d in DIRECTIONS
+                            if 0 <= r + DEPLACEMENTS[d][0] < ROWS and 0 <= c + DEPLACEMENTS[d][1] < COLS)
+                      for c in range(COLS)) for r in range(ROWS))
+
+SALLES_HORS_PIOCHE = {"ENTRANCE_HALL", "ANTECHAMBER", "ROOM_46"}
+
+# Code numérique stable de chaque salle (télémétrie, corpus, sauvegardes)
+SALLES = tuple(sorted(Rooms.ROOMS_DB))
+CODE_SALLE = {cle: i for i, cle in enumerate(SALLES)}
+
+MAX_ACTIONS = 2000
+
+# Version du comportement du moteur et des politiques de référence, dans
+# les clés des résultats mis en cache (voir balayage.py) : à incrémenter à
+# chaque changement qui modifie l'issue d'une graine. 2 : parties bloquées
+# terminées ; 3 : filtre de rareté du tirage et nouveau Glouton
+VERSION_MOTEUR = 3
+
+# ====================
+#  TIRAGE DE 3 SALLES
+# ====================
+
+def get_opposite_dir(dir: Orientation):
+    """Retourne l'orientation opposée"""
+    if dir == Orientation.N: return Orientation.S
+    if dir == Orientation.S: return Orientation.N
+    if dir == Orientation.E: return Orientation.O
+    if dir == Orientation.O: return Orientation.E
+    return None
+
+def allowed_room_positions(spec, new_r, new_c,rotation):
+    """Filtre géographique : vérifie que la salle peut exister à la position."""
+    return _portes_dans_le_manoir(Doors.shape_orientations(spec.shape, rotation), new_r, new_c)
+
+def _portes_dans_le_manoir(dirs, new_r, new_c):
+    """True si aucune des portes dirs ne donne hors du manoir depuis (new_r, new_c)."""
+    # bord du haut → pas de porte Nord
+    if new_r == 0 and Orientation.N in dirs:
+        return False
+
+    # bord du bas
+    if new_r == ROWS - 1 and Orientation.S in dirs:
+        return False
+
+    # bord gauche
+    if new_c == 0 and Orientation.O in dirs:
+        return False
+
+    # bord droit
+    if new_c == COLS - 1 and Orientation.E in dirs:
+        return False
+
+    return True
+
+@lru_cache(maxsize=None)
+def premiere_rotation(shape, needed_door: Orientation, row: int, col: int) -> Optional[int]:
+    """
+    Première rotation (0, 90, 180, 270) où une salle de cette forme a la
+    porte needed_door et aucune porte hors du manoir en (row, col), ou None.
+    Ne dépend que de ses arguments : calculée une fois par combinaison.
+    """
+    for rotation in (0, 90, 180, 270):
+        dirs = Doors.shape_orientations(shape, rotation)
+        if needed_door in dirs and _portes_dans_le_manoir(dirs, row, col):
+            return rotation
+    return None
+
+# Salles jamais proposées au tirage
+SALLES_HORS_TIRAGE = frozenset({"ROOM_46", "ANTECHAMBER"})
+
+@trace("moteur.tirage")
+def draft_three_rooms(row: int, col: int, entrance_direction: Orientation , pioche: list, rng=None,
+                      regles: Regles = REGLES_DEFAUT):
+    """ Tire trois salles compatibles avec la rareté. """
+    rng = rng or random
+
+    needed_door = get_opposite_dir(entrance_direction)
+
+    # Première rotation compatible de chaque forme (voir premiere_rotation)
+    rotations = {}
+    valid_options = []
+    for spec in pioche:
+        if spec.key in SALLES_HORS_TIRAGE:
+            continue
+        shape = spec.shape
+        rotation = rotations.get(shape, -1)
+        if rotation == -1:
+            rotation = rotations[shape] = premiere_rotation(shape, needed_door, row, col)
+        if rotation is not None:
+            valid_options.append( (spec, rotation) )
+
+    lvl = Doors.level_by_row(row, rng=rng, regles=regles)
+    if lvl == 0:
+        rare_ok = ("Common","Commonplace","Standard",None)
+    elif lvl == 1:
+        rare_ok = ("Unusual","Rare","Standard")
+    else:
+        rare_ok = ("Rumored","Epic","Very Rare","Rare")
+
+    # Salles de la rareté du niveau tiré ; toutes les salles compatibles
+    # s'il y en a moins de trois
+    pool = [option for option in valid_options if option[0].rarity_label in rare_ok]
+    if len(pool) < 3:
+        pool = valid_options
+    if not pool:
+        return []
+    if len(pool) < 3:
+        return rng.choices(pool, k=3)
+    else:
+        return rng.sample(pool, 3)
+
+@trace("moteur.relance")
+def reroll_draft(row: int, col: int, player: joueur, draft_list,pioche: list, entrance_dir: Orientation, rng=None,
+                 regles: Regles = REGLES_DEFAUT):
+    """ Reroll du draft si joueur possède un dé. """
+    if player.des <= 0:
+        return draft_list, False
+    player.des -= 1
+    return draft_three_rooms(row, col, entrance_dir, pioche, rng, regles), True
+
+@trace("moteur.butin")
+def apply_room_loot(player: joueur, room: Room, room_grid, rng=None):
+    """
+    Applique les effets immédiats : pas, pièces, gemmes, malus.
+    """
+    rng = rng or random
+    eff = room.effects
+    if not eff:
+        return None
+
+    # --- Gains simples de pas ---
+    if "regain_steps" in eff:
+        g = eff["regain_steps"]
+        player.pas += g
+        return f"You gain {g} step(s)."
+
+    # --- Pertes simples ---
+    if "penalty_steps" in eff:
+        p = eff["penalty_steps"]
+        player.pas -= p
+        return f"You lose {p} step(s)."
+
+    # --- Perte de la moitié ---
+    if eff.get("penalty_half"):
+        lost = player.pas // 2
+        player.pas -= lost
+        return f"You lose {lost} step(s)."
+
+    # --- +1 pas par salle dans la maison ---
+    if "regain_steps_per_room" in eff:
+        total = sum(1 for row in room_grid for r in row if r)
+        g = total * eff["regain_steps_per_room"]
+        player.pas += g
+        return f"You gain {g} step(s) from Master Bedroom."
+
+    # --- +1 pas par chambre (Bedroom) ---
+    if "regain_steps_per_bedroom" in eff:
+        total = sum(
+            1 for row in room_grid for r in row
+            if r and "bedroom" in r.spec.tags
+        )
+        g = total * eff["regain_steps_per_bedroom"]
+        player.pas += g
+        return f"You gain {g} step(s) from Servant's Quarters."
+
+    # --- Vault / pièces ---
+    if "loot_coins" in eff:
+        coins = eff["loot_coins"]
+        player.add_item("orr", coins)
+        return f"You gain {coins} coin(s)."
+
+    # --- TELEPORT PAD ---
+    if "teleport" in eff:
+    # liste des salles déjà construites (sauf la salle actuelle et l'antichambre,
+    # où l'on n'entre que par une porte : sinon victoire sans passer la porte,
+    # et joueur bloqué derrière des portes à double serrure)
+        possible = [
+        (r, c)
+        for r in range(ROWS)
+        for c in range(COLS)
+        if room_grid[r][c] is not None and (r, c) != (player.ligne, player.colonne) and (r, c) != ANTI_POS
+        ]
+
+        if possible:
+            # téléportation aléatoire
+            r2, c2 = rng.choice(possible)
+            player.ligne, player.colonne = r2, c2
+            return "You were teleported to another room!"
+        else:
+            return "Teleportation failed (no other room discovered)."
+
+
+    return None
+
+# =====================
+#  ACTIONS ET PHASES
+# =====================
+
+class Phase(Enum):
+    """
+    Phases possibles d'une partie sans affichage.
+
+    - DEPLACEMENT : le joueur choisit une porte.
+    - TIRAGE : le joueur choisit une des 3 salles tirées.
+    - VICTOIRE : le joueur est entré dans l'antichambre.
+    - DEFAITE : plus de pas, ou plus aucun choix possible.
+    """
+    DEPLACEMENT = 0
+    TIRAGE = 1
+    VICTOIRE = 2
+    DEFAITE = 3
+
+
+class TypeAction(IntEnum):
+    """Types d'actions qu'un joueur (humain ou bot) peut effectuer."""
+    DEPLACER = 0    # arg = indice dans DIRECTIONS
+    CHOISIR = 1     # arg = indice de la salle dans le tirage
+    RELANCER = 2    # arg inutilisé
+    INTERAGIR = 3   # arg = indice dans la liste des interactions
+
+
+class Action(NamedTuple):
+    """Action élémentaire appliquée au moteur."""
+    type: TypeAction
+    arg: int = 0
+
+    @staticmethod
+    def deplacer(direction: Orientation) -> "Action":
+        return Action(TypeAction.DEPLACER, DIRECTIONS.index(direction))
+
+    @staticmethod
+    def choisir(idx: int) -> "Action":
+        return Action(TypeAction.CHOISIR, idx)
+
+    @staticmethod
+    def relancer() -> "Action":
+        return Action(TypeAction.RELANCER, 0)
+
+    @staticmethod
+    def interagir(idx: int) -> "Action":
+        return Action(TypeAction.INTERAGIR, idx)
+
+# =====================
+#  VUE EN LECTURE SEULE
+# =====================
+
+class VuePartie:
+    """
+    Vue en lecture seule d'une partie, donnée aux politiques (bots).
+    Ne copie rien : chaque propriété lit directement l'état courant.
+    """
+    __slots__ = ("_partie",)
+
+    def __init__(self, partie: "Partie"):
+        self._partie = partie
+
+    @property
+    def phase(self) -> Phase:
+        return self._partie.phase
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        j = self._partie.joueur
+        return j.ligne, j.colonne
+
+    @property
+    def pas(self) -> int:
+        return self._partie.joueur.pas
+
+    @property
+    def gemmes(self) -> int:
+        return self._partie.joueur.gemmes
+
+    @property
+    def cles(self) -> int:
+        return self._partie.joueur.cles
+
+    @property
+    def des(self) -> int:
+        return self._partie.joueur.des
+
+    def possede(self, nom_objet: str) -> bool:
+        """True si le joueur possède l'objet permanent nom_objet."""
+        return nom_objet in self._partie.joueur.objet_permanents
+
+    def salle(self, r: int, c: int) -> Optional[RoomSpec]:
+        """RoomSpec de la salle en (r, c), ou None si la case est vide."""
+        room = self._partie.grille[r][c]
+        return room.spec if room else None
+
+    @property
+    def nb_salles(self) -> int:
+        return self._partie.nb_salles()
+
+    def portes(self, r: int, c: int) -> Dict[Orientation, DoorState]:
+        """État des portes de la salle en (r, c) (vide si la case est vide)."""
+        room = self._partie.grille[r][c]
+        return {d: door.state for d, door in room.doors.items()} if room else {}
+
+    @property
+    def tirage(self) -> Tuple[Tuple[RoomSpec, int], ...]:
+        """Les (spec, rotation) proposées pendant la phase TIRAGE."""
+        return tuple(self._partie.tirage or ())
+
+    def cout(self, idx: int) -> int:
+        """Coût en gemmes de la salle idx du tirage."""
+        spec, _ = self._partie.tirage[idx]
+        return self._partie.regles.cout(spec)
+
+    def deplacements_legaux(self) -> Tuple[Orientation, ...]:
+        return self._partie.deplacements_legaux()
+
+    def interactions_utiles(self) -> Tuple[int, ...]:
+        return self._partie.interactions_utiles()
+
+    def interaction(self, idx: int) -> Tuple[str, str]:
+        """(action, nom de l'objet) de l'interaction idx de la salle courante."""
+        action, item = self._partie.interactions()[idx]
+        return action, item.nom
+
+# =====================
+#  FLUX ALÉATOIRES
+# =====================
+
+# Points de décision aléatoires du moteur
+SITES_ALEATOIRES = ("salle", "tirage", "effet", "butin")
+
+class FluxAleatoires:
+    """
+    Fournit les générateurs aléatoires d'une partie.
+
+    - Mode normal : un seul random.Random(graine) pour toute la partie.
+    - Mode CRN (common random numbers) : un générateur neuf par point de
+      décision (site, case, n-ième occurrence), dérivé de la graine.
+      Deux politiques jouées avec la même graine voient alors exactement
+      les mêmes tirages dès qu'elles prennent une décision au même endroit.
+      Elles s'écartent pourtant vite l'une de l'autre : glouton contre
+      econome, la variance de la différence n'est divisée que par 1,45 à
+      2,1 selon la métrique, contre 1,2 à 1,7 sans CRN (voir README).
+
+    Args:
+        graine: graine de la partie (obligatoire en mode CRN).
+        crn: active le mode common random numbers.
+    """
+
+    def __init__(self, graine: Optional[int] = None, crn: bool = False):
+        if crn and graine is None:
+            raise ValueError("Le mode CRN nécessite une graine")
+        self.graine = graine
+        self.crn = crn
+        self.rng = random.Random(graine)
+        self._occurrences = {}
+
+    def flux(self, site: str, r: int, c: int) -> random.Random:
+        """Générateur à utiliser pour un tirage du site donné sur la case (r, c)."""
+        if not self.crn:
+            return self.rng
+        cle = (site, r, c)
+        n = self._occurrences.get(cle, 0)
+        self._occurrences[cle] = n + 1
+        graine = (((self.graine * len(SITES_ALEATOIRES) + SITES_ALEATOIRES.index(site)) * ROWS + r) * COLS + c) << 16
+        return random.Random(graine + n)
+
+# =====================
+#  PARTIE SANS AFFICHAGE
+# =====================
+
+class Partie:
+    """
+    État complet d'une partie et règles du jeu, sans pygame.
+
+    Sert à la fois à l'interface graphique (les touches appellent les
+    mêmes méthodes) et aux simulations en lot avec des politiques.
+
+    Args:
+        graine: graine du générateur aléatoire de la partie (None = aléatoire).
+        crn: tirages aléatoires indexés par point de décision (voir FluxAleatoires).
+        regles: constantes d'équilibrage (None = regles.REGLES_DEFAUT).
+        telemetrie: collecteur des coups et parties (voir telemetrie.Telemetrie), branché sur le bus.
+        observe: inventaire du joueur observable (voir joueur.JoueurObserve), pour
+            l'affichage ; les simulations n'en paient pas le coût.
+    """
+
+    def __init__(self, graine: Optional[int] = None, crn: bool = False,
+                 regles: Optional[Regles] = None, telemetrie=None, observe: bool = False):
+        self.graine = graine
+        self.regles = regles or REGLES_DEFAUT
+        self.aleas = FluxAleatoires(graine, crn)
+
+        # Événements de la partie (voir evenements.py)
+        self.bus = Bus()
+        if telemetrie is not None:
+            telemetrie.brancher(self.bus)
+
+        self.joueur = (JoueurObserve if observe else joueur)(ENTRY_POS[0], ENTRY_POS[1], self.regles, self.bus)
+
+        self.grille: List[List[Optional[Room]]] = [[None for _ in range(COLS)] for _ in range(ROWS)]
+        self.grille[ENTRY_POS[0]][ENTRY_POS[1]] = Rooms.generate_room("ENTRANCE_HALL", row=ENTRY_POS[0], rotation=180,
+                                                                       rng=self.aleas.flux("salle", *ENTRY_POS),
+                                                                       regles=self.regles)
+        self.grille[ANTI_POS[0]][ANTI_POS[1]]   = Rooms.generate_room("ANTECHAMBER",   row=0,
+                                                                       rng=self.aleas.flux("salle", *ANTI_POS),
+                                                                       regles=self.regles)
+
+        # PIOCHE
+        self.pioche = [spec for spec in Rooms.ROOMS_DB.values() if spec.key not in SALLES_HORS_PIOCHE]
+
+        self.phase = Phase.DEPLACEMENT
+        self.tirage = None
+        self.direction_entree = None
+        self.nb_actions = 0
+
+    # ---------- État ----------
+
+    @property
+    def terminee(self) -> bool:
+        return self.phase in (Phase.VICTOIRE, Phase.DEFAITE)
+
+    @property
+    def salle_courante(self) -> Optional[Room]:
+        return self.grille[self.joueur.ligne][self.joueur.colonne]
+
+    def nb_salles(self) -> int:
+        """Nombre de salles posées dans le manoir (entrée et antichambre comprises)."""
+        return sum(1 for row in self.grille for r in row if r)
+
+    def vue(self) -> VuePartie:
+        return VuePartie(self)
+
+    def _bloque_au_tirage(self) -> bool:
+        """True si aucune salle du tirage n'est abordable et qu'aucun dé ne reste."""
+        if not self.tirage:
+            return True
+        if self.joueur.des > 0:
+            return False
+        return all(self.regles.cout(spec) > self.joueur.gemmes for spec, _ in self.tirage)
+
+    # ---------- Déplacement ----------
+
+    def deplacements_legaux(self) -> Tuple[Orientation, ...]:
+        """Directions dans lesquelles un déplacement réussirait maintenant."""
+        if self.phase != Phase.DEPLACEMENT:
+            return ()
+        j = self.joueur
+        r, c = j.ligne, j.colonne
+        room = self.grille[r][c]
+        if room is None:
+            return ()
+        doors = room.doors
+        cles = j.cles > 0
+        crochetage = cles or "Kit de crochetage" in j.objet_permanents
+        legaux = []
+        for d in SORTIES[r][c]:
+            door = doors.get(d)
+            if door is None:
+                continue
+            if door.state == DoorState.LOCKED and not crochetage:
+                continue
+            if door.state == DoorState.DOUBLE_LOCKED and not cles:
+                continue
+            legaux.append(d)
+        return tuple(legaux)
+
+    def deplacer(self, dir: Orientation) -> Optional[str]:
+        """
+        Tente de franchir la porte dans la direction dir.
+
+        Returns:
+            Le message à afficher, ou None.
+        """
+        if self.phase != Phase.DEPLACEMENT:
+            return None
+
+        player = self.joueur
+        r, c = player.ligne, player.colonne
+        room = self.grille[r][c]
+
+        if room is None:
+            return "No room here."
+
+        # bords
+        if (dir==Orientation.N and r==0) \
+        or (dir==Orientation.S and r==ROWS-1) \
+        or (dir==Orientation.E and c==COLS-1) \
+        or (dir==Orientation.O and c==0):
+            return "You cannot exit the manor."
+
+        door = room.doors.get(dir)
+        if door is None:
+            return "No door in this direction."
+
+        resources = {
+            "keys": player.cles,
+            "kit de crochetage": ("Kit de crochetage" in player.objet_permanents)
+        }
+
+        rarete = door.rarity
+        ok = door.open(resources)
+        cle_utilisee = resources["keys"] < player.cles
+        player.cles = resources["keys"]
+
+        if not ok:
+            return "The door is locked."
+        self.bus.emettre(PorteOuverte, r, c, dir, int(rarete), cle_utilisee)
+
+        dep_ligne, dep_colonne = DEPLACEMENTS[dir]
+
+        # perte de 1 pas
+        try:
+            player.move(dep_ligne, dep_colonne)
+        except ValueError:
+            self.phase = Phase.DEFAITE
+            return "Plus de pas !"
+
+        # victoire : entrée dans l’antichambre
+        if (player.ligne, player.colonne) == ANTI_POS:
+            self.phase = Phase.VICTOIRE
+            return None
+
+        if player.pas <= 0:
+            self.phase = Phase.DEFAITE
+            return None
+
+        new_room = self.grille[player.ligne][player.colonne]
+
+        if new_room: # S'assure que la nouvelle salle existe
+            return_door = new_room.doors.get(get_opposite_dir(dir))
+            if return_door:
+                # On force l'ouverture, car on vient de la passer
+                return_door.state = DoorState.UNLOCKED
+
+        # nouvelle salle
+        if new_room is None:
+            self.direction_entree = dir
+            self.tirage = draft_three_rooms(player.ligne, player.colonne, dir, self.pioche,
+                                            self.aleas.flux("tirage", player.ligne, player.colonne),
+                                            self.regles)
+            self.phase = Phase.TIRAGE
+            if self._bloque_au_tirage():
+                self.phase = Phase.DEFAITE
+                return "Aucune salle abordable."
+            return None
+
+        # salle connue
+        return apply_room_loot(player, new_room, self.grille,
+                               self.aleas.flux("effet", player.ligne, player.colonne))
+
+    # ---------- Tirage ----------
+
+    def choisir(self, idx: int) -> Optional[str]:
+        """
+        Pose la salle idx du tirage sur la case courante, en payant son coût.
+
+        Returns:
+            Le message du butin de la salle, ou un message d'erreur.
+        """
+        if self.phase != Phase.TIRAGE:
+            return None
+
+        player = self.joueur
+        spec, rotation = self.tirage[idx]
+        cost = self.regles.cout(spec)
+
+        if not player.utiliser_gems(cost):
+            return "Pas assez de gems!"
+        self.bus.emettre(SalleTiree, player.ligne, player.colonne, spec.key, rotation, cost)
+
+        # Les specs du tirage sont celles de la pioche : recherche par
+        # identité (l'égalité des dataclasses compare tous les champs)
+        for i, s in enumerate(self.pioche):
+            if s is spec:
+                del self.pioche[i]
+                break
+        else:
+            if spec in self.pioche:
+                self.pioche.remove(spec)
+
+        room = Rooms.generate_room(spec.key, row=player.ligne, rotation=rotation,
+                                   rng=self.aleas.flux("salle", player.ligne, player.colonne),
+                                   regles=self.regles)
+        self.grille[player.ligne][player.colonne] = room
+
+        return_door = room.doors.get(get_opposite_dir(self.direction_entree))
+        if return_door:
+            return_door.state = DoorState.UNLOCKED
+
+        self.tirage = None
+        self.phase = Phase.DEPLACEMENT
+        return apply_room_loot(player, room, self.grille,
+                               self.aleas.flux("effet", player.ligne, player.colonne))
+
+    def relancer(self) -> bool:
+        """Relance le tirage en consommant un dé. Renvoie True si relancé."""
+        if self.phase != Phase.TIRAGE:
+            return False
+        player = self.joueur
+        self.tirage, ok = reroll_draft(player.ligne, player.colonne, player, self.tirage,
+                                       self.pioche, self.direction_entree,
+                                       self.aleas.flux("tirage", player.ligne, player.colonne),
+                                       self.regles)
+        if ok and self._bloque_au_tirage():
+            self.phase = Phase.DEFAITE
+        return ok
+
+    # ---------- Interactions ----------
+
+    def interactions(self) -> List[Tuple[str, object]]:
+        """Liste des (action, objet) disponibles dans la salle courante."""
+        room = self.salle_courante
+        if room is None:
+            return []
+        interact_list = []
+        for item in room.effects.get("objets_a_ramasser", []):
+            interact_list.append( ("Ramasser", item) )
+        for item in room.effects.get("interactifs", []):
+            interact_list.append( ("Utiliser", item) )
+        return interact_list
+
+    def interactions_utiles(self) -> Tuple[int, ...]:
+        """Indices des interactions qui modifieraient l'état du jeu."""
+        player = self.joueur
+        utiles = []
+        for i, (action, item) in enumerate(self.interactions()):
+            if action == "Ramasser":
+                utiles.append(i)
+            elif item.deja_utilise:
+                continue
+            elif isinstance(item, endroits_ou_creuser):
+                if "Pelle" in player.objet_permanents:
+                    utiles.append(i)
+            elif isinstance(item, coffre):
+                if "Marteau" in player.objet_permanents or player.cles > 0:
+                    utiles.append(i)
+            elif isinstance(item, casier):
+                if player.cles > 0:
+                    utiles.append(i)
+        return tuple(utiles)
+
+    def interagir(self, idx: int) -> Optional[str]:
+        """Ramasse ou utilise l'objet idx de la salle courante."""
+        if self.phase != Phase.DEPLACEMENT:
+            return None
+        interact_list = self.interactions()
+        if not 0 <= idx < len(interact_list):
+            return "Il n'y a rien à utiliser ici."
+
+        action, item = interact_list[idx]
+        player = self.joueur
+
+        if action == "Ramasser":
+            if isinstance(item, objetpermanent):
+                player.add_item(item.nom, 1)
+                msg = f"Vous ramassez : {item.nom}"
+            else:
+                msg = player.utiliser_objet(item)
+            self.salle_courante.effects["objets_a_ramasser"].remove(item)
+            return msg
+
+        return player.utiliser_objet(item, self.aleas.flux("butin", player.ligne, player.colonne))
+
+    # ---------- Boucle ----------
+
+    @trace("moteur.appliquer")
+    def appliquer(self, action: Action) -> Optional[str]:
+        """
+        Applique une action quelconque et renvoie le message éventuel.
+        ValueError, sans rien changer à la partie, si l'argument est négatif
+        (il sert d'indice : -1 choisirait la dernière salle du tirage).
+        """
+        if action.arg < 0:
+            raise ValueError(f"Argument d'action négatif : {action!r}")
+        self.nb_actions += 1
+        etait_terminee = self.terminee
+        if self.bus.ecoute(CoupJoue):
+            j = self.joueur
+            avant = (j.pas, j.gemmes, j.cles, j.des, j.orr)
+            msg = self._executer(action)
+            self._verifier_blocage()
+            self.bus.emettre(CoupJoue, self, action, avant)
+        else:
+            msg = self._executer(action)
+            self._verifier_blocage()
+        if self.terminee and not etait_terminee:
+            self.bus.emettre(PartieTerminee, self, self.phase == Phase.VICTOIRE)
+        return msg
+
+    def _verifier_blocage(self) -> None:
+        """Défaite quand le joueur ne peut plus ni se déplacer ni interagir utilement."""
+        if self.phase == Phase.DEPLACEMENT and not self.deplacements_legaux() and not self.interactions_utiles():
+            self.phase = Phase.DEFAITE
+
+    def _executer(self, action: Action) -> Optional[str]:
+        t = action.type
+        if t == TypeAction.DEPLACER:
+            return self.deplacer(DIRECTIONS[action.arg])
+        if t == TypeAction.CHOISIR:
+            return self.choisir(action.arg)
+        if t == TypeAction.RELANCER:
+            self.relancer()
+            return None
+        if t == TypeAction.INTERAGIR:
+            return self.interagir(action.arg)
+        raise ValueError(f"Action inconnue : {action!r}")
+
+    def jouer(self, politique, max_actions: int = MAX_ACTIONS) -> "Partie":
+        """
+        Joue la partie jusqu'au bout avec une politique (voir politiques.py).
+        La partie est déclarée perdue si elle dépasse max_actions.
+        """
+        vue = self.vue()
+        while not self.terminee:
+            if self.nb_actions >= max_actions:
+                self.phase = Phase.DEFAITE
+                self.bus.emettre(PartieTerminee, self, False)
+                break
+            self.appliquer(politique.decider(vue))
+        return self
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 import random
+from evenements import ObjetUtilise
 
 class objet(ABC):
     """
@@ -9,13 +10,14 @@ class objet(ABC):
         nom (str): Le nom de l'objet
         description (str): La description de l'objet
         joueur: Le joueur qui utilise l'objet
+        rng: Générateur aléatoire pour les tirages de butin (module random par défaut)
     """
     def __init__(self, nom: str, description: str):
         self.nom = nom
         self.description = description
     
     @abstractmethod
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         pass
 
 # OBJETS PERMANENTS :
@@ -24,8 +26,8 @@ class objetpermanent(objet):
     def __init__(self,nom : str, description : str):
         super().__init__(nom, description)
 
-    def utiliser(self, joueur):
-        print(f"L'objet {self.nom} est un objet permanent")
+    def utiliser(self, joueur, rng=None):
+        joueur.bus.emettre(ObjetUtilise, self.nom, True)
 
 class Pelle(objetpermanent):
     """
@@ -93,11 +95,11 @@ class objetconsommable(objet):
         self.valeur=valeur
     
     
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         """
         Utilise l'objet consommable. 
         """       
-        print(f"Le joueur utilise L'objet {self.nom}")
+        joueur.bus.emettre(ObjetUtilise, self.nom, False)
         
         
     def epuise(self):
@@ -109,26 +111,31 @@ class objetconsommable(objet):
 class objets_insolites(objet) :
     """
     Autres objets qui redonnent des pas
+    (le nombre de pas regagnés vient de joueur.regles.<cle_regle>)
     
     Args:
         valeur (int): La valeur ou quantité de l'objet
     """
+    cle_regle = None
+
     def __init__(self,nom: str, description: str, valeur: int):
         super().__init__(nom, description)
         self.valeur = valeur
         
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         if self.valeur <= 0:
             return f"{self.nom} a déjà été mangé."
-        reward = self.valeur
         
-        if joueur.add_item("pas", self.valeur):
+        reward = getattr(joueur.regles, self.cle_regle) if self.cle_regle else self.valeur
+        
+        if joueur.add_item("pas", reward):
             self.valeur = 0
             return f"Miam ! Vous avez mangez {self.nom} et regagnez +{reward} pas!"
             
     
 class Pomme(objets_insolites):
     """Redonne 2 pas"""
+    cle_regle = "pas_pomme"
     def __init__(self):
         super().__init__(
             nom="Pomme",
@@ -137,6 +144,7 @@ class Pomme(objets_insolites):
      
 class Banane(objets_insolites):
     """Redonne 3 pas"""
+    cle_regle = "pas_banane"
     def __init__(self):
         super().__init__(
             nom="Banane",
@@ -145,6 +153,7 @@ class Banane(objets_insolites):
         
 class Gateau(objets_insolites):
     """Redonne 10 pas"""
+    cle_regle = "pas_gateau"
     def __init__(self):
         super().__init__(
             nom="Gateau",
@@ -153,6 +162,7 @@ class Gateau(objets_insolites):
         
 class Sandwich(objets_insolites):
     """Redonne 15 pas"""
+    cle_regle = "pas_sandwich"
     def __init__(self):
         super().__init__(
             nom="Sandwich",
@@ -161,6 +171,7 @@ class Sandwich(objets_insolites):
         
 class Repas(objets_insolites):
     """Redonne 25 pas"""
+    cle_regle = "pas_repas"
     def __init__(self):
         super().__init__(
             nom="Repas",
@@ -176,7 +187,7 @@ class objets_interactifs(objet):
         self.deja_utilise = False # Pour savoir si l'objet a déjà été utilisé
         
     @abstractmethod
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         pass
     
     
@@ -189,47 +200,49 @@ class endroits_ou_creuser(objets_interactifs):
             nom="Endroit à creuser",
             description="Endroit ou creuser nécessite une pelle contiennent différents objets consommables")
 
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         
         if self.deja_utilise:
             return "Vous avez déjà creusé"
 
         if "Pelle" in joueur.objet_permanents:
+            rng = rng or random
             
-            coup_1 = random.randint(1, 6) 
+            coup_1 = rng.randint(1, 6) 
             
             if "Patte de lapin" in joueur.objet_permanents:
-                coup_2 = random.randint(1, 6)
+                coup_2 = rng.randint(1, 6)
                 resultat = min(coup_1, coup_2)
             else:
                 resultat = coup_1
             
             if resultat not in [1, 2] and "Detecteur de metaux" in joueur.objet_permanents:
-                coup_detecteur = random.randint(1, 3)   
+                coup_detecteur = rng.randint(1, 3)   
                 if coup_detecteur in [1, 2]:
                     resultat = coup_detecteur
                     
             self.deja_utilise = True
+            regles = joueur.regles
             
             if resultat == 1:
-                joueur.add_item("orr", 15) 
-                return "Vous déterrez 15 pièces d'or !"
+                joueur.add_item("orr", regles.creuser_orr)
+                return f"Vous déterrez {regles.creuser_orr} pièces d'or !"
             
             elif resultat == 2:
-                joueur.add_item("cles", 1)   
-                return "Vous déterrez 1 cle !"
+                joueur.add_item("cles", regles.creuser_cles)
+                return f"Vous déterrez {regles.creuser_cles} cle !"
                  
             elif resultat == 3:
-                joueur.add_item("pas", 5) 
-                return "Vous déterrez 5 pas !"
+                joueur.add_item("pas", regles.creuser_pas)
+                return f"Vous déterrez {regles.creuser_pas} pas !"
                 
             elif resultat == 4:
-                joueur.add_item("gemmes", 1) 
-                return "Vous déterrez 1 gemme !"
+                joueur.add_item("gemmes", regles.creuser_gemmes)
+                return f"Vous déterrez {regles.creuser_gemmes} gemme !"
                 
             elif resultat == 5:
-                joueur.add_item("des", 1) 
-                return "Vous déterrez 1 de !"
+                joueur.add_item("des", regles.creuser_des)
+                return f"Vous déterrez {regles.creuser_des} de !"
                 
             else: 
                 return "... mais vous ne trouvez rien :("
@@ -248,37 +261,39 @@ class coffre(objets_interactifs):
             description="Un coffre verrouillé qui s'ouvre avec un marteau ou une clé."
         )
 
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         if self.deja_utilise:
             return  "Le coffre est déjà ouvert" 
         
         # On vérifie si le joueur a un Marteau
         
+        rng = rng or random
+        regles = joueur.regles
         if "Marteau" in joueur.objet_permanents:
             
             self.deja_utilise = True
-            resultat = random.randint(1, 4)
+            resultat = rng.randint(1, 4)
             
             if resultat != 1 and "Detecteur de metaux" in joueur.objet_permanents:
-                coup_detecteur = random.randint(1, 4)
+                coup_detecteur = rng.randint(1, 4)
                 if coup_detecteur == 1:
                     resultat = 1
                     
             if resultat == 1:
-                joueur.add_item("orr", 25)
-                return "Vous utilisez le marteau et trouvez 25 pièces d'or !" 
+                joueur.add_item("orr", regles.coffre_orr)
+                return f"Vous utilisez le marteau et trouvez {regles.coffre_orr} pièces d'or !" 
                 
             elif resultat == 2:
-                joueur.add_item("pas", 10) 
-                return "Vous utilisez le marteau et trouvez 10 pas !"
+                joueur.add_item("pas", regles.coffre_pas)
+                return f"Vous utilisez le marteau et trouvez {regles.coffre_pas} pas !"
                 
             elif resultat == 3:
-                joueur.add_item("gemmes", 1)
-                return "Vous utilisez le marteau et trouvez 1 gemme !"
+                joueur.add_item("gemmes", regles.coffre_gemmes)
+                return f"Vous utilisez le marteau et trouvez {regles.coffre_gemmes} gemme !"
                  
             else:
-                joueur.add_item("des", 2)
-                return "Vous utilisez le marteau et trouvez 2 dés !"
+                joueur.add_item("des", regles.coffre_des)
+                return f"Vous utilisez le marteau et trouvez {regles.coffre_des} dés !"
             
         # On vérifie si le joueur a une cle        
         if joueur.cles > 0:
@@ -286,30 +301,30 @@ class coffre(objets_interactifs):
             self.deja_utilise = True
             joueur.cles -= 1    # On consomme une clé
             
-            resultat = random.randint(1, 4)
+            resultat = rng.randint(1, 4)
             
             if resultat != 1 and "Detecteur de metaux" in joueur.objet_permanents:
-                coup_detecteur = random.randint(1, 4)
+                coup_detecteur = rng.randint(1, 4)
                 if coup_detecteur == 1:
                     resultat = 1
                     
             if resultat == 1:
-                joueur.add_item("orr", 25) 
-                return "Vous utilisez une clé et trouvez 25 pièces d'or !"
+                joueur.add_item("orr", regles.coffre_orr)
+                return f"Vous utilisez une clé et trouvez {regles.coffre_orr} pièces d'or !"
                 
             elif resultat == 2:
-                joueur.add_item("pas", 10) 
-                return "Vous utilisez une clé et trouvez 10 pas !"
+                joueur.add_item("pas", regles.coffre_pas)
+                return f"Vous utilisez une clé et trouvez {regles.coffre_pas} pas !"
                 
             elif resultat == 3:
-                joueur.add_item("gemmes", 1)
-                return "Vous utilisez une clé et trouvez 1 gemme !"
+                joueur.add_item("gemmes", regles.coffre_gemmes)
+                return f"Vous utilisez une clé et trouvez {regles.coffre_gemmes} gemme !"
                  
             else:
-                joueur.add_item("des", 2)
-                return "Vous utilisez une clé et trouvez 2 dés !"
+                joueur.add_item("des", regles.coffre_des)
+                return f"Vous utilisez une clé et trouvez {regles.coffre_des} dés !"
 
-        print("Le coffre est verrouillé il vous faut une clé ou un marteau.")
+        return "Le coffre est verrouillé il vous faut une clé ou un marteau."
         
 class casier(objets_interactifs) :
     """
@@ -321,7 +336,7 @@ class casier(objets_interactifs) :
             nom="Casier",
             description="Un casier qui s'ouvre avec une clé.")
     
-    def utiliser(self, joueur):
+    def utiliser(self, joueur, rng=None):
         if self.deja_utilise:
             return "Le casier est déja ouvert"
         
@@ -329,38 +344,40 @@ class casier(objets_interactifs) :
         if joueur.cles > 0: 
             joueur.cles -= 1 # On consomme la clé
             self.deja_utilise = True
+            rng = rng or random
+            regles = joueur.regles
 
-            coup = random.randint(1, 6) 
+            coup = rng.randint(1, 6) 
             if "Patte de lapin" in joueur.objet_permanents:
-                coup_2 = random.randint(1, 6)
+                coup_2 = rng.randint(1, 6)
                 resultat = min(coup, coup_2)
             else:
                 resultat = coup
             
             if resultat not in [1, 3] and "Detecteur de metaux" in joueur.objet_permanents:
-                coup_detecteur = random.randint(1, 3)
+                coup_detecteur = rng.randint(1, 3)
                 if coup_detecteur in [1, 3]:
                     resultat = coup_detecteur
             
             if resultat == 1:
-                joueur.add_item("orr", 5)
-                return "Vous ouvrez le casier et trouvez 5 pièces d'or !" 
+                joueur.add_item("orr", regles.casier_orr)
+                return f"Vous ouvrez le casier et trouvez {regles.casier_orr} pièces d'or !" 
                 
             elif resultat == 2:
-                joueur.add_item("des", 1)
-                return "Vous ouvrez le casier et trouvez 1 dé !" 
+                joueur.add_item("des", regles.casier_des)
+                return f"Vous ouvrez le casier et trouvez {regles.casier_des} dé !" 
                 
             elif resultat == 3:
-                joueur.add_item("cles", 1)
-                return "Vous ouvrez le casier et retrouvez 1 clé !" 
+                joueur.add_item("cles", regles.casier_cles)
+                return f"Vous ouvrez le casier et retrouvez {regles.casier_cles} clé !" 
                 
             elif resultat == 4:
-                joueur.add_item("pas", 10) 
-                return "Vous ouvrez le casier et trouvez 10 pas !" 
+                joueur.add_item("pas", regles.casier_pas)
+                return f"Vous ouvrez le casier et trouvez {regles.casier_pas} pas !" 
                 
             elif resultat == 5:
-                joueur.add_item("gemmes", 1)
-                return "Vous ouvrez le casier et trouvez 1 gemme !" 
+                joueur.add_item("gemmes", regles.casier_gemmes)
+                return f"Vous ouvrez le casier et trouvez {regles.casier_gemmes} gemme !" 
                 
             else:
                 return "Le casier est vide :(" 
@@ -0,0 +1,289 @@
+# =====================================================
+#  politiques.py – Bots de référence pour le moteur
+# =====================================================
+
+from __future__ import annotations
+
+import heapq
+import random
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from doors import Doors, DoorState, Orientation, RoomColor
+from moteur import Action, ANTI_POS, DEPLACEMENTS, SORTIES, Phase, VuePartie
+
+
+class Politique(Protocol):
+    """
+    Interface d'un bot : reçoit une vue en lecture seule de la partie
+    et renvoie l'action à jouer (déplacement, indice de tirage, relance
+    ou interaction).
+    """
+    nom: str
+
+    def decider(self, vue: VuePartie) -> Action:
+        ...
+
+
+def distance_antichambre(r: int, c: int) -> int:
+    """
+    Distance de (r, c) à l'antichambre en passant par la case juste en
+    dessous : les portes de la ligne 0 sont toujours à double serrure,
+    une case voisine de l'antichambre sur la ligne 0 n'en rapproche pas.
+    """
+    if (r, c) == ANTI_POS:
+        return 0
+    return abs(r - ANTI_POS[0] - 1) + abs(c - ANTI_POS[1]) + 1
+
+# ==========================
+#  POLITIQUE ALÉATOIRE
+# ==========================
+
+class Aleatoire:
+    """
+    Joue uniformément au hasard parmi les actions légales et utiles.
+
+    Args:
+        graine: graine du générateur propre à la politique.
+    """
+    nom = "aleatoire"
+
+    def __init__(self, graine: Optional[int] = None):
+        self.rng = random.Random(graine)
+
+    def decider(self, vue: VuePartie) -> Action:
+        if vue.phase == Phase.TIRAGE:
+            choix = [Action.choisir(i) for i in range(len(vue.tirage)) if vue.cout(i) <= vue.gemmes]
+            if vue.des > 0:
+                choix.append(Action.relancer())
+            return self.rng.choice(choix) if choix else Action.choisir(0)
+
+        choix = [Action.deplacer(d) for d in vue.deplacements_legaux()]
+        choix += [Action.interagir(i) for i in vue.interactions_utiles()]
+        if not choix:
+            # Aucun coup légal : on tente quand même le nord, le moteur refusera
+            return Action.deplacer(Orientation.N)
+        return self.rng.choice(choix)
+
+# ==========================
+#  POLITIQUE GLOUTONNE
+# ==========================
+
+class Glouton:
+    """
+    Ramasse tout ce qui est utile (sans gaspiller de clé), puis va vers
+    l'antichambre (ANTI_POS) : parmi les portes franchissables des salles
+    connues qui donnent sur une case vide (ou sur l'antichambre), vise celle
+    qui minimise le chemin à parcourir plus POIDS_DISTANCE fois la distance
+    restante de la case derrière la porte (voir vers_la_frontiere). Une
+    porte qui coûte une clé compte pour COUT_CLE pas. Sans porte à explorer,
+    revient au choix local qui pénalise les cases déjà souvent visitées.
+    Au tirage, prend la salle abordable de meilleur score_salle, et relance
+    si aucune n'ouvre de case libre.
+
+    Args:
+        graine: graine utilisée pour départager les égalités.
+    """
+    nom = "glouton"
+
+    POIDS_DISTANCE = 2
+    COUT_CLE = 3
+    POIDS_GEMME = 0.3
+    POIDS_PORTE = 0.5
+    POIDS_NORD = 3
+    BONUS_OBJET = 3.0
+
+    def __init__(self, graine: Optional[int] = None):
+        self.rng = random.Random(graine)
+        self.visites = {}
+        # Dernière recherche sans porte à portée : (état, pas, cases atteintes)
+        self._ferme = None
+
+    def decider(self, vue: VuePartie) -> Action:
+        if vue.phase == Phase.TIRAGE:
+            return self.choisir_salle(vue)
+
+        for i in vue.interactions_utiles():
+            if not self.gaspille_une_cle(vue, i):
+                return Action.interagir(i)
+
+        legaux = vue.deplacements_legaux()
+        if not legaux:
+            return Action.deplacer(Orientation.N)
+
+        r, c = vue.position
+        self.visites[(r, c)] = self.visites.get((r, c), 0) + 1
+        d = self.vers_la_frontiere(vue)
+        if d is not None and d in legaux:
+            return Action.deplacer(d)
+
+        meilleurs, meilleur_score = [], None
+        for d in legaux:
+            dr, dc = DEPLACEMENTS[d]
+            cible = (r + dr, c + dc)
+            # Une case inexplorée est préférée à une case connue, à distance égale
+            score = (distance_antichambre(*cible) + 2 * self.visites.get(cible, 0),
+                     vue.salle(*cible) is not None)
+            if meilleur_score is None or score < meilleur_score:
+                meilleurs, meilleur_score = [d], score
+            elif score == meilleur_score:
+                meilleurs.append(d)
+        return Action.deplacer(self.rng.choice(meilleurs))
+
+    @staticmethod
+    def gaspille_une_cle(vue: VuePartie, idx: int) -> bool:
+        """
+        Vrai si l'interaction idx consomme une clé sans rien rapporter qui
+        ouvre des portes : coffre sans marteau, casier (une clé sur six).
+        """
+        action, nom = vue.interaction(idx)
+        if action != "Utiliser":
+            return False
+        return nom == "Casier" or (nom == "Coffre" and not vue.possede("Marteau"))
+
+    def _cout_porte(self, vue: VuePartie, etat: DoorState) -> Optional[int]:
+        """Pas équivalents pour franchir une porte, ou None si elle est infranchissable."""
+        if etat == DoorState.UNLOCKED:
+            return 1
+        if etat == DoorState.LOCKED and vue.possede("Kit de crochetage"):
+            return 1
+        return 1 + self.COUT_CLE if vue.cles > 0 else None
+
+    @staticmethod
+    def _perte_a_l_entree(vue: VuePartie, spec) -> int:
+        """Pas perdus à chaque entrée dans une salle (malus de la Chapelle, de la salle de sport...)."""
+        effets = spec.effects or {}
+        if effets.get("penalty_half"):
+            return vue.pas // 2
+        return effets.get("penalty_steps", 0)
+
+    def vers_la_frontiere(self, vue: VuePartie) -> Optional[Orientation]:
+        """
+        Première porte du meilleur chemin (Dijkstra sur les salles connues)
+        vers une case vide ou vers l'antichambre, ou None s'il n'y en a pas
+        à portée des pas restants.
+
+        Sans porte à portée, le résultat reste None tant qu'aucune salle
+        n'est posée, que les clés, le kit et les pas ne changent pas et que
+        le joueur reste dans les cases atteintes : la recherche n'est pas
+        refaite à chaque pas quand le manoir est fermé.
+        """
+        etat = (vue.nb_salles, vue.cles > 0, vue.possede("Kit de crochetage"))
+        depart = vue.position
+        if self._ferme is not None:
+            ferme_etat, ferme_pas, atteintes = self._ferme
+            if ferme_etat == etat and vue.pas <= ferme_pas and depart in atteintes:
+                return None
+            self._ferme = None
+        distances: Dict[Tuple[int, int], int] = {depart: 0}
+        premiere: Dict[Tuple[int, int], Optional[Orientation]] = {depart: None}
+        file = [(0, depart)]
+        meilleurs, meilleur_score = [], None
+        while file:
+            du, (r, c) = heapq.heappop(file)
+            if du > distances[(r, c)]:
+                continue
+            for d, etat_porte in vue.portes(r, c).items():
+                if d not in SORTIES[r][c]:
+                    continue
+                cout = self._cout_porte(vue, etat_porte)
+                if cout is None:
+                    continue
+                dr, dc = DEPLACEMENTS[d]
+                v = (r + dr, c + dc)
+                dv = du + cout
+                if v == ANTI_POS or vue.salle(*v) is None:
+                    if du + 1 > vue.pas:
+                        continue
+                    score = dv + self.POIDS_DISTANCE * distance_antichambre(*v)
+                    pas = premiere[(r, c)] or d
+                    if meilleur_score is None or score < meilleur_score:
+                        meilleurs, meilleur_score = [pas], score
+                    elif score == meilleur_score and pas not in meilleurs:
+                        meilleurs.append(pas)
+                    continue
+                dv += self._perte_a_l_entree(vue, vue.salle(*v))
+                if dv < distances.get(v, dv + 1):
+                    distances[v] = dv
+                    premiere[v] = premiere[(r, c)] or d
+                    heapq.heappush(file, (dv, v))
+        if not meilleurs:
+            self._ferme = (etat, vue.pas, set(distances))
+            return None
+        return self.rng.choice(meilleurs)
+
+    def portes_libres(self, vue: VuePartie, idx: int) -> List[Orientation]:
+        """Portes de la salle idx du tirage qui donnent sur une case vide ou sur l'antichambre."""
+        spec, rotation = vue.tirage[idx]
+        r, c = vue.position
+        libres = []
+        for d in Doors.shape_orientations(spec.shape, rotation):
+            if d not in SORTIES[r][c]:
+                continue
+            v = (r + DEPLACEMENTS[d][0], c + DEPLACEMENTS[d][1])
+            if v == ANTI_POS or vue.salle(*v) is None:
+                libres.append(d)
+        return libres
+
+    def score_salle(self, vue: VuePartie, idx: int) -> float:
+        """
+        Intérêt de la salle idx du tirage : ses portes libres (davantage
+        celles qui rapprochent de l'antichambre, surtout vers le nord), moins
+        son coût en gemmes et les pas perdus à l'entrée, plus le bonus des
+        objets qui ouvrent des portes (kit, pelle, endroits où creuser).
+        """
+        spec, _ = vue.tirage[idx]
+        r, c = vue.position
+        d0 = distance_antichambre(r, c)
+        score = 0.0
+        for d in self.portes_libres(vue, idx):
+            score += self.POIDS_PORTE
+            if distance_antichambre(r + DEPLACEMENTS[d][0], c + DEPLACEMENTS[d][1]) < d0:
+                score += self.POIDS_NORD if d == Orientation.N else 1
+        if spec.key == "UTILITY_CLOSET" and not vue.possede("Kit de crochetage"):
+            score += self.BONUS_OBJET
+        if vue.possede("Pelle"):
+            if (spec.effects or {}).get("dig_spots"):
+                score += self.BONUS_OBJET
+        elif spec.color == RoomColor.GREEN:
+            score += self.BONUS_OBJET
+        return (score - self.POIDS_GEMME * vue.cout(idx)
+                - self._perte_a_l_entree(vue, spec) / self.POIDS_DISTANCE)
+
+    def choisir_salle(self, vue: VuePartie) -> Action:
+        abordables = [i for i in range(len(vue.tirage)) if vue.cout(i) <= vue.gemmes]
+        if vue.des > 0 and not any(self.portes_libres(vue, i) for i in abordables):
+            return Action.relancer()
+        if not abordables:
+            return Action.choisir(0)
+        return Action.choisir(max(abordables, key=lambda i: self.score_salle(vue, i)))
+
+# ==========================
+#  POLITIQUE ÉCONOME
+# ==========================
+
+class Econome(Glouton):
+    """
+    Se déplace comme Glouton mais tire toujours la salle la moins chère
+    en gemmes, les égalités étant départagées par le score du Glouton.
+    """
+    nom = "econome"
+
+    def choisir_salle(self, vue: VuePartie) -> Action:
+        abordables = [i for i in range(len(vue.tirage)) if vue.cout(i) <= vue.gemmes]
+        if not abordables:
+            return Action.relancer() if vue.des > 0 else Action.choisir(0)
+        return Action.choisir(min(abordables, key=lambda i: (vue.cout(i), -self.score_salle(vue, i))))
+
+
+POLITIQUES = {
+    Aleatoire.nom: Aleatoire,
+    Glouton.nom: Glouton,
+    Econome.nom: Econome,
+}
+
+def creer_politique(nom: str, graine: Optional[int] = None) -> Politique:
+    """Instancie une politique de référence à partir de son nom."""
+    try:
+        return POLITIQUES[nom](graine)
+    except KeyError:
+        raise ValueError(f"Politique inconnue : {nom} (choix : {', '.join(POLITIQUES)})") from None
@@ -0,0 +1,102 @@
+# =====================================================
+#  regles.py – Constantes d'équilibrage du jeu
+# =====================================================
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Regles:
+    """
+    Toutes les constantes d'équilibrage du jeu, regroupées pour pouvoir
+    les faire varier (balayages de paramètres, voir balayage.py).
+    Les valeurs par défaut sont celles du jeu original.
+    """
+    # Ressources de départ du joueur
+    pas_depart: int = 70
+    gemmes_depart: int = 2
+
+    # Poids des raretés de portes dans Doors.level_by_row, avec
+    # x = 0 en bas du manoir et x = 1 en haut :
+    #   commun = max(0, commun_base - commun_pente * x)
+    #   rare   = rare_base + rare_cloche * (1 - |2x - 1|)
+    #   epique = epique_base + epique_pente * x
+    commun_base: float = 1.0
+    commun_pente: float = 1.5
+    rare_base: float = 0.5
+    rare_cloche: float = 0.5
+    epique_base: float = 0.2
+    epique_pente: float = 1.3
+
+    # Coûts en gemmes remplaçant RoomSpec.cost_gems : ((clé de salle, coût), ...)
+    couts_gemmes: Tuple[Tuple[str, int], ...] = ()
+
+    # Butin : endroit où creuser
+    creuser_orr: int = 15
+    creuser_cles: int = 1
+    creuser_pas: int = 5
+    creuser_gemmes: int = 1
+    creuser_des: int = 1
+
+    # Butin : coffre
+    coffre_orr: int = 25
+    coffre_pas: int = 10
+    coffre_gemmes: int = 1
+    coffre_des: int = 2
+
+    # Butin : casier
+    casier_orr: int = 5
+    casier_des: int = 1
+    casier_cles: int = 1
+    casier_pas: int = 10
+    casier_gemmes: int = 1
+
+    # Nourriture : pas regagnés
+    pas_pomme: int = 2
+    pas_banane: int = 3
+    pas_gateau: int = 10
+    pas_sandwich: int = 15
+    pas_repas: int = 25
+
+    def __post_init__(self):
+        # Accepte un dict pour couts_gemmes, stocké trié pour rester hachable
+        couts = self.couts_gemmes
+        if isinstance(couts, dict):
+            couts = couts.items()
+        object.__setattr__(self, "couts_gemmes", tuple(sorted((str(k), int(v)) for k, v in couts)))
+
+    def cout(self, spec) -> int:
+        """Coût en gemmes d'une salle (RoomSpec) selon ces règles."""
+        for cle, cout in self.couts_gemmes:
+            if cle == spec.key:
+                return cout
+        return spec.cost_gems or 0
+
+    def poids_rarete(self, x: float) -> Tuple[float, float, float]:
+        """Poids (commun, rare, épique) pour une hauteur relative x ∈ [0, 1]."""
+        w0 = max(0.0, self.commun_base - self.commun_pente * x)
+        w1 = self.rare_base + self.rare_cloche * (1 - abs(2 * x - 1))
+        w2 = self.epique_base + self.epique_pente * x
+        return w0, w1, w2
+
+    def empreinte(self) -> str:
+        """Hachage stable des règles (clé de cache des balayages)."""
+        texte = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha1(texte.encode("utf-8")).hexdigest()[:16]
+
+    def modifier(self, **valeurs) -> "Regles":
+        """Copie des règles avec quelques constantes changées."""
+        return replace(self, **valeurs)
+
+    def differences(self) -> dict:
+        """Les constantes qui diffèrent des règles par défaut."""
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if getattr(self, f.name) != getattr(REGLES_DEFAUT, f.name)}
+
+
+REGLES_DEFAUT = Regles()
@@ -0,0 +1,359 @@
+# =====================================================
+#  rejeu.py – Enregistrement binaire compact des parties
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from evenements import CoupJoue, PartieTerminee
+from moteur import Action, Partie, Phase, TypeAction
+from regles import Regles, REGLES_DEFAUT
+
+# Format d'un rejeu (entiers en varint LEB128, signés en zigzag) :
+#
+#   en-tête  : MAGIE, VERSION (1 octet), drapeaux (1 octet, bit 0 = CRN),
+#              graine (zigzag), empreinte des règles (8 octets),
+#              règles modifiées (JSON, longueur + octets),
+#              politique (UTF-8, longueur + octets)
+#   actions  : un varint par action, code = ((arg << 2) | type) + 1
+#   fin      : 0, puis l'état final : phase, nb_actions, ligne, colonne,
+#              pas, gemmes, cles, des, orr (zigzag), puis le CRC32
+#              (4 octets, petit-boutiste) de tout ce qui précède
+#
+# Un rejeu se délimite lui-même : plusieurs rejeux peuvent être
+# concaténés dans un même fichier.
+MAGIE = b"BPRJ"
+VERSION = 1
+PHASES = tuple(Phase)
+
+
+# ==========================
+#  VARINTS
+# ==========================
+
+def ecrire_varint(tampon: bytearray, n: int) -> None:
+    while n >= 0x80:
+        tampon.append((n & 0x7F) | 0x80)
+        n >>= 7
+    tampon.append(n)
+
+
+def zigzag(n: int) -> int:
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def dezigzag(n: int) -> int:
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+class _Lecture:
+    """Lecture d'octets et de varints sur un flux binaire, avec CRC courant."""
+
+    def __init__(self, flux: BinaryIO):
+        self.flux = flux
+        self.crc = 0
+
+    def octets(self, n: int) -> bytes:
+        b = self.flux.read(n)
+        if len(b) != n:
+            raise EOFError("Rejeu tronqué")
+        self.crc = zlib.crc32(b, self.crc)
+        return b
+
+    def varint(self) -> int:
+        n, decalage = 0, 0
+        while True:
+            b = self.flux.read(1)
+            if not b:
+                raise EOFError("Rejeu tronqué")
+            self.crc = zlib.crc32(b, self.crc)
+            n |= (b[0] & 0x7F) << decalage
+            if b[0] < 0x80:
+                return n
+            decalage += 7
+
+
+# ==========================
+#  ÉTAT FINAL
+# ==========================
+
+@dataclass(frozen=True)
+class EtatFinal:
+    """État de la partie enregistré en fin de rejeu, comparé par le vérificateur."""
+    phase: Phase
+    nb_actions: int
+    ligne: int
+    colonne: int
+    pas: int
+    gemmes: int
+    cles: int
+    des: int
+    orr: int
+
+    @classmethod
+    def depuis(cls, partie: Partie) -> "EtatFinal":
+        j = partie.joueur
+        return cls(partie.phase, partie.nb_actions, j.ligne, j.colonne, j.pas, j.gemmes, j.cles, j.des, j.orr)
+
+
+# ==========================
+#  ÉCRITURE
+# ==========================
+
+class EcrivainRejeu:
+    """
+    Écrit un rejeu au fil de la partie : l'en-tête à la création, puis
+    chaque action dès qu'elle est jouée, puis l'état final.
+
+    Args:
+        flux: flux binaire ouvert en écriture (fichier, BytesIO...).
+        graine: graine de la partie (obligatoire pour rejouer).
+        crn: mode common random numbers de la partie.
+        regles: règles de la partie.
+        politique: nom de la politique qui a joué (informatif).
+        tampon: octets d'actions accumulés avant d'écrire dans flux
+            (1 = chaque action est écrite aussitôt).
+    """
+
+    def __init__(self, flux: BinaryIO, graine: int, crn: bool = False,
+                 regles: Regles = REGLES_DEFAUT, politique: str = "", tampon: int = 4096):
+        if graine is None:
+            raise ValueError("Une partie sans graine ne peut pas être rejouée")
+        self.flux = flux
+        self.crc = 0
+        self.termine = False
+        self.taille_tampon = tampon
+        self._tampon = bytearray()
+
+        t = self._tampon
+        t += MAGIE
+        t.append(VERSION)
+        t.append(1 if crn else 0)
+        ecrire_varint(t, zigzag(graine))
+        t += bytes.fromhex(regles.empreinte())
+        for texte in (json.dumps(regles.differences(), sort_keys=True), politique):
+            b = texte.encode("utf-8")
+            ecrire_varint(t, len(b))
+            t += b
+        self._vider()
+
+    def _vider(self) -> None:
+        self.crc = zlib.crc32(self._tampon, self.crc)
+        self.flux.write(self._tampon)
+        self._tampon.clear()
+
+    def action(self, action: Action) -> None:
+        ecrire_varint(self._tampon, ((action.arg << 2) | action.type) + 1)
+        if len(self._tampon) >= self.taille_tampon:
+            self._vider()
+
+    def terminer(self, etat: EtatFinal) -> None:
+        """Écrit la marque de fin, l'état final et le CRC."""
+        if self.termine:
+            return
+        t = self._tampon
+        t.append(0)
+        ecrire_varint(t, PHASES.index(etat.phase))
+        for n in (etat.nb_actions, etat.ligne, etat.colonne):
+            ecrire_varint(t, n)
+        for n in (etat.pas, etat.gemmes, etat.cles, etat.des, etat.orr):
+            ecrire_varint(t, zigzag(n))
+        self._vider()
+        self.flux.write(self.crc.to_bytes(4, "little"))
+        self.flux.flush()
+        self.termine = True
+
+
+def enregistrer(partie: Partie, flux: BinaryIO, politique: str = "", tampon: int = 4096) -> EcrivainRejeu:
+    """
+    Enregistre la partie dans flux : l'écrivain s'abonne au bus de la
+    partie (CoupJoue, PartieTerminee) et termine le rejeu tout seul quand
+    la partie se termine. À appeler avant la première action.
+    """
+    ecrivain = EcrivainRejeu(flux, partie.graine, partie.aleas.crn, partie.regles, politique, tampon)
+    partie.bus.abonner(CoupJoue, lambda evt: ecrivain.action(evt.action))
+    partie.bus.abonner(PartieTerminee, lambda evt: ecrivain.terminer(EtatFinal.depuis(evt.partie)))
+    return ecrivain
+
+
+# ==========================
+#  LECTURE
+# ==========================
+
+@dataclass
+class Rejeu:
+    """Un rejeu décodé."""
+    graine: int
+    crn: bool
+    empreinte: str
+    regles: Regles
+    politique: str
+    actions: List[Action] = field(default_factory=list)
+    etat_final: Optional[EtatFinal] = None   # None si le rejeu est incomplet
+
+    def partie(self, observe: bool = False) -> Partie:
+        """Nouvelle partie dans l'état initial du rejeu (observe : voir Partie)."""
+        return Partie(self.graine, crn=self.crn, regles=self.regles, observe=observe)
+
+
+def lire_entete(lecture: _Lecture) -> Rejeu:
+    if lecture.octets(4) != MAGIE:
+        raise ValueError("Ce n'est pas un rejeu BluePrince")
+    version = lecture.octets(1)[0]
+    if version != VERSION:
+        raise ValueError(f"Version de rejeu non gérée : {version}")
+    crn = bool(lecture.octets(1)[0] & 1)
+    graine = dezigzag(lecture.varint())
+    empreinte = lecture.octets(8).hex()
+    textes = [lecture.octets(lecture.varint()).decode("utf-8") for _ in range(2)]
+    regles = REGLES_DEFAUT.modifier(**json.loads(textes[0]))
+    return Rejeu(graine, crn, empreinte, regles, textes[1])
+
+
+def lire_actions(lecture: _Lecture) -> Iterator[Action]:
+    """Actions du rejeu jusqu'à la marque de fin (exclue)."""
+    while True:
+        code = lecture.varint()
+        if code == 0:
+            return
+        code -= 1
+        yield Action(TypeAction(code & 3), code >> 2)
+
+
+def lire_fin(lecture: _Lecture) -> EtatFinal:
+    phase = PHASES[lecture.varint()]
+    nb_actions, ligne, colonne = (lecture.varint() for _ in range(3))
+    pas, gemmes, cles, des, orr = (dezigzag(lecture.varint()) for _ in range(5))
+    attendu = lecture.crc
+    crc = lecture.flux.read(4)
+    if len(crc) != 4:
+        raise EOFError("Rejeu tronqué")
+    if int.from_bytes(crc, "little") != attendu:
+        raise ValueError("CRC du rejeu invalide")
+    return EtatFinal(phase, nb_actions, ligne, colonne, pas, gemmes, cles, des, orr)
+
+
+def lire_rejeux(flux: BinaryIO) -> Iterator[Rejeu]:
+    """
+    Lit un ou plusieurs rejeux concaténés ; le dernier peut être incomplet
+    (etat_final None). ValueError si un en-tête est tronqué ou invalide.
+    """
+    while True:
+        debut = flux.read(1)
+        if not debut:
+            return
+        lecture = _Lecture(_Prefixe(debut, flux))
+        try:
+            rejeu = lire_entete(lecture)
+        except EOFError:
+            raise ValueError("Rejeu tronqué dans l'en-tête") from None
+        try:
+            rejeu.actions.extend(lire_actions(lecture))
+            rejeu.etat_final = lire_fin(lecture)
+        except EOFError:
+            yield rejeu
+            return
+        yield rejeu
+
+
+def lire_fichier(chemin: str) -> List[Rejeu]:
+    with open(chemin, "rb") as f:
+        return list(lire_rejeux(f))
+
+
+class _Prefixe:
+    """Flux dont le premier octet a déjà été lu (détection de fin de fichier)."""
+
+    def __init__(self, premier: bytes, flux: BinaryIO):
+        self.premier = premier
+        self.flux = flux
+
+    def read(self, n: int) -> bytes:
+        if self.premier:
+            b, self.premier = self.premier, b""
+            return b + (self.flux.read(n - 1) if n > 1 else b"")
+        return self.flux.read(n)
+
+
+# ==========================
+#  VÉRIFICATION
+# ==========================
+
+def rejouer(rejeu: Rejeu, partie: Optional[Partie] = None) -> Partie:
+    """
+    Rejoue les actions sans affichage et renvoie la partie obtenue.
+    partie : partie neuve à utiliser (ex : avec des abonnés sur son bus).
+    """
+    partie = partie or rejeu.partie()
+    for action in rejeu.actions:
+        partie.appliquer(action)
+    return partie
+
+
+def verifier(rejeu: Rejeu, partie: Optional[Partie] = None) -> Tuple[bool, str]:
+    """
+    Rejoue la partie et compare l'état final du joueur à celui enregistré.
+
+    Returns:
+        (True, "") si tout concorde, sinon (False, description de l'écart).
+    """
+    if rejeu.regles.empreinte() != rejeu.empreinte:
+        return False, "règles différentes de celles de l'enregistrement"
+    if rejeu.etat_final is None:
+        return False, "rejeu incomplet (pas d'état final)"
+    partie = rejouer(rejeu, partie)
+    if not partie.terminee and rejeu.etat_final.phase == Phase.DEFAITE:
+        # Partie arrêtée par simulation.jouer_partie (max_actions atteint)
+        partie.phase = Phase.DEFAITE
+    obtenu = EtatFinal.depuis(partie)
+    if obtenu != rejeu.etat_final:
+        return False, f"état final {obtenu} au lieu de {rejeu.etat_final}"
+    return True, ""
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rejeux binaires BluePrince.")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_verif = sous.add_parser("verifier", help="rejoue et vérifie l'état final")
+    p_verif.add_argument("fichiers", nargs="+")
+    p_aff = sous.add_parser("afficher", help="décrit les rejeux d'un fichier")
+    p_aff.add_argument("fichier")
+    args = parser.parse_args(argv)
+
+    if args.commande == "afficher":
+        for r in lire_fichier(args.fichier):
+            fin = r.etat_final.phase.name if r.etat_final else "incomplet"
+            print(f"graine {r.graine}  crn={'oui' if r.crn else 'non'}  politique={r.politique or '?'}"
+                  f"  {len(r.actions)} actions  {fin}  règles={r.regles.differences() or 'défaut'}")
+        return 0
+
+    nb, erreurs = 0, 0
+    for chemin in args.fichiers:
+        try:
+            with open(chemin, "rb") as f:
+                for r in lire_rejeux(f):
+                    nb += 1
+                    ok, raison = verifier(r)
+                    if not ok:
+                        erreurs += 1
+                        print(f"{chemin} : graine {r.graine} : {raison}")
+        except (OSError, ValueError) as exc:
+            # Fichier illisible ou en-tête tronqué : compté comme un rejeu non conforme
+            nb += 1
+            erreurs += 1
+            print(f"{chemin} : {exc}")
+    print(f"{nb - erreurs}/{nb} rejeux conformes")
+    return 1 if erreurs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+# =====================================================
+#  rendu_hors_ecran.py – Rendu sans écran (captures PNG, banc d'essai)
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pygame as pg
+
+import atlas
+import interface
+from interface import PHASES, PERCENTILES
+from moteur import Partie, Phase
+from politiques import POLITIQUES
+from rejeu import Rejeu, lire_fichier, lire_rejeux
+from simulation import jouer_partie
+
+# Sans écran : pilote vidéo "dummy" de SDL (machines d'intégration
+# continue sans affichage). Il doit être choisi avant pg.display.init ;
+# SDL_VIDEODRIVER déjà défini est respecté.
+PILOTE = "dummy"
+
+
+class RenduHorsEcran:
+    """
+    Dessine des états de partie avec les fonctions de l'interface
+    (draw_board, draw_sidebar, draw_draft) dans l'écran virtuel, sans
+    fenêtre : pour des captures PNG et des bancs d'essai du rendu.
+
+    Les images sont lues dans l'atlas s'il est à jour, sinon décodées tout
+    de suite (pas de chargement en arrière-plan : la première capture a
+    déjà toutes ses images).
+
+    Args:
+        moniteur: taille de l'écran simulé pour la mise à l'échelle
+            (presenter) ; par défaut celle de l'écran virtuel.
+        partiel: dessin par zones modifiées (RenduPartiel), comme en jeu,
+            au lieu de tout redessiner à chaque image.
+    """
+
+    def __init__(self, moniteur: Optional[Tuple[int, int]] = None, partiel: bool = False):
+        os.environ.setdefault("SDL_VIDEODRIVER", PILOTE)
+        pg.display.init()
+        pg.font.init()
+        self.moniteur = tuple(moniteur or (interface.W, interface.H))
+        self.screen = pg.display.set_mode(self.moniteur)
+        self.v_screen = pg.Surface((interface.W, interface.H))
+        self.font = pg.font.SysFont(None, 24)
+        self.big = pg.font.SysFont(None, 28)
+        self.rendu = interface.RenduPartiel() if partiel else None
+        self._phase = None
+
+        self.images, self.icons = {key: None for key in ("brick", "entree", "anti")}, {}
+        demandes = interface.asset_requests(self.images, self.icons)
+        charge = atlas.charger(interface.ATLAS, atlas.empreinte(
+            interface.ASSETS, [(name, size) for _, _, name, size in demandes]))
+        for destination, key, name, size in demandes:
+            if charge is not None:
+                destination[key] = charge.get((name, size))
+            else:
+                try:
+                    destination[key] = interface.load_png(name, size)
+                except (OSError, pg.error):
+                    destination[key] = None
+        interface.SPRITES.vider()
+        interface.SPRITES.changer_resolution(self.moniteur)
+
+    def dessiner(self, partie: Partie, message: Optional[str] = None) -> pg.Surface:
+        """
+        Dessine la partie dans l'écran virtuel (plateau, puis tirage en
+        cours ou barre latérale) et le renvoie. Marque les phases
+        "plateau" et "barre" du profileur (interface.PROFIL).
+        """
+        j, v = partie.joueur, self.v_screen
+        room = partie.grille[j.ligne][j.colonne]
+        name = room.spec.name if room else "Unknown room"
+        tirage = partie.phase == Phase.TIRAGE and partie.tirage
+        img_entree, img_anti = self.images["entree"], self.images["anti"]
+
+        if self.rendu is None:
+            interface.draw_board(v, partie.grille, j, img_entree, img_anti, None)
+            interface.PROFIL.marquer("plateau")
+            if tirage:
+                interface.draw_draft(v, self.font, self.big, partie.tirage, 0, self.icons, partie.regles)
+            else:
+                interface.draw_sidebar(v, self.font, self.big, j, name, self.icons, message, None, 0)
+            interface.PROFIL.marquer("barre")
+            return v
+
+        # Comme la boucle de jeu : tout est redessiné quand l'écran change
+        if bool(tirage) != self._phase:
+            self._phase = bool(tirage)
+            self.rendu.invalider()
+        interface.render_board(self.rendu, v, partie.grille, j, img_entree, img_anti, None)
+        interface.PROFIL.marquer("plateau")
+        if tirage:
+            self.rendu.zone("tirage", pg.Rect(interface.BOARD_W, 0, interface.SIDEBAR_W, interface.H),
+                            tuple((spec.key, rot) for spec, rot in partie.tirage),
+                            interface.draw_draft, v, self.font, self.big, partie.tirage, 0, self.icons, partie.regles)
+        else:
+            interface.render_sidebar(self.rendu, v, self.font, self.big, j, name, self.icons, message, None, 0)
+        interface.PROFIL.marquer("barre")
+        return v
+
+    def presenter(self) -> None:
+        """Met l'écran virtuel à l'échelle du moniteur simulé et l'affiche (voir interface.Compositeur)."""
+        if self.rendu is None:
+            interface.compositeur(self.v_screen.get_size(), self.moniteur,
+                                  self.images["brick"]).presenter(self.screen, self.v_screen)
+        else:
+            self.rendu.presenter(self.screen, self.v_screen, self.moniteur, border_texture=self.images["brick"])
+
+    def capturer(self, partie: Partie, chemin: str, largeur: Optional[int] = None,
+                 message: Optional[str] = None) -> pg.Surface:
+        """Enregistre la partie en PNG, réduite à `largeur` pixels de large si elle est donnée."""
+        image = self.dessiner(partie, message)
+        if largeur and largeur != image.get_width():
+            image = pg.transform.smoothscale(image, (largeur, round(image.get_height() * largeur / image.get_width())))
+        os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+        pg.image.save(image, chemin)
+        return image
+
+
+# ==========================
+#  ÉTATS ENREGISTRÉS
+# ==========================
+
+def etats(rejeu: Rejeu) -> Iterator[Tuple[Partie, int, Optional[str]]]:
+    """
+    Rejoue le rejeu et donne (partie, numéro de l'action, message) avant la
+    première action puis après chacune. La partie est la même à chaque fois,
+    modifiée sur place : la dessiner avant de passer à l'état suivant.
+    """
+    partie = rejeu.partie(observe=True)
+    yield partie, 0, None
+    for n, action in enumerate(rejeu.actions, 1):
+        message = partie.appliquer(action)
+        yield partie, n, message
+
+
+def rejeux_generes(nb_parties: int, politique: str = "glouton", graine: int = 0) -> List[Rejeu]:
+    """Rejeux de nb_parties parties jouées par la politique (graines graine, graine + 1...)."""
+    flux = io.BytesIO()
+    for g in range(graine, graine + nb_parties):
+        jouer_partie(politique, g, rejeu=flux)
+    flux.seek(0)
+    return list(lire_rejeux(flux))
+
+
+def _charger_rejeux(args) -> List[Rejeu]:
+    if args.rejeux:
+        return [r for chemin in args.rejeux for r in lire_fichier(chemin)]
+    return rejeux_generes(args.parties, args.politique)
+
+
+# ==========================
+#  COMPARAISON
+# ==========================
+
+def pixels_differents(chemin_a: str, chemin_b: str, seuil: int = 0) -> int:
+    """
+    Nombre de pixels dont une composante diffère de plus de `seuil` entre
+    deux images (toutes si les tailles diffèrent).
+    """
+    a, b = pg.image.load(chemin_a), pg.image.load(chemin_b)
+    if a.get_size() != b.get_size():
+        return max(a.get_width() * a.get_height(), b.get_width() * b.get_height())
+    pa = np.frombuffer(pg.image.tobytes(a, "RGB"), dtype=np.uint8).reshape(-1, 3).astype(np.int16)
+    pb = np.frombuffer(pg.image.tobytes(b, "RGB"), dtype=np.uint8).reshape(-1, 3).astype(np.int16)
+    return int(np.count_nonzero((np.abs(pa - pb) > seuil).any(axis=1)))
+
+# ======
+#  MAIN
+# ======
+
+def _captures(args) -> int:
+    rendu = RenduHorsEcran()
+    ecarts, nb = 0, 0
+    for i, rejeu in enumerate(_charger_rejeux(args)):
+        for partie, n, message in etats(rejeu):
+            derniere = n == len(rejeu.actions)
+            if args.final and not derniere or not args.final and n % args.pas and not derniere:
+                continue
+            nom = f"partie{i:04d}_graine{rejeu.graine}_action{n:04d}.png"
+            chemin = os.path.join(args.dossier, nom)
+            rendu.capturer(partie, chemin, args.largeur, message)
+            nb += 1
+            if args.reference:
+                reference = os.path.join(args.reference, nom)
+                if not os.path.exists(reference):
+                    print(f"{nom} : pas d'image de référence")
+                    ecarts += 1
+                    continue
+                diff = pixels_differents(chemin, reference, args.seuil)
+                if diff:
+                    print(f"{nom} : {diff} pixels différents")
+                    ecarts += 1
+    print(f"{nb} captures dans {args.dossier}"
+          + (f", {ecarts} différentes de {args.reference}" if args.reference else ""))
+    return 1 if ecarts else 0
+
+
+def _banc(args) -> int:
+    rejeux = _charger_rejeux(args)
+    if not any(r.actions for r in rejeux):
+        print("aucune action à rejouer")
+        return 1
+    rendu = RenduHorsEcran(args.moniteur, args.partiel)
+    profil = interface.PROFIL
+    profil.vider(args.images)
+
+    # Les états des rejeux sont rejoués l'un après l'autre, en boucle,
+    # jusqu'à args.images images : une image = une action appliquée
+    # ("logique"), dessinée ("plateau", "barre") et présentée ("echelle",
+    # "affichage"), mesurée par le profileur de l'interface
+    debut = time.perf_counter()
+    while profil.nombre < args.images:
+        for rejeu in rejeux:
+            profil.debut()
+            for partie, _, message in etats(rejeu):
+                profil.marquer("logique")
+                rendu.dessiner(partie, message)
+                rendu.presenter()
+                profil.fin("PARTIEL" if args.partiel else "COMPLET")
+                if profil.nombre >= args.images:
+                    break
+            if profil.nombre >= args.images:
+                break
+    duree = time.perf_counter() - debut
+
+    images = list(profil.images)
+    totaux = [sum(colonne) for colonne in zip(*images)]
+    stats = profil.percentiles()
+    print(f"{len(images)} images ({'zones modifiées' if args.partiel else 'tout redessiné'}) "
+          f"{rendu.v_screen.get_width()}x{rendu.v_screen.get_height()} → "
+          f"{rendu.moniteur[0]}x{rendu.moniteur[1]} en {duree:.2f} s ({len(images) / duree:.0f} images/s)")
+    print(f"{'phase':>12} {'images/s':>10} {'ms moy.':>8}" + "".join(f"{'p' + str(q):>8}" for q in PERCENTILES)
+          + f"{'max':>8}")
+    # (pas d'événements ni de calque F3 sans écran)
+    lignes = [(phase, total) for (phase, _), total in zip(PHASES, totaux) if total]
+    for phase, total in lignes + [("total", sum(totaux))]:
+        print(f"{phase:>12} {len(images) / total:>10.0f} {total / len(images) * 1000:>8.3f}"
+              + "".join(f"{v:>8.3f}" for v in stats[phase]))
+    return 0
+
+
+def _taille(texte: str) -> Tuple[int, int]:
+    largeur, hauteur = texte.lower().split("x")
+    return int(largeur), int(hauteur)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rendu sans écran : captures PNG et banc d'essai du rendu.")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    communs = argparse.ArgumentParser(add_help=False)
+    communs.add_argument("rejeux", nargs="*", help="fichiers de rejeux (.bpr) ; sinon des parties jouées par --politique")
+    communs.add_argument("--parties", type=int, default=10)
+    communs.add_argument("--politique", default="glouton", choices=list(POLITIQUES))
+
+    p_cap = sous.add_parser("captures", parents=[communs], help="enregistre des états des rejeux en PNG")
+    p_cap.add_argument("--dossier", default="captures")
+    p_cap.add_argument("--pas", type=int, default=1, help="une capture toutes les PAS actions (et l'état final)")
+    p_cap.add_argument("--final", action="store_true", help="seulement l'état final (miniatures de rejeux)")
+    p_cap.add_argument("--largeur", type=int, default=None, help="largeur des captures en pixels (réduites)")
+    p_cap.add_argument("--reference", default=None,
+                       help="dossier de captures de référence : code de sortie 1 si une capture diffère")
+    p_cap.add_argument("--seuil", type=int, default=0, help="écart toléré par composante de couleur")
+
+    p_banc = sous.add_parser("banc", parents=[communs], help="mesure le rendu de nombreuses images, phase par phase")
+    p_banc.add_argument("--images", type=int, default=2000)
+    p_banc.add_argument("--moniteur", type=_taille, default=None, help="taille de l'écran simulé, ex : 1920x1080")
+    p_banc.add_argument("--partiel", action="store_true", help="zones modifiées seulement, comme en jeu")
+    args = parser.parse_args(argv)
+
+    try:
+        return _captures(args) if args.commande == "captures" else _banc(args)
+    finally:
+        pg.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# =====================================================
+#  sauvegarde.py – Instantanés binaires de l'état complet
+# =====================================================
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from array import array
+from typing import Optional
+
+from doors import Door, DoorState, Orientation, Rarity, Room, Rooms
+from moteur import CODE_SALLE, COLS, DIRECTIONS, ROWS, SALLES, SITES_ALEATOIRES, Partie, Phase
+from objets import (Banane, Detecteur_de_metaux, Gateau, Kit_de_crochetage, Marteau, Patte_de_lapin, Pelle,
+                    Pomme, Repas, Sandwich, casier, coffre, endroits_ou_creuser, objets_interactifs)
+from evenements import CoupJoue, SalleTiree
+from regles import REGLES_DEFAUT
+from traces import trace
+
+# Format d'un instantané :
+#   en-tête (ENTETE) : MAGIE, VERSION, drapeaux (bit 0 = CRN, bit 1 = graine
+#                      présente), graine, tailles des trois blocs suivants
+#   entiers          : array('i') de l'état de la partie, du joueur, de la
+#                      pioche, du tirage, des portes et des objets (voir sauver)
+#   aléa             : array('I') de l'état de random.Random (624 mots + position)
+#                      puis gauss_next en double (NaN si absent)
+#   json             : règles modifiées, objets permanents et effets simples des salles
+MAGIE = b"BPSV"
+VERSION = 1
+ENTETE = struct.Struct("<4sBBqIII")
+
+PHASES = tuple(Phase)
+ETATS_PORTE = tuple(DoorState)
+ORIENTATIONS = tuple(Orientation)
+
+# Classes d'objets pouvant se trouver dans une salle ou l'inventaire
+OBJETS = (Pelle, Marteau, Kit_de_crochetage, Detecteur_de_metaux, Patte_de_lapin,
+          Pomme, Banane, Gateau, Sandwich, Repas, endroits_ou_creuser, coffre, casier)
+CODE_OBJET = {classe: i for i, classe in enumerate(OBJETS)}
+
+# Effets stockés à part (objets), les autres passent en JSON
+EFFETS_OBJETS = ("interactifs", "objets_a_ramasser")
+
+
+def _etat_objet(objet) -> int:
+    if isinstance(objet, objets_interactifs):
+        return int(objet.deja_utilise)
+    return getattr(objet, "valeur", 0)
+
+
+def _creer_objet(code: int, etat: int):
+    objet = OBJETS[code]()
+    if isinstance(objet, objets_interactifs):
+        objet.deja_utilise = bool(etat)
+    elif hasattr(objet, "valeur"):
+        objet.valeur = etat
+    return objet
+
+
+# ==========================
+#  ENCODAGE
+# ==========================
+
+@trace("sauvegarde.sauver")
+def sauver(partie: Partie) -> bytes:
+    """Instantané binaire de l'état complet de la partie."""
+    j = partie.joueur
+    n = [PHASES.index(partie.phase),
+         DIRECTIONS.index(partie.direction_entree) if partie.direction_entree is not None else -1,
+         partie.nb_actions,
+         j.ligne, j.colonne, j.pas, j.orr, j.gemmes, j.cles, j.des]
+
+    n.append(len(partie.pioche))
+    n.extend(CODE_SALLE[spec.key] for spec in partie.pioche)
+
+    if partie.tirage is None:
+        n.append(-1)
+    else:
+        n.append(len(partie.tirage))
+        for spec, rotation in partie.tirage:
+            n += (CODE_SALLE[spec.key], rotation)
+
+    occurrences = partie.aleas._occurrences
+    n.append(len(occurrences))
+    for (site, r, c), k in occurrences.items():
+        n += (SITES_ALEATOIRES.index(site), r, c, k)
+
+    effets = []
+    for ligne in partie.grille:
+        for room in ligne:
+            if room is None:
+                n.append(-1)
+                continue
+            n += (CODE_SALLE[room.spec.key], room.rotation, len(room.doors))
+            for d, porte in room.doors.items():
+                n += (ORIENTATIONS.index(d), int(porte.rarity), ETATS_PORTE.index(porte.state))
+            for cle in EFFETS_OBJETS:
+                objets = room.effects.get(cle)
+                if objets is None:
+                    n.append(-1)
+                    continue
+                n.append(len(objets))
+                for o in objets:
+                    n += (CODE_OBJET[type(o)], _etat_objet(o))
+            effets.append({k: v for k, v in room.effects.items() if k not in EFFETS_OBJETS})
+
+    version, mt, gauss = partie.aleas.rng.getstate()
+    alea = array("I", mt)
+    texte = json.dumps({
+        "regles": partie.regles.differences(),
+        "permanents": [[nom, CODE_OBJET[type(o)]] for nom, o in j.objet_permanents.items()],
+        "effets": effets,
+    }, separators=(",", ":")).encode("utf-8")
+    entiers = array("i", n).tobytes()
+
+    drapeaux = (1 if partie.aleas.crn else 0) | (2 if partie.graine is not None else 0)
+    return b"".join((
+        ENTETE.pack(MAGIE, VERSION, drapeaux, partie.graine or 0, len(entiers), len(alea), len(texte)),
+        entiers, alea.tobytes(), struct.pack("<d", gauss if gauss is not None else float("nan")), texte,
+    ))
+
+
+# ==========================
+#  DÉCODAGE
+# ==========================
+
+@trace("sauvegarde.charger")
+def charger(donnees: bytes, observe: bool = False) -> Partie:
+    """
+    Reconstruit une partie à partir d'un instantané produit par sauver()
+    (observe : voir Partie).
+    """
+    magie, version, drapeaux, graine, taille_n, taille_alea, taille_texte = ENTETE.unpack_from(donnees)
+    if magie != MAGIE:
+        raise ValueError("Ce n'est pas une sauvegarde BluePrince")
+    if version != VERSION:
+        raise ValueError(f"Version de sauvegarde non gérée : {version}")
+    pos = ENTETE.size
+    n = array("i")
+    n.frombytes(donnees[pos:pos + taille_n])
+    pos += taille_n
+    mt = array("I")
+    mt.frombytes(donnees[pos:pos + 4 * taille_alea])
+    pos += 4 * taille_alea
+    (gauss,) = struct.unpack_from("<d", donnees, pos)
+    pos += 8
+    meta = json.loads(donnees[pos:pos + taille_texte])
+
+    partie = Partie(graine if drapeaux & 2 else None, crn=bool(drapeaux & 1),
+                    regles=REGLES_DEFAUT.modifier(**meta["regles"]), observe=observe)
+    partie.aleas.rng.setstate((3, tuple(mt), None if gauss != gauss else gauss))
+
+    n = n.tolist()
+    i = 0
+
+    def lire(k=1):
+        nonlocal i
+        i += k
+        return n[i - k] if k == 1 else n[i - k:i]
+
+    partie.phase = PHASES[lire()]
+    d = lire()
+    partie.direction_entree = DIRECTIONS[d] if d >= 0 else None
+    partie.nb_actions = lire()
+
+    j = partie.joueur
+    j.ligne, j.colonne, j.pas, j.orr, j.gemmes, j.cles, j.des = lire(7)
+    j.objet_permanents = {nom: OBJETS[code]() for nom, code in meta["permanents"]}
+
+    db = Rooms.ROOMS_DB
+    partie.pioche = [db[SALLES[c]] for c in lire(lire())]
+
+    k = lire()
+    if k < 0:
+        partie.tirage = None
+    else:
+        partie.tirage = []
+        for _ in range(k):
+            c, rotation = lire(2)
+            partie.tirage.append((db[SALLES[c]], rotation))
+
+    occurrences = {}
+    for _ in range(lire()):
+        site, r, c, k = lire(4)
+        occurrences[(SITES_ALEATOIRES[site], r, c)] = k
+    partie.aleas._occurrences = occurrences
+
+    effets = iter(meta["effets"])
+    for r in range(ROWS):
+        for c in range(COLS):
+            code = lire()
+            if code < 0:
+                partie.grille[r][c] = None
+                continue
+            rotation, nb_portes = lire(2)
+            portes = {}
+            for _ in range(nb_portes):
+                o, rarete, etat = lire(3)
+                portes[ORIENTATIONS[o]] = Door(rarity=Rarity(rarete), state=ETATS_PORTE[etat])
+            room_effets = next(effets)
+            for cle in EFFETS_OBJETS:
+                k = lire()
+                if k >= 0:
+                    room_effets[cle] = [_creer_objet(*lire(2)) for _ in range(k)]
+            partie.grille[r][c] = Room(spec=db[SALLES[code]], rotation=rotation, doors=portes, effects=room_effets)
+    return partie
+
+
+# ==========================
+#  FICHIERS
+# ==========================
+
+def ecrire_fichier(chemin: str, donnees: bytes) -> None:
+    """Écriture atomique : une sauvegarde interrompue ne remplace jamais la précédente."""
+    tmp = chemin + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(donnees)
+    os.replace(tmp, chemin)
+
+
+def lire_fichier(chemin: str, observe: bool = False) -> Partie:
+    with open(chemin, "rb") as f:
+        return charger(f.read(), observe)
+
+
+class SauvegardeAuto:
+    """
+    Sauvegarde automatique en arrière-plan (voir brancher()).
+
+    demander() prend l'instantané tout de suite (l'état doit être cohérent,
+    et sauver() ne prend qu'une fraction de milliseconde), puis un thread
+    l'écrit sur disque. Si plusieurs demandes arrivent pendant une écriture,
+    seule la plus récente est écrite.
+    """
+
+    def __init__(self, chemin: str):
+        self.chemin = chemin
+        self._a_ecrire: Optional[bytes] = None
+        self._condition = threading.Condition()
+        self._fin = False
+        self.erreur: Optional[BaseException] = None
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self._thread = threading.Thread(target=self._ecrivain, name="sauvegarde", daemon=True)
+        self._thread.start()
+
+    def brancher(self, partie: Partie) -> None:
+        """
+        Sauvegarde la partie après chaque salle posée. SalleTiree est émis
+        avant la pose : l'instantané est pris au CoupJoue qui suit, une fois
+        l'action terminée.
+        """
+        posee = [False]
+
+        def salle_tiree(evt: SalleTiree) -> None:
+            posee[0] = True
+
+        def coup(evt: CoupJoue) -> None:
+            if posee[0]:
+                posee[0] = False
+                self.demander(evt.partie)
+
+        partie.bus.abonner(SalleTiree, salle_tiree)
+        partie.bus.abonner(CoupJoue, coup)
+
+    def demander(self, partie: Partie) -> None:
+        donnees = sauver(partie)
+        with self._condition:
+            self._a_ecrire = donnees
+            self._condition.notify()
+
+    def fermer(self) -> None:
+        """Écrit la dernière demande en attente puis arrête le thread."""
+        with self._condition:
+            self._fin = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _ecrivain(self) -> None:
+        while True:
+            with self._condition:
+                while self._a_ecrire is None and not self._fin:
+                    self._condition.wait()
+                donnees, self._a_ecrire = self._a_ecrire, None
+                if donnees is None:
+                    return
+            try:
+                ecrire_fichier(self.chemin, donnees)
+            except OSError as exc:
+                self.erreur = exc
@@ -0,0 +1,224 @@
+# =====================================================
+#  sequentiel.py – Simulations à arrêt adaptatif
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+from moteur import MAX_ACTIONS
+from politiques import POLITIQUES
+from simulation import METRIQUES, ResultatPartie, lancer_lot
+from statistiques import Moyenne, confiance_regard, quantile_normal
+
+# Une métrique est un nom d'attribut de ResultatPartie ou une fonction
+Metrique = Union[str, Callable[[ResultatPartie], float]]
+
+# jouer(bras, graine_depart, nb_parties) -> résultats des graines consécutives
+Joueur = Callable[[Hashable, int, int], List[ResultatPartie]]
+
+
+@dataclass
+class ResultatSequentiel:
+    """Estimation d'une métrique pour un bras (politique ou configuration)."""
+    bras: Hashable
+    parties: int
+    moyenne: float
+    demi_largeur: float
+    regards: int
+    cible_atteinte: bool
+    elimine: bool = False
+    # Bornes de l'intervalle (asymétrique pour une proportion, voir Moyenne.intervalle)
+    bas: Optional[float] = None
+    haut: Optional[float] = None
+
+    @property
+    def ic(self):
+        if self.bas is not None:
+            return self.bas, self.haut
+        return self.moyenne - self.demi_largeur, self.moyenne + self.demi_largeur
+
+# Parties jouées par bras avant tout arrêt ou toute élimination : sur les
+# premiers paquets, une métrique rare (victoire) peut n'avoir aucun succès
+MIN_PARTIES = 1000
+
+
+def valeur(resultat: ResultatPartie, metrique: Metrique) -> float:
+    """Valeur de la métrique pour une partie."""
+    if callable(metrique):
+        return float(metrique(resultat))
+    return float(getattr(resultat, metrique))
+
+
+def joueur_politiques(processus: int = 1, crn: bool = True, max_actions: int = MAX_ACTIONS) -> Joueur:
+    """Fonction jouer() par défaut : les bras sont des noms de politiques."""
+    def jouer(nom, graine_depart, nb):
+        return lancer_lot(nom, nb, graine_depart, processus, max_actions=max_actions, crn=crn)
+    return jouer
+
+
+def lancer_sequentiel(bras: Hashable, jouer: Joueur, metrique: Metrique = "victoire",
+                      cible: float = 0.01, confiance: float = 0.95,
+                      paquet_initial: int = 1000, max_parties: int = 1_000_000,
+                      graine_depart: int = 0, min_parties: int = MIN_PARTIES) -> ResultatSequentiel:
+    """
+    Joue des parties jusqu'à ce que l'intervalle de confiance de la métrique
+    ait une demi-largeur <= cible, au lieu d'un nombre fixe de parties.
+
+    À chaque regard, la taille du paquet suivant est estimée à partir de la
+    variance observée (au plus un doublement), ce qui limite le nombre de
+    regards. Le risque est réparti entre regards (voir confiance_regard),
+    donc l'intervalle final garde son niveau de confiance malgré l'arrêt
+    adaptatif. Pour une métrique 0/1, l'intervalle est celui de Wilson ;
+    pas d'arrêt avant min_parties parties.
+    """
+    stats = Moyenne()
+    prochain = paquet_initial
+    regard = 0
+    bas, haut = -math.inf, math.inf
+    while stats.n < max_parties:
+        prochain = min(prochain, max_parties - stats.n)
+        for r in jouer(bras, graine_depart + stats.n, prochain):
+            stats.ajouter(valeur(r, metrique))
+        regard += 1
+        bas, haut = stats.intervalle(confiance_regard(confiance, regard))
+        if (haut - bas) / 2 <= cible and stats.n >= min_parties:
+            return ResultatSequentiel(bras, stats.n, stats.moyenne, (haut - bas) / 2, regard, True, bas=bas, haut=haut)
+
+        # Taille estimée pour atteindre la cible au regard suivant
+        z = quantile_normal(confiance_regard(confiance, regard + 1))
+        besoin = max(math.ceil((z * stats.ecart_type_prudent / cible) ** 2), min_parties) - stats.n
+        prochain = max(paquet_initial, min(besoin, stats.n))
+
+    return ResultatSequentiel(bras, stats.n, stats.moyenne, (haut - bas) / 2, regard, False, bas=bas, haut=haut)
+
+
+def eliminer(bras: Iterable[Hashable], jouer: Joueur, metrique: Metrique = "victoire",
+             cible: float = 0.01, confiance: float = 0.95, paquet_initial: int = 1000,
+             max_parties: int = 1_000_000, maximiser: bool = True,
+             graine_depart: int = 0, min_parties: int = MIN_PARTIES) -> Dict[Hashable, ResultatSequentiel]:
+    """
+    Compare plusieurs bras par élimination successive.
+
+    À chaque tour, tous les bras encore en lice jouent les mêmes graines
+    (paquets doublés à chaque tour). Comme les parties sont appariées, la
+    comparaison porte sur la différence partie par partie entre deux bras,
+    bien moins variable que chaque bras seul : un bras est éliminé dès que
+    l'intervalle de confiance de sa différence avec un autre bras est
+    entièrement sous 0 (au-dessus si maximiser=False). La comparaison
+    s'arrête quand il ne reste qu'un bras, quand tous les intervalles
+    restants sont plus étroits que la cible, ou quand max_parties est
+    atteint par bras. Aucun bras n'est éliminé ni arrêté avant min_parties
+    parties ; pour une métrique 0/1, les intervalles de chaque bras sont
+    ceux de Wilson. Avec un seul bras, c'est lancer_sequentiel().
+
+    Returns:
+        Les estimations de chaque bras, éliminés compris.
+    """
+    bras = list(bras)
+    if not bras:
+        raise ValueError("Aucun bras à comparer")
+    if len(bras) == 1:
+        return {bras[0]: lancer_sequentiel(bras[0], jouer, metrique, cible, confiance, paquet_initial,
+                                           max_parties, graine_depart, min_parties)}
+
+    signe = 1.0 if maximiser else -1.0
+    stats = {b: Moyenne() for b in bras}
+    # Différence appariée (gain de a sur b) pour chaque paire de bras
+    paires = [(a, b) for i, a in enumerate(bras) for b in bras[i + 1:]]
+    ecarts = {p: Moyenne(binaire=False) for p in paires}
+    resultats: Dict[Hashable, ResultatSequentiel] = {}
+    actifs = list(bras)
+    n = 0
+    regard = 0
+    paquet = paquet_initial
+
+    while len(actifs) > 1 and n < max_parties:
+        paquet = min(paquet, max_parties - n)
+        valeurs = {b: [valeur(r, metrique) for r in jouer(b, graine_depart + n, paquet)] for b in actifs}
+        for b in actifs:
+            for x in valeurs[b]:
+                stats[b].ajouter(x)
+        for a, b in paires:
+            if a in valeurs and b in valeurs:
+                for xa, xb in zip(valeurs[a], valeurs[b]):
+                    ecarts[a, b].ajouter(signe * (xa - xb))
+        n += paquet
+        regard += 1
+        if n < min_parties:
+            paquet *= 2
+            continue
+        niveau = confiance_regard(confiance, regard, len(bras))
+        ic = {b: stats[b].intervalle(niveau) for b in actifs}
+
+        # Un bras est battu si un autre bras encore en lice le dépasse sûrement
+        niveau_paire = confiance_regard(confiance, regard, len(paires))
+        battus = set()
+        for a, b in paires:
+            if a in actifs and b in actifs:
+                bas, haut = ecarts[a, b].intervalle(niveau_paire)
+                if bas > 0:
+                    battus.add(b)
+                elif haut < 0:
+                    battus.add(a)
+        for b in [b for b in actifs if b in battus]:
+            actifs.remove(b)
+            bas, haut = ic[b]
+            resultats[b] = ResultatSequentiel(b, n, stats[b].moyenne, (haut - bas) / 2, regard, False,
+                                              elimine=True, bas=bas, haut=haut)
+
+        if all((ic[b][1] - ic[b][0]) / 2 <= cible for b in actifs):
+            break
+        paquet *= 2
+
+    niveau = confiance_regard(confiance, max(regard, 1), len(bras))
+    for b in actifs:
+        bas, haut = stats[b].intervalle(niveau)
+        hb = (haut - bas) / 2
+        resultats[b] = ResultatSequentiel(b, stats[b].n, stats[b].moyenne, hb, regard,
+                                          hb <= cible and stats[b].n >= min_parties, bas=bas, haut=haut)
+    return resultats
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulations BluePrince à arrêt adaptatif.")
+    parser.add_argument("politiques", nargs="+", choices=sorted(POLITIQUES),
+                        help="une politique (estimation) ou plusieurs (élimination)")
+    parser.add_argument("--metrique", choices=METRIQUES, default="victoire")
+    parser.add_argument("--cible", type=float, default=0.01, help="demi-largeur visée de l'IC")
+    parser.add_argument("--confiance", type=float, default=0.95)
+    parser.add_argument("--paquet", type=int, default=1000)
+    parser.add_argument("--min-parties", type=int, default=MIN_PARTIES,
+                        help="parties par politique avant tout arrêt ou élimination")
+    parser.add_argument("--max-parties", type=int, default=1_000_000)
+    parser.add_argument("--minimiser", action="store_true", help="en élimination, le plus petit gagne")
+    parser.add_argument("--processus", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    jouer = joueur_politiques(args.processus)
+    if len(args.politiques) == 1:
+        resultats = {args.politiques[0]: lancer_sequentiel(
+            args.politiques[0], jouer, args.metrique, args.cible, args.confiance,
+            args.paquet, args.max_parties, min_parties=args.min_parties)}
+    else:
+        resultats = eliminer(args.politiques, jouer, args.metrique, args.cible, args.confiance,
+                             args.paquet, args.max_parties, maximiser=not args.minimiser,
+                             min_parties=args.min_parties)
+
+    for r in resultats.values():
+        etat = "éliminé" if r.elimine else ("cible atteinte" if r.cible_atteinte else "budget épuisé")
+        bas, haut = r.ic
+        print(f"{r.bras:>12} : {args.metrique} = {r.moyenne:.4g} ± {r.demi_largeur:.3g} [{bas:.4g}, {haut:.4g}]"
+              f"  ({r.parties} parties, {r.regards} regards, {etat})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
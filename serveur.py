@@ -0,0 +1,542 @@
+# =====================================================
+#  serveur.py – Serveur asyncio de parties multi-sessions
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import secrets
+import struct
+import sys
+import time
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from moteur import Action, Partie, TypeAction
+from politiques import POLITIQUES, creer_politique
+from regles import REGLES_DEFAUT
+from sauvegarde import charger, ecrire_fichier, sauver
+from synchro import Emetteur, Spectateur
+import traces
+
+# Trames échangées dans les deux sens : type (1 octet), longueur (4 octets), contenu
+#
+#   JSON    requête du client ou réponse du serveur (voir Serveur._requete) :
+#             {"op": "creer", "graine": 12, "crn": false, "regles": {...}} → {"session": id}
+#             {"op": "rejoindre", "session": id}                         → {"session": id}
+#             {"op": "fermer", "session": id}                            → {"session": id}
+#           une erreur est renvoyée comme {"erreur": "...", "session": id}
+#           (avec "action": true si elle répond à une trame ACTION)
+#   ACTION  client → serveur : session (8 octets), type (1 octet), argument (1 octet signé)
+#   DELTA   serveur → clients : session (8 octets), longueur du message texte de
+#           l'action (2 octets) et ce texte, puis un message synchro.py
+#
+# Chaque ACTION reçoit un DELTA ; creer et rejoindre envoient aussi un DELTA
+# (image clé) après la réponse JSON. Les spectateurs d'une session reçoivent
+# les DELTA de toutes ses actions.
+TRAME = struct.Struct("<cI")
+JSON = b"J"
+ACTION = b"A"
+DELTA = b"D"
+SESSION = struct.Struct("<Q")
+TRAME_ACTION = struct.Struct("<QBb")
+TEXTE = struct.Struct("<H")
+
+TAILLE_MAX = 1 << 20
+
+# Graines acceptées : celles que sauvegarde.ENTETE peut écrire (entier signé de 64 bits)
+GRAINE_MIN, GRAINE_MAX = -(1 << 63), (1 << 63) - 1
+
+journal = logging.getLogger("blueprince")
+
+
+def trame(type_trame: bytes, contenu: bytes) -> bytes:
+    return TRAME.pack(type_trame, len(contenu)) + contenu
+
+
+async def lire_trame(reader: asyncio.StreamReader) -> Tuple[bytes, bytes]:
+    type_trame, taille = TRAME.unpack(await reader.readexactly(TRAME.size))
+    if taille > TAILLE_MAX:
+        raise ValueError(f"Trame trop longue : {taille} octets")
+    return type_trame, await reader.readexactly(taille)
+
+
+def trame_delta(session: int, texte: str, message: bytes) -> bytes:
+    b = texte.encode("utf-8")[:0xFFFF]
+    return trame(DELTA, SESSION.pack(session) + TEXTE.pack(len(b)) + b + message)
+
+
+def lire_delta(contenu: bytes) -> Tuple[int, str, bytes]:
+    """(session, texte, message synchro) d'une trame DELTA."""
+    (session,) = SESSION.unpack_from(contenu)
+    (n,) = TEXTE.unpack_from(contenu, SESSION.size)
+    debut = SESSION.size + TEXTE.size
+    return session, contenu[debut:debut + n].decode("utf-8"), contenu[debut + n:]
+
+
+# ==========================
+#  SESSIONS
+# ==========================
+
+class Session:
+    """
+    Une partie hébergée, son émetteur de deltas et les connexions qui la
+    suivent. L'ensemble abonnes appartient au serveur (Serveur.abonnes) :
+    il survit à l'éviction de la session.
+    """
+    __slots__ = ("partie", "emetteur", "abonnes", "dernier_acces")
+
+    def __init__(self, partie: Partie, intervalle_cle: int, abonnes: Set[asyncio.StreamWriter]):
+        self.partie = partie
+        self.emetteur = Emetteur(intervalle_cle)
+        self.abonnes = abonnes
+        self.dernier_acces = time.monotonic()
+
+
+class Serveur:
+    """
+    Héberge des parties sans affichage, indexées par un identifiant de
+    session, et les fait jouer par des clients TCP ou socket Unix.
+
+    Une action du moteur est courte (une fraction de milliseconde) et
+    s'exécute directement dans la boucle ; les lectures et écritures de
+    fichiers passent par un exécuteur pour ne jamais bloquer la boucle.
+    Les sessions inactives depuis delai_inactivite secondes sont écrites
+    dans dossier (voir sauvegarde.py) et retirées de la mémoire ; elles
+    sont rechargées à la demande suivante. Leurs abonnés restent inscrits
+    pendant l'éviction : au rechargement, l'émetteur repart d'une image
+    clé sur laquelle leurs spectateurs se resynchronisent.
+
+    Args:
+        dossier: dossier des sessions évincées (créé si besoin).
+        delai_inactivite: secondes sans action avant l'éviction.
+        intervalle_cle: messages entre deux images clés (voir synchro.Emetteur).
+    """
+
+    def __init__(self, dossier: str, delai_inactivite: float = 300.0, intervalle_cle: int = 32):
+        self.dossier = dossier
+        self.delai_inactivite = delai_inactivite
+        self.intervalle_cle = intervalle_cle
+        os.makedirs(dossier, exist_ok=True)
+        self.sessions: Dict[int, Session] = {}
+        self.abonnes: Dict[int, Set[asyncio.StreamWriter]] = {}   # sessions en mémoire ou évincées
+        self._chargements: Dict[int, asyncio.Future] = {}
+        self._ecritures: Dict[int, bytes] = {}   # sessions évincées pas encore sur disque
+        self._serveurs: List[asyncio.AbstractServer] = []
+        self._eviction: Optional[asyncio.Task] = None
+
+    def _chemin(self, session: int) -> str:
+        return os.path.join(self.dossier, f"{session:016x}.bps")
+
+    # ---------- Sessions ----------
+
+    def creer(self, graine: Optional[int] = None, crn: bool = False, regles: Optional[dict] = None) -> int:
+        if graine is not None and (type(graine) is not int or not GRAINE_MIN <= graine <= GRAINE_MAX):
+            raise ValueError(f"Graine invalide : {graine!r} (entier signé de 64 bits attendu)")
+        graine = secrets.randbits(31) if graine is None else graine
+        partie = Partie(graine, crn=crn, regles=REGLES_DEFAUT.modifier(**(regles or {})))
+        session = secrets.randbits(63)
+        self.sessions[session] = Session(partie, self.intervalle_cle, self.abonnes.setdefault(session, set()))
+        return session
+
+    async def session(self, session: int) -> Session:
+        """Session en mémoire, rechargée depuis le disque si elle a été évincée."""
+        s = self.sessions.get(session)
+        if s is not None:
+            s.dernier_acces = time.monotonic()
+            return s
+        attente = self._chargements.get(session)
+        if attente is None:
+            attente = self._chargements[session] = asyncio.ensure_future(self._charger(session))
+        try:
+            return await asyncio.shield(attente)
+        finally:
+            self._chargements.pop(session, None)
+
+    async def _charger(self, session: int) -> Session:
+        donnees = self._ecritures.get(session)
+        if donnees is None:
+            chemin = self._chemin(session)
+            try:
+                donnees = await asyncio.get_running_loop().run_in_executor(None, _lire, chemin)
+            except FileNotFoundError:
+                raise KeyError(session) from None
+        s = self.sessions.get(session)
+        if s is None:
+            s = self.sessions[session] = Session(charger(donnees), self.intervalle_cle,
+                                                 self.abonnes.setdefault(session, set()))
+        s.dernier_acces = time.monotonic()
+        return s
+
+    async def evincer(self, avant: Optional[float] = None) -> int:
+        """
+        Écrit sur disque et retire de la mémoire les sessions dont la
+        dernière action est antérieure à avant (par défaut : toutes).
+        Une session qui ne peut pas être sauvée ou écrite reste en mémoire
+        (l'erreur est journalisée) sans empêcher l'éviction des autres.
+        Renvoie le nombre de sessions évincées.
+        """
+        boucle = asyncio.get_running_loop()
+        a_evincer = [i for i, s in self.sessions.items() if avant is None or s.dernier_acces < avant]
+        evincees, ecritures = [], []
+        for n, session in enumerate(a_evincer):
+            s = self.sessions.get(session)
+            if s is None:
+                continue
+            try:
+                donnees = sauver(s.partie)
+            except Exception:
+                journal.exception("Session %016x non sauvée, gardée en mémoire", session)
+                continue
+            del self.sessions[session]
+            self._ecritures[session] = donnees
+            evincees.append((session, s))
+            ecritures.append(boucle.run_in_executor(None, ecrire_fichier, self._chemin(session), donnees))
+            if n % 64 == 63:
+                await asyncio.sleep(0)   # laisse passer les actions des autres sessions
+
+        resultats = await asyncio.gather(*ecritures, return_exceptions=True)
+        nb = 0
+        for (session, s), resultat in zip(evincees, resultats):
+            self._ecritures.pop(session, None)
+            if isinstance(resultat, BaseException):
+                journal.error("Session %016x non écrite, gardée en mémoire : %s", session, resultat)
+                self.sessions.setdefault(session, s)
+                continue
+            nb += 1
+            if not s.abonnes and session not in self.sessions:
+                self.abonnes.pop(session, None)
+        return nb
+
+    async def _evincer_periodiquement(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, self.delai_inactivite / 4))
+            try:
+                await self.evincer(time.monotonic() - self.delai_inactivite)
+            except Exception:
+                journal.exception("Échec de l'éviction périodique")
+
+    # ---------- Protocole ----------
+
+    @staticmethod
+    def _erreur(writer: asyncio.StreamWriter, exc: Exception, session, action: bool = False) -> None:
+        reponse = {"erreur": "session inconnue" if isinstance(exc, KeyError) else str(exc), "session": session}
+        if action:
+            reponse["action"] = True
+        writer.write(trame(JSON, json.dumps(reponse).encode("utf-8")))
+
+    async def _requete(self, contenu: bytes, writer: asyncio.StreamWriter, suivies: Set[int]) -> None:
+        session = None
+        try:
+            requete = json.loads(contenu)
+            if not isinstance(requete, dict):
+                raise ValueError("La requête doit être un objet JSON")
+            op = requete.get("op")
+            session = requete.get("session")
+            if op == "creer":
+                session = self.creer(requete.get("graine"), bool(requete.get("crn")), requete.get("regles"))
+                s = self.sessions[session]
+            elif op in ("rejoindre", "fermer"):
+                session = int(session)
+                s = await self.session(session)
+            else:
+                raise ValueError(f"Opération inconnue : {op!r}")
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            self._erreur(writer, exc, session)
+            return
+
+        if op == "fermer":
+            self.sessions.pop(session, None)
+            self.abonnes.pop(session, None)
+            for w in s.abonnes:
+                if w is not writer:
+                    w.write(trame(JSON, json.dumps({"fermee": session}).encode("utf-8")))
+            suivies.discard(session)
+            await asyncio.get_running_loop().run_in_executor(None, _supprimer, self._chemin(session))
+            writer.write(trame(JSON, json.dumps({"session": session}).encode("utf-8")))
+            return
+
+        s.abonnes.add(writer)
+        suivies.add(session)
+        writer.write(trame(JSON, json.dumps({"session": session}).encode("utf-8")))
+        writer.write(trame_delta(session, "", s.emetteur.image_cle(s.partie)))
+
+    async def _action(self, contenu: bytes, writer: asyncio.StreamWriter, suivies: Set[int]) -> None:
+        if len(contenu) != TRAME_ACTION.size:
+            erreur = ValueError(f"Trame ACTION de {len(contenu)} octets au lieu de {TRAME_ACTION.size}")
+            self._erreur(writer, erreur, None, action=True)
+            return
+        session, type_action, arg = TRAME_ACTION.unpack(contenu)
+        try:
+            s = await self.session(session)
+            action = Action(TypeAction(type_action), arg)
+        except (KeyError, ValueError) as exc:
+            self._erreur(writer, exc, session, action=True)
+            return
+        with traces.zone("serveur.action"):
+            try:
+                texte = s.partie.appliquer(action) or ""
+            except (IndexError, ValueError) as exc:
+                texte = f"Action refusée : {exc}"
+            donnees = trame_delta(session, texte, s.emetteur.message(s.partie))
+            s.abonnes.add(writer)
+            suivies.add(session)
+            for w in s.abonnes:
+                w.write(donnees)
+
+    async def _connexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        suivies: Set[int] = set()
+        try:
+            while True:
+                type_trame, contenu = await lire_trame(reader)
+                if type_trame == ACTION:
+                    await self._action(contenu, writer, suivies)
+                elif type_trame == JSON:
+                    await self._requete(contenu, writer, suivies)
+                else:
+                    raise ValueError(f"Type de trame inconnu : {type_trame!r}")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as exc:
+            writer.write(trame(JSON, json.dumps({"erreur": str(exc)}).encode("utf-8")))
+        finally:
+            for session in suivies:
+                abonnes = self.abonnes.get(session)
+                if abonnes is not None:
+                    abonnes.discard(writer)
+                    if not abonnes and session not in self.sessions:
+                        del self.abonnes[session]
+            writer.close()
+
+    # ---------- Démarrage ----------
+
+    async def demarrer(self, hote: str = "127.0.0.1", port: Optional[int] = None,
+                       chemin_unix: Optional[str] = None) -> None:
+        """Écoute en TCP (hote, port) et/ou sur la socket Unix chemin_unix."""
+        if port is not None:
+            self._serveurs.append(await asyncio.start_server(self._connexion, hote, port))
+        if chemin_unix is not None:
+            self._serveurs.append(await asyncio.start_unix_server(self._connexion, chemin_unix))
+        self._eviction = asyncio.create_task(self._evincer_periodiquement())
+
+    @property
+    def adresses(self) -> list:
+        return [sock.getsockname() for srv in self._serveurs for sock in srv.sockets]
+
+    async def arreter(self) -> None:
+        """Ferme les connexions et écrit toutes les sessions sur disque."""
+        if self._eviction is not None:
+            self._eviction.cancel()
+        for srv in self._serveurs:
+            srv.close()
+            await srv.wait_closed()
+        await self.evincer()
+
+
+def _lire(chemin: str) -> bytes:
+    with open(chemin, "rb") as f:
+        return f.read()
+
+
+def _supprimer(chemin: str) -> None:
+    try:
+        os.remove(chemin)
+    except FileNotFoundError:
+        pass
+
+
+# ==========================
+#  CLIENT
+# ==========================
+
+class Client:
+    """
+    Client asyncio minimal : une connexion, plusieurs sessions possibles.
+    Les réponses JSON arrivent dans l'ordre des requêtes ; les DELTA sont
+    rangés par session (voir deltas()).
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._reponses: Deque[asyncio.Future] = collections.deque()
+        self._deltas: Dict[int, asyncio.Queue] = collections.defaultdict(asyncio.Queue)
+        self._lecture = asyncio.create_task(self._lire())
+
+    @classmethod
+    async def connecter(cls, hote: str = "127.0.0.1", port: Optional[int] = None,
+                        chemin_unix: Optional[str] = None) -> "Client":
+        if chemin_unix is not None:
+            return cls(*await asyncio.open_unix_connection(chemin_unix))
+        return cls(*await asyncio.open_connection(hote, port))
+
+    async def _lire(self) -> None:
+        try:
+            while True:
+                type_trame, contenu = await lire_trame(self.reader)
+                if type_trame == DELTA:
+                    session, texte, message = lire_delta(contenu)
+                    self._deltas[session].put_nowait((texte, message))
+                    continue
+                reponse = json.loads(contenu)
+                if "fermee" in reponse:
+                    continue
+                if reponse.get("action"):
+                    # Erreur sur une action : réveille celui qui attend son delta
+                    self._deltas[reponse["session"]].put_nowait(reponse)
+                    continue
+                self._reponses.popleft().set_result(reponse)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            for f in self._reponses:
+                f.set_exception(ConnectionError("Connexion fermée"))
+
+    async def requete(self, **requete) -> dict:
+        futur = asyncio.get_running_loop().create_future()
+        self._reponses.append(futur)
+        self.writer.write(trame(JSON, json.dumps(requete).encode("utf-8")))
+        reponse = await futur
+        if "erreur" in reponse:
+            raise RuntimeError(reponse["erreur"])
+        return reponse
+
+    async def creer(self, graine: Optional[int] = None, crn: bool = False, regles: Optional[dict] = None) -> int:
+        """Crée une session ; son image clé est ensuite disponible par delta()."""
+        return (await self.requete(op="creer", graine=graine, crn=crn, regles=regles or {}))["session"]
+
+    async def rejoindre(self, session: int) -> None:
+        await self.requete(op="rejoindre", session=session)
+
+    async def fermer_session(self, session: int) -> None:
+        await self.requete(op="fermer", session=session)
+
+    def envoyer(self, session: int, action: Action) -> None:
+        self.writer.write(trame(ACTION, TRAME_ACTION.pack(session, action.type, action.arg)))
+
+    async def delta(self, session: int) -> Tuple[str, bytes]:
+        """Prochain (texte, message synchro) reçu pour la session."""
+        d = await self._deltas[session].get()
+        if isinstance(d, dict):
+            raise RuntimeError(d["erreur"])
+        return d
+
+    async def jouer(self, session: int, action: Action) -> Tuple[str, bytes]:
+        self.envoyer(session, action)
+        return await self.delta(session)
+
+    async def fermer(self) -> None:
+        self._lecture.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+# ==========================
+#  TEST DE CHARGE
+# ==========================
+
+async def _jouer_session(client: Client, graine: int, politique: str, latences: List[float]) -> bool:
+    """
+    Joue une partie sur le serveur ; la politique décide sur une copie
+    locale de la partie (même graine), le spectateur suit les deltas.
+    Renvoie True si l'état reçu correspond à la copie locale.
+    """
+    locale = Partie(graine)
+    pol = creer_politique(politique, graine)
+    vue = locale.vue()
+    spectateur = Spectateur()
+    session = await client.creer(graine)
+    spectateur.recevoir((await client.delta(session))[1])
+    while not locale.terminee and locale.nb_actions < 2000:
+        action = pol.decider(vue)
+        locale.appliquer(action)
+        debut = time.perf_counter()
+        _, message = await client.jouer(session, action)
+        latences.append(time.perf_counter() - debut)
+        spectateur.recevoir(message)
+    etat = spectateur.etat()
+    j = locale.joueur
+    return (int(etat["pas"]), int(etat["gemmes"]), int(etat["nb_actions"])) == (j.pas, j.gemmes, locale.nb_actions)
+
+
+async def charge(nb_sessions: int, connexions: int, politique: str, hote: str = "127.0.0.1",
+                 port: Optional[int] = None, chemin_unix: Optional[str] = None) -> dict:
+    """nb_sessions parties jouées en parallèle sur connexions connexions."""
+    clients = [await Client.connecter(hote, port, chemin_unix) for _ in range(connexions)]
+    latences: List[float] = []
+    debut = time.perf_counter()
+    conformes = await asyncio.gather(*(_jouer_session(clients[i % connexions], i, politique, latences)
+                                       for i in range(nb_sessions)))
+    duree = time.perf_counter() - debut
+    for c in clients:
+        await c.fermer()
+    latences.sort()
+    return {
+        "sessions": nb_sessions,
+        "conformes": sum(conformes),
+        "actions": len(latences),
+        "actions/s": round(len(latences) / duree),
+        "latence_p50_ms": round(1000 * latences[len(latences) // 2], 3),
+        "latence_p99_ms": round(1000 * latences[int(len(latences) * 0.99)], 3),
+    }
+
+
+# ======
+#  MAIN
+# ======
+
+async def _servir(args) -> None:
+    serveur = Serveur(args.dossier, args.inactivite)
+    await serveur.demarrer(args.hote, args.port, args.unix)
+    print("En écoute sur", ", ".join(map(str, serveur.adresses)))
+    if args.traces:
+        traces.activer()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await serveur.arreter()
+        if args.traces:
+            print(f"{traces.exporter(args.traces)} zones écrites dans {args.traces}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serveur de parties BluePrince multi-sessions.")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    for nom, aide in (("servir", "lance le serveur"), ("charge", "test de charge contre un serveur lancé")):
+        p = sous.add_parser(nom, help=aide)
+        p.add_argument("--hote", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=None)
+        p.add_argument("--unix", default=None, help="chemin de la socket Unix")
+    sous.choices["servir"].add_argument("--dossier", default="sessions")
+    sous.choices["servir"].add_argument("--inactivite", type=float, default=300.0,
+                                        help="secondes sans action avant l'écriture sur disque")
+    sous.choices["servir"].add_argument("--traces", default=None,
+                                        help="fichier où exporter les zones de traçage à l'arrêt (voir traces.py)")
+    sous.choices["charge"].add_argument("--sessions", type=int, default=1000)
+    sous.choices["charge"].add_argument("--connexions", type=int, default=10)
+    sous.choices["charge"].add_argument("--politique", default="glouton", choices=list(POLITIQUES))
+    args = parser.parse_args(argv)
+    if args.port is None and args.unix is None:
+        args.port = 8765
+
+    if args.commande == "servir":
+        try:
+            asyncio.run(_servir(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    resultat = asyncio.run(charge(args.sessions, args.connexions, args.politique, args.hote, args.port, args.unix))
+    for cle, valeur in resultat.items():
+        print(f"{cle:>18} : {valeur}")
+    return 0 if resultat["conformes"] == resultat["sessions"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# =====================================================
+#  simulation.py – Parties en lot, sans affichage
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, List, Optional
+
+from moteur import Partie, Phase, MAX_ACTIONS
+from politiques import creer_politique, POLITIQUES
+from regles import Regles
+from statistiques import resume_apparie
+from telemetrie import Telemetrie
+from rejeu import enregistrer
+
+# Métriques numériques d'un ResultatPartie (comparaisons, arrêt séquentiel)
+METRIQUES = ("victoire", "pas", "gemmes", "nb_actions", "nb_salles")
+
+
+@dataclass
+class ResultatPartie:
+    """Résumé d'une partie simulée."""
+    graine: int
+    victoire: bool
+    pas: int
+    gemmes: int
+    nb_actions: int
+    nb_salles: int
+
+
+def jouer_partie(nom_politique: str, graine: int, max_actions: int = MAX_ACTIONS,
+                 crn: bool = False, regles: Optional[Regles] = None,
+                 telemetrie: Optional[Telemetrie] = None,
+                 rejeu: Optional[BinaryIO] = None) -> ResultatPartie:
+    """
+    Joue une partie complète avec la politique nom_politique.
+    La politique est initialisée avec la même graine que la partie,
+    ce qui rend chaque partie reproductible.
+    Avec crn=True, les tirages sont indexés par point de décision (voir moteur.FluxAleatoires).
+    regles remplace les constantes d'équilibrage par défaut (voir regles.Regles).
+    telemetrie reçoit les enregistrements des coups et de la partie.
+    rejeu est un flux binaire où enregistrer la partie (voir rejeu.py).
+    """
+    partie = Partie(graine, crn=crn, regles=regles, telemetrie=telemetrie)
+    if rejeu is not None:
+        enregistrer(partie, rejeu, nom_politique)
+    partie.jouer(creer_politique(nom_politique, graine), max_actions)
+    j = partie.joueur
+    return ResultatPartie(
+        graine=graine,
+        victoire=partie.phase == Phase.VICTOIRE,
+        pas=j.pas,
+        gemmes=j.gemmes,
+        nb_actions=partie.nb_actions,
+        nb_salles=partie.nb_salles(),
+    )
+
+
+def _jouer_plage(nom_politique: str, debut: int, fin: int, max_actions: int,
+                 crn: bool = False, regles: Optional[Regles] = None,
+                 telemetrie: Optional[str] = None, rejeux: Optional[str] = None) -> List[ResultatPartie]:
+    """Joue les graines [debut, fin) ; unité de travail envoyée aux processus."""
+    if telemetrie is None and rejeux is None:
+        return [jouer_partie(nom_politique, g, max_actions, crn, regles) for g in range(debut, fin)]
+
+    t = Telemetrie(telemetrie) if telemetrie is not None else None
+    f = None
+    if rejeux is not None:
+        # Un fichier de rejeux concaténés par plage de graines
+        os.makedirs(rejeux, exist_ok=True)
+        f = open(os.path.join(rejeux, f"{nom_politique}-{debut:09d}-{fin:09d}.bpr"), "wb")
+    try:
+        return [jouer_partie(nom_politique, g, max_actions, crn, regles, t, f) for g in range(debut, fin)]
+    finally:
+        if t is not None:
+            t.fermer()
+        if f is not None:
+            f.close()
+
+
+def lancer_lot(nom_politique: str, nb_parties: int, graine_depart: int = 0,
+               processus: int = 1, taille_paquet: int = 500,
+               max_actions: int = MAX_ACTIONS, crn: bool = False,
+               regles: Optional[Regles] = None,
+               telemetrie: Optional[str] = None,
+               rejeux: Optional[str] = None) -> List[ResultatPartie]:
+    """
+    Joue nb_parties parties consécutives à partir de graine_depart.
+
+    Args:
+        nom_politique: nom d'une politique de politiques.POLITIQUES.
+        processus: nombre de processus (1 = tout dans le processus courant).
+        taille_paquet: nombre de graines envoyées à la fois à un processus.
+        crn: mode common random numbers (voir moteur.FluxAleatoires).
+        regles: constantes d'équilibrage (None = règles par défaut).
+        telemetrie: dossier où exporter les coups et parties (voir telemetrie.py).
+        rejeux: dossier où enregistrer les rejeux binaires (voir rejeu.py).
+
+    Returns:
+        Les résultats, dans l'ordre des graines.
+    """
+    fin = graine_depart + nb_parties
+    if processus <= 1:
+        return _jouer_plage(nom_politique, graine_depart, fin, max_actions, crn, regles, telemetrie, rejeux)
+
+    plages = [(d, min(d + taille_paquet, fin)) for d in range(graine_depart, fin, taille_paquet)]
+    resultats: List[ResultatPartie] = []
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        futurs = [pool.submit(_jouer_plage, nom_politique, d, f, max_actions, crn, regles, telemetrie, rejeux) for d, f in plages]
+        for futur in futurs:
+            resultats.extend(futur.result())
+    return resultats
+
+
+def resumer(resultats: Iterable[ResultatPartie]) -> dict:
+    """Statistiques agrégées d'un lot de parties."""
+    resultats = list(resultats)
+    n = len(resultats)
+    if n == 0:
+        return {"parties": 0}
+    return {
+        "parties": n,
+        "taux_victoire": sum(r.victoire for r in resultats) / n,
+        "pas_moyens": sum(r.pas for r in resultats) / n,
+        "gemmes_moyennes": sum(r.gemmes for r in resultats) / n,
+        "actions_moyennes": sum(r.nb_actions for r in resultats) / n,
+        "salles_moyennes": sum(r.nb_salles for r in resultats) / n,
+    }
+
+def comparer(nom_a: str, nom_b: str, nb_parties: int, graine_depart: int = 0,
+             processus: int = 1, crn: bool = True, max_actions: int = MAX_ACTIONS,
+             confiance: float = 0.95) -> dict:
+    """
+    Compare deux politiques sur les mêmes graines et renvoie, pour chaque
+    métrique de METRIQUES, les statistiques de la différence appariée a - b
+    (voir statistiques.resume_apparie).
+
+    Avec crn=True (par défaut), les deux politiques voient les mêmes tirages
+    aléatoires à chaque point de décision commun.
+    """
+    res_a = lancer_lot(nom_a, nb_parties, graine_depart, processus, max_actions=max_actions, crn=crn)
+    res_b = lancer_lot(nom_b, nb_parties, graine_depart, processus, max_actions=max_actions, crn=crn)
+    return {
+        m: resume_apparie([float(getattr(r, m)) for r in res_a],
+                          [float(getattr(r, m)) for r in res_b], confiance)
+        for m in METRIQUES
+    }
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulation de parties BluePrince en lot.")
+    parser.add_argument("--politique", choices=sorted(POLITIQUES), default="glouton")
+    parser.add_argument("--parties", type=int, default=1000)
+    parser.add_argument("--graine", type=int, default=0, help="première graine")
+    parser.add_argument("--processus", type=int, default=1)
+    parser.add_argument("--max-actions", type=int, default=MAX_ACTIONS)
+    parser.add_argument("--crn", action=argparse.BooleanOptionalAction, default=None,
+                        help="common random numbers (activé par défaut avec --comparer)")
+    parser.add_argument("--comparer", choices=sorted(POLITIQUES), metavar="POLITIQUE",
+                        help="compare --politique à cette politique sur les mêmes graines")
+    parser.add_argument("--telemetrie", metavar="DOSSIER",
+                        help="exporte les coups et parties en colonnes NumPy dans ce dossier")
+    parser.add_argument("--rejeux", metavar="DOSSIER",
+                        help="enregistre chaque partie en rejeu binaire dans ce dossier")
+    args = parser.parse_args(argv)
+
+    if args.comparer:
+        crn = args.crn is not False
+        stats = comparer(args.politique, args.comparer, args.parties, args.graine,
+                         args.processus, crn, args.max_actions)
+        print(f"{args.politique} - {args.comparer} sur {args.parties} graines (CRN {'oui' if crn else 'non'})")
+        for m, s in stats.items():
+            moyennes = f"a={s['moyenne_a']:.4g}, b={s['moyenne_b']:.4g}"
+            if s["reduction_variance"] is None:
+                # Différence constante (0 victoire des deux côtés...) : rien à estimer
+                print(f"{m:>12} : n/a   ({moyennes}, différence constante)")
+                continue
+            corr = "n/a" if s["correlation"] is None else f"{s['correlation']:.2f}"
+            print(f"{m:>12} : {s['difference']:+.4g} ± {s['demi_largeur']:.3g}"
+                  f"   ({moyennes}, corr={corr}, réduction variance x{s['reduction_variance']:.2f})")
+        return 0
+
+    t0 = time.perf_counter()
+    resultats = lancer_lot(args.politique, args.parties, args.graine, args.processus,
+                           max_actions=args.max_actions, crn=bool(args.crn), telemetrie=args.telemetrie,
+                           rejeux=args.rejeux)
+    duree = time.perf_counter() - t0
+
+    for cle, valeur in resumer(resultats).items():
+        print(f"{cle:>18} : {valeur:.4g}" if isinstance(valeur, float) else f"{cle:>18} : {valeur}")
+    print(f"{'parties/s':>18} : {len(resultats) / duree:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
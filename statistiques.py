@@ -0,0 +1,148 @@
+# =====================================================
+#  statistiques.py – Outils statistiques des simulations
+# =====================================================
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Optional, Sequence
+
+
+def quantile_normal(confiance: float) -> float:
+    """Quantile z tel que P(|Z| <= z) = confiance (ex : 0.95 → 1.96)."""
+    return NormalDist().inv_cdf(0.5 + confiance / 2)
+
+
+def confiance_regard(confiance: float, regard: int, nb_tests: int = 1) -> float:
+    """
+    Niveau de confiance à utiliser au regard numéro `regard` (1, 2, ...) d'une
+    procédure séquentielle, pour que la garantie globale reste `confiance`
+    malgré les regards répétés et les nb_tests intervalles simultanés.
+
+    Le risque alpha est dépensé en 1/2, 1/4, 1/8, ... (borne de l'union).
+    """
+    alpha = (1 - confiance) / (2 ** regard) / nb_tests
+    return 1 - alpha
+
+
+def intervalle_wilson(succes: float, n: int, confiance: float = 0.95):
+    """
+    Intervalle de score de Wilson d'une proportion (succes / n). Contrairement
+    à l'approximation normale, il ne se réduit pas à un point quand aucun
+    succès (ou aucun échec) n'a encore été observé : 0 victoire sur 1400
+    parties donne [0, 0.0027] à 95 %, pas [0, 0].
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = quantile_normal(confiance)
+    p = succes / n
+    z2n = z * z / n
+    centre = (p + z2n / 2) / (1 + z2n)
+    h = z / (1 + z2n) * math.sqrt(p * (1 - p) / n + z2n / (4 * n))
+    bas = 0.0 if succes <= 0 else max(0.0, centre - h)
+    haut = 1.0 if succes >= n else min(1.0, centre + h)
+    return bas, haut
+
+
+class Moyenne:
+    """
+    Moyenne et variance calculées en ligne (algorithme de Welford),
+    sans garder les valeurs en mémoire.
+
+    binaire : les valeurs sont des 0/1 (victoire...) ; l'intervalle de
+    confiance est alors celui de Wilson (voir intervalle). Par défaut
+    (binaire=None), vrai tant que toutes les valeurs ajoutées valent 0 ou 1 ;
+    binaire=False pour une variable qui pourrait prendre d'autres valeurs
+    (une différence appariée de 0/1, par exemple).
+    """
+    __slots__ = ("n", "moyenne", "_m2", "binaire")
+
+    def __init__(self, binaire: Optional[bool] = None):
+        self.n = 0
+        self.moyenne = 0.0
+        self._m2 = 0.0
+        self.binaire = binaire is not False
+
+    def ajouter(self, x: float) -> None:
+        if self.binaire and x != 0 and x != 1:
+            self.binaire = False
+        self.n += 1
+        delta = x - self.moyenne
+        self.moyenne += delta / self.n
+        self._m2 += delta * (x - self.moyenne)
+
+    @property
+    def variance(self) -> float:
+        """Variance empirique (non biaisée)."""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def ecart_type(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def ecart_type_prudent(self) -> float:
+        """
+        Écart-type pour prévoir le nombre de parties nécessaires : pour une
+        proportion, sqrt(p(1 - p)) avec p borné à [1/(n+1), n/(n+1)], qui
+        ne s'annule pas tant qu'aucun succès n'a été vu.
+        """
+        if not self.binaire or self.n == 0:
+            return self.ecart_type
+        p = min(max(self.moyenne, 1 / (self.n + 1)), self.n / (self.n + 1))
+        return math.sqrt(p * (1 - p))
+
+    def intervalle(self, confiance: float = 0.95):
+        """
+        Intervalle de confiance (bas, haut) sur la moyenne : Wilson pour des
+        valeurs 0/1, approximation normale sinon ((-inf, inf) avant 2 valeurs).
+        """
+        if self.n < 2:
+            return -math.inf, math.inf
+        if self.binaire:
+            return intervalle_wilson(self.moyenne * self.n, self.n, confiance)
+        h = quantile_normal(confiance) * self.ecart_type / math.sqrt(self.n)
+        return self.moyenne - h, self.moyenne + h
+
+    def demi_largeur(self, confiance: float = 0.95) -> float:
+        """Demi-largeur de l'intervalle de confiance sur la moyenne (voir intervalle)."""
+        bas, haut = self.intervalle(confiance)
+        return (haut - bas) / 2
+
+
+def resume_apparie(a: Sequence[float], b: Sequence[float], confiance: float = 0.95) -> dict:
+    """
+    Statistiques de la différence appariée a[i] - b[i].
+
+    Returns:
+        dict avec les moyennes de a et b, la différence moyenne, son intervalle
+        de confiance, la corrélation entre a et b, et le facteur de réduction
+        de variance obtenu par l'appariement (var(a) + var(b)) / var(a - b).
+        La corrélation est None si a ou b est constante, la réduction None
+        si a - b l'est : ni l'une ni l'autre n'a alors de sens.
+    """
+    if len(a) != len(b):
+        raise ValueError("Les deux séries doivent avoir la même longueur")
+
+    ma, mb, md = Moyenne(), Moyenne(), Moyenne(binaire=False)
+    for x, y in zip(a, b):
+        ma.ajouter(x)
+        mb.ajouter(y)
+        md.ajouter(x - y)
+
+    # cov(a, b) = (var(a) + var(b) - var(a - b)) / 2
+    cov = (ma.variance + mb.variance - md.variance) / 2
+    denom = ma.ecart_type * mb.ecart_type
+    h = md.demi_largeur(confiance)
+
+    return {
+        "n": md.n,
+        "moyenne_a": ma.moyenne,
+        "moyenne_b": mb.moyenne,
+        "difference": md.moyenne,
+        "demi_largeur": h,
+        "ic": (md.moyenne - h, md.moyenne + h),
+        "correlation": cov / denom if denom > 0 else None,
+        "reduction_variance": (ma.variance + mb.variance) / md.variance if md.variance > 0 else None,
+    }
@@ -0,0 +1,279 @@
+# =====================================================
+#  synchro.py – Synchronisation par deltas pour les spectateurs
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import sys
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from evenements import CoupJoue
+from memoire_partagee import DTYPE_ETAT, encoder, vers_partie
+from moteur import Partie
+from politiques import POLITIQUES, creer_politique
+from rejeu import ecrire_varint
+from traces import trace
+
+# Un message décrit l'état de la partie après un coup, sous forme de
+# vecteur d'octets : l'enregistrement memoire_partagee.DTYPE_ETAT brut.
+#
+#   type     : 1 octet, CLE (état complet) ou DELTA (différences avec le précédent)
+#   numéro   : varint, numéro du message (0, 1, 2...)
+#   octets   : nombre d'octets modifiés, puis pour chacun l'écart avec
+#              l'octet modifié précédent (varint) et sa nouvelle valeur.
+#              Une image clé donne les différences avec VIDE (grille vide,
+#              pas de porte, pas de tirage), un delta celles avec le message
+#              précédent.
+#
+# Une salle posée, une porte déverrouillée, un compteur du joueur ou un
+# objet ramassé ne changent que quelques octets : un delta fait
+# typiquement une dizaine d'octets.
+CLE = 1
+DELTA = 2
+
+
+def deplier(vecteur: np.ndarray) -> np.void:
+    """Vecteur d'octets → enregistrement DTYPE_ETAT (copie)."""
+    return np.frombuffer(vecteur.tobytes(), dtype=DTYPE_ETAT)[0]
+
+
+def _vide() -> np.ndarray:
+    etat = np.zeros(1, dtype=DTYPE_ETAT)
+    for nom in ("direction", "salle", "rarete", "tirage"):
+        etat[nom] = -1
+    return etat.view(np.uint8)
+
+
+# Référence des images clés
+VIDE = _vide()
+
+
+def _vecteur(partie: Partie) -> np.ndarray:
+    etat = np.zeros(1, dtype=DTYPE_ETAT)
+    encoder(partie, etat[0])
+    return etat.view(np.uint8)
+
+
+# ==========================
+#  ÉMISSION
+# ==========================
+
+def _message(type_msg: int, numero: int, vecteur: np.ndarray, reference: np.ndarray) -> bytes:
+    t = bytearray((type_msg,))
+    ecrire_varint(t, numero)
+    indices = np.flatnonzero(vecteur != reference).tolist()
+    ecrire_varint(t, len(indices))
+    dernier = -1
+    for i, v in zip(indices, vecteur[indices].tolist()):
+        ecrire_varint(t, i - dernier - 1)
+        t.append(v)
+        dernier = i
+    return bytes(t)
+
+
+class Emetteur:
+    """
+    Produit les messages d'une partie : une image clé au premier message
+    puis tous les intervalle_cle messages (un spectateur qui arrive en
+    cours de partie ou perd un message se resynchronise dessus), des
+    deltas entre les deux.
+    """
+
+    def __init__(self, intervalle_cle: int = 32):
+        self.intervalle_cle = intervalle_cle
+        self.numero = 0
+        self._precedent: Optional[np.ndarray] = None
+
+    @trace("synchro.message")
+    def message(self, partie: Partie) -> bytes:
+        """Message décrivant l'état courant de la partie."""
+        vecteur = _vecteur(partie)
+        if self._precedent is None or self.numero % self.intervalle_cle == 0:
+            t = _message(CLE, self.numero, vecteur, VIDE)
+        else:
+            t = _message(DELTA, self.numero, vecteur, self._precedent)
+        self._precedent = vecteur
+        self.numero += 1
+        return t
+
+    def image_cle(self, partie: Partie) -> bytes:
+        """
+        Image clé de l'état du dernier message, pour un spectateur qui
+        arrive en cours de partie : les deltas suivants s'y enchaînent.
+        """
+        if self._precedent is None:
+            return self.message(partie)
+        return _message(CLE, self.numero - 1, self._precedent, VIDE)
+
+    def brancher(self, partie: Partie, envoyer: Callable[[bytes], None]) -> None:
+        """Envoie l'état initial, puis un message après chaque coup joué."""
+        envoyer(self.message(partie))
+        partie.bus.abonner(CoupJoue, lambda evt: envoyer(self.message(evt.partie)))
+
+
+# ==========================
+#  RÉCEPTION
+# ==========================
+
+def _lire_varint(donnees: bytes, pos: int):
+    n, decalage = 0, 0
+    while True:
+        if pos >= len(donnees):
+            raise ValueError("Message tronqué")
+        b = donnees[pos]
+        pos += 1
+        n |= (b & 0x7F) << decalage
+        if b < 0x80:
+            return n, pos
+        decalage += 7
+
+
+def entete(message: bytes):
+    """(type, numéro) d'un message."""
+    return message[0], _lire_varint(message, 1)[0]
+
+
+def appliquer(vecteur: Optional[np.ndarray], message: bytes) -> np.ndarray:
+    """
+    Applique un message à un vecteur d'état et renvoie le nouveau vecteur
+    (une image clé remplace tout ; un delta modifie une copie de vecteur).
+    """
+    type_msg = message[0]
+    _, pos = _lire_varint(message, 1)
+    if type_msg == CLE:
+        vecteur = VIDE.copy()
+    elif type_msg != DELTA:
+        raise ValueError(f"Type de message inconnu : {type_msg}")
+    elif vecteur is None:
+        raise ValueError("Delta reçu avant la première image clé")
+    else:
+        vecteur = vecteur.copy()
+    n, pos = _lire_varint(message, pos)
+    i = -1
+    for _ in range(n):
+        ecart, pos = _lire_varint(message, pos)
+        i += ecart + 1
+        if pos >= len(message):
+            raise ValueError("Message tronqué")
+        if i >= len(vecteur):
+            raise ValueError(f"Indice {i} hors du vecteur d'état")
+        vecteur[i] = message[pos]
+        pos += 1
+    return vecteur
+
+
+class Spectateur:
+    """
+    Suit une partie à distance à partir de ses messages. Un message
+    manquant désynchronise le spectateur : les deltas sont ignorés
+    jusqu'à la prochaine image clé.
+    """
+
+    def __init__(self):
+        self.vecteur: Optional[np.ndarray] = None
+        self.numero = -1
+
+    @property
+    def synchronise(self) -> bool:
+        return self.vecteur is not None
+
+    def recevoir(self, message: bytes) -> bool:
+        """Applique le message ; renvoie False s'il a été ignoré."""
+        type_msg, numero = entete(message)
+        if type_msg == DELTA and (self.vecteur is None or numero != self.numero + 1):
+            self.vecteur = None
+            return False
+        self.vecteur = appliquer(self.vecteur, message)
+        self.numero = numero
+        return True
+
+    def etat(self) -> np.void:
+        if self.vecteur is None:
+            raise ValueError("Spectateur non synchronisé")
+        return deplier(self.vecteur)
+
+    def partie(self) -> Partie:
+        """Partie reconstruite pour l'affichage (voir memoire_partagee.vers_partie)."""
+        return vers_partie(self.etat())
+
+
+class Chronologie:
+    """
+    Messages d'une partie conservés pour naviguer dans le temps (rejeu) :
+    etat(n) repart de l'image clé qui précède n et applique les deltas.
+    """
+
+    def __init__(self):
+        self.messages: List[bytes] = []
+        self._cles: List[int] = []
+
+    def ajouter(self, message: bytes) -> None:
+        type_msg, numero = entete(message)
+        if numero != len(self.messages):
+            raise ValueError(f"Message {numero} reçu, {len(self.messages)} attendu")
+        if type_msg == CLE:
+            self._cles.append(numero)
+        self.messages.append(message)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def vecteur(self, n: int) -> np.ndarray:
+        k = bisect.bisect_right(self._cles, n) - 1
+        if k < 0:
+            raise ValueError("Pas d'image clé avant ce message")
+        vecteur = None
+        for message in self.messages[self._cles[k]:n + 1]:
+            vecteur = appliquer(vecteur, message)
+        return vecteur
+
+    def etat(self, n: int) -> np.void:
+        return deplier(self.vecteur(n))
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Taille des messages de synchronisation d'une partie.")
+    parser.add_argument("--politique", default="glouton", choices=list(POLITIQUES))
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--intervalle-cle", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    partie = Partie(args.graine)
+    emetteur = Emetteur(args.intervalle_cle)
+    spectateur = Spectateur()
+    messages: List[bytes] = []
+    resumes: List[int] = []
+
+    def envoyer(message: bytes) -> None:
+        messages.append(message)
+        spectateur.recevoir(message)
+        # Ancienne méthode : résumé de toute la grille à chaque coup
+        resumes.append(len(json.dumps([[r.summary() if r else None for r in ligne] for ligne in partie.grille],
+                                      default=str)))
+
+    emetteur.brancher(partie, envoyer)
+    partie.jouer(creer_politique(args.politique, args.graine))
+    if not np.array_equal(spectateur.vecteur, _vecteur(partie)):
+        print("spectateur désynchronisé", file=sys.stderr)
+        return 1
+
+    cles = [len(m) for m in messages if m[0] == CLE]
+    deltas = [len(m) for m in messages if m[0] == DELTA]
+    print(f"{len(messages)} messages, {sum(map(len, messages))} octets au total")
+    print(f"  images clés : {len(cles)}, {np.mean(cles):.0f} octets en moyenne")
+    if deltas:
+        print(f"  deltas      : {len(deltas)}, {np.mean(deltas):.1f} octets en moyenne")
+    print(f"résumés JSON de la grille : {sum(resumes)} octets au total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# =====================================================
+#  telemetrie.py – Export en colonnes des parties simulées
+# =====================================================
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import queue
+import threading
+import uuid
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from evenements import Bus, CoupJoue, ObjetAjoute, PartieTerminee, PorteOuverte, SalleTiree
+from joueur import PERMANENTS
+from moteur import CODE_SALLE, SALLES   # code de la colonne "salle" des coups, -1 = aucune
+
+# Code de la colonne "objet" des coups (ressource ou objet permanent ajouté), -1 = aucun
+BUTINS = ("pas", "orr", "gemmes", "cles", "des") + PERMANENTS
+CODE_BUTIN = {nom: i for i, nom in enumerate(BUTINS)}
+
+# Colonne "graine" d'une partie lancée sans graine (non reproductible)
+SANS_GRAINE = np.iinfo(np.int64).min
+
+# Un enregistrement par action jouée
+DTYPE_COUPS = np.dtype([
+    ("graine", "i8"),       # graine de la partie
+    ("num", "u2"),          # numéro de l'action dans la partie
+    ("type", "u1"),         # moteur.TypeAction
+    ("arg", "i1"),          # argument de l'action
+    ("ligne", "u1"),        # case du joueur après l'action
+    ("colonne", "u1"),
+    ("salle", "i2"),        # salle posée (code SALLES) ou -1
+    ("cout", "i1"),         # gemmes payées pour la salle posée
+    ("porte", "i1"),        # rareté de la porte franchie (doors.Rarity) ou -1
+    ("objet", "i1"),        # objet ajouté par l'action (code BUTINS) ou -1 ; une action en ajoute au plus un
+    ("quantite", "i2"),     # quantité de cet objet
+    ("d_pas", "i2"),        # variations des ressources pendant l'action (butin compris)
+    ("d_gemmes", "i2"),
+    ("d_cles", "i2"),
+    ("d_des", "i2"),
+    ("d_orr", "i2"),
+])
+
+# Un enregistrement par partie terminée
+DTYPE_PARTIES = np.dtype([
+    ("graine", "i8"),
+    ("victoire", "u1"),
+    ("pas", "i2"),
+    ("gemmes", "i2"),
+    ("cles", "i2"),
+    ("des", "i2"),
+    ("orr", "i4"),
+    ("nb_actions", "u4"),
+    ("nb_salles", "u1"),
+    ("gemmes_depensees", "i4"),
+    ("portes_communes", "u2"),
+    ("portes_rares", "u2"),
+    ("portes_epiques", "u2"),
+])
+
+TABLES = {"coups": DTYPE_COUPS, "parties": DTYPE_PARTIES}
+
+
+class Tampon:
+    """Tableau NumPy préalloué rempli ligne par ligne."""
+    __slots__ = ("donnees", "n")
+
+    def __init__(self, dtype: np.dtype, capacite: int):
+        self.donnees = np.empty(capacite, dtype=dtype)
+        self.n = 0
+
+
+class Telemetrie:
+    """
+    Collecte des enregistrements typés (voir DTYPE_COUPS et DTYPE_PARTIES),
+    construits à partir des événements du bus de chaque partie, dans des
+    tampons NumPy préalloués. Un tampon plein est confié à un
+    thread d'écriture qui le range en « fragment » sur disque, pendant que
+    la simulation continue dans un autre tampon.
+
+    Chaque fragment est stocké en colonnes :
+      - par défaut un dossier avec un fichier .npy par colonne, lisible
+        en mémoire projetée (np.load(..., mmap_mode="r")) ;
+      - avec compresser=True, un fichier .npz compressé (plus petit, mais
+        décompressé à la lecture).
+
+    Args:
+        dossier: dossier des fragments (créé si besoin).
+        capacite: nombre de lignes d'un tampon de coups.
+        compresser: fragments .npz compressés plutôt que .npy.
+    """
+
+    def __init__(self, dossier: str, capacite: int = 1 << 16, compresser: bool = False):
+        self.dossier = dossier
+        self.capacite = capacite
+        self.compresser = compresser
+        os.makedirs(dossier, exist_ok=True)
+        _ecrire_meta(dossier)
+
+        self._prefixe = uuid.uuid4().hex[:12]
+        self._numeros = {t: 0 for t in TABLES}
+        self._capacites = {"coups": capacite, "parties": max(1, capacite // 64)}
+        self._tampons = {t: Tampon(d, self._capacites[t]) for t, d in TABLES.items()}
+        self._libres = {t: queue.SimpleQueue() for t in TABLES}
+        self._a_ecrire: queue.Queue = queue.Queue(maxsize=4)
+        self._erreur: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._ecrivain, name="telemetrie", daemon=True)
+        self._thread.start()
+
+        # Détails du coup en cours et cumuls de la partie en cours
+        self._porte = -1
+        self._salle = -1
+        self._cout = 0
+        self._objet = -1
+        self._quantite = 0
+        self._depense = 0
+        self._portes = [0, 0, 0]
+
+    # ---------- Enregistrement ----------
+
+    def brancher(self, bus: Bus) -> None:
+        """Abonne la télémétrie aux événements d'une partie (appelé par moteur.Partie)."""
+        bus.abonner(PorteOuverte, self._porte_ouverte)
+        bus.abonner(SalleTiree, self._salle_tiree)
+        bus.abonner(ObjetAjoute, self._objet_ajoute)
+        bus.abonner(CoupJoue, self._coup)
+        bus.abonner(PartieTerminee, self._fin_partie)
+
+    def _porte_ouverte(self, evt: PorteOuverte) -> None:
+        self._porte = evt.rarete
+        self._portes[evt.rarete] += 1
+
+    def _salle_tiree(self, evt: SalleTiree) -> None:
+        self._salle = CODE_SALLE[evt.salle]
+        self._cout = evt.cout
+        self._depense += evt.cout
+
+    def _objet_ajoute(self, evt: ObjetAjoute) -> None:
+        if not evt.deja_possede:
+            self._objet = CODE_BUTIN.get(evt.objet, -1)
+            self._quantite = evt.quantite
+
+    def _coup(self, evt: CoupJoue) -> None:
+        partie, action, avant = evt
+        j = partie.joueur
+        t = self._tampons["coups"]
+        t.donnees[t.n] = (
+            _graine(partie), partie.nb_actions, action.type, action.arg, j.ligne, j.colonne,
+            self._salle, self._cout, self._porte, self._objet, self._quantite,
+            j.pas - avant[0], j.gemmes - avant[1], j.cles - avant[2], j.des - avant[3], j.orr - avant[4],
+        )
+        t.n += 1
+        self._porte, self._salle, self._cout = -1, -1, 0
+        self._objet, self._quantite = -1, 0
+        if t.n == t.donnees.shape[0]:
+            self._vider("coups")
+
+    def _fin_partie(self, evt: PartieTerminee) -> None:
+        partie = evt.partie
+        j = partie.joueur
+        t = self._tampons["parties"]
+        t.donnees[t.n] = (
+            _graine(partie), evt.victoire, j.pas, j.gemmes, j.cles, j.des, j.orr,
+            partie.nb_actions, partie.nb_salles(), self._depense, *self._portes,
+        )
+        t.n += 1
+        self._depense = 0
+        self._portes = [0, 0, 0]
+        if t.n == t.donnees.shape[0]:
+            self._vider("parties")
+
+    def fermer(self) -> None:
+        """Écrit les tampons partiels et attend la fin du thread d'écriture."""
+        for table in TABLES:
+            if self._tampons[table].n:
+                self._vider(table)
+        self._a_ecrire.put(None)
+        self._thread.join()
+        if self._erreur is not None:
+            raise self._erreur
+
+    def __enter__(self) -> "Telemetrie":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    # ---------- Écriture en arrière-plan ----------
+
+    def _vider(self, table: str) -> None:
+        if self._erreur is not None:
+            raise self._erreur
+        plein = self._tampons[table]
+        try:
+            self._tampons[table] = self._libres[table].get_nowait()
+        except queue.Empty:
+            self._tampons[table] = Tampon(TABLES[table], self._capacites[table])
+        nom = f"{table}-{self._prefixe}-{self._numeros[table]:05d}"
+        self._numeros[table] += 1
+        # Bloque si l'écriture prend du retard : la mémoire reste bornée
+        self._a_ecrire.put((table, nom, plein))
+
+    def _ecrivain(self) -> None:
+        while True:
+            tache = self._a_ecrire.get()
+            if tache is None:
+                return
+            table, nom, tampon = tache
+            try:
+                self._ecrire_fragment(nom, tampon.donnees[:tampon.n])
+            except BaseException as exc:
+                self._erreur = exc
+            tampon.n = 0
+            self._libres[table].put(tampon)
+
+    def _ecrire_fragment(self, nom: str, lignes: np.ndarray) -> None:
+        # Écrit sous un nom temporaire puis renomme : un lecteur ne voit
+        # jamais de fragment incomplet
+        colonnes = {c: np.ascontiguousarray(lignes[c]) for c in lignes.dtype.names}
+        tmp = os.path.join(self.dossier, f".{nom}.tmp")
+        if self.compresser:
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, **colonnes)
+            os.replace(tmp, os.path.join(self.dossier, nom + ".npz"))
+        else:
+            os.makedirs(tmp, exist_ok=True)
+            for c, valeurs in colonnes.items():
+                np.save(os.path.join(tmp, c + ".npy"), valeurs)
+            os.replace(tmp, os.path.join(self.dossier, nom))
+
+
+def _graine(partie) -> int:
+    return SANS_GRAINE if partie.graine is None else partie.graine
+
+
+def _ecrire_meta(dossier: str) -> None:
+    chemin = os.path.join(dossier, "meta.json")
+    if os.path.exists(chemin):
+        return
+    meta = {"salles": SALLES, "butins": BUTINS, "tables": {t: d.descr for t, d in TABLES.items()}}
+    tmp = f"{chemin}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, chemin)
+
+# ==========================
+#  LECTURE
+# ==========================
+
+def fragments(dossier: str, table: str = "parties",
+              colonnes: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Parcourt les fragments d'une table, un dict {colonne: tableau} par
+    fragment. Les fragments .npy sont projetés en mémoire : seules les
+    colonnes effectivement lues sont chargées.
+    """
+    noms = colonnes or TABLES[table].names
+    for chemin in sorted(glob.glob(os.path.join(dossier, f"{table}-*"))):
+        if chemin.endswith(".npz"):
+            with np.load(chemin) as npz:
+                yield {c: npz[c] for c in noms}
+        elif os.path.isdir(chemin):
+            yield {c: np.load(os.path.join(chemin, c + ".npy"), mmap_mode="r") for c in noms}
+
+
+def lire(dossier: str, table: str = "parties",
+         colonnes: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """Toutes les lignes d'une table, colonnes concaténées."""
+    noms = colonnes or TABLES[table].names
+    morceaux: Dict[str, List[np.ndarray]] = {c: [] for c in noms}
+    for frag in fragments(dossier, table, noms):
+        for c in noms:
+            morceaux[c].append(frag[c])
+    return {c: np.concatenate(m) if m else np.empty(0, TABLES[table][c]) for c, m in morceaux.items()}
+
+
+def salles(dossier: str) -> List[str]:
+    """Table de correspondance code → clé de salle enregistrée avec les fragments."""
+    with open(os.path.join(dossier, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)["salles"]
+
+
+def butins(dossier: str) -> List[str]:
+    """Table de correspondance code → objet (colonne "objet" des coups) enregistrée avec les fragments."""
+    with open(os.path.join(dossier, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)["butins"]
+
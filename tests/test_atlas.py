@@ -0,0 +1,55 @@
+# =====================================================
+#  test_atlas.py – Invalidation de l'atlas de textures
+# =====================================================
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+import pytest
+
+import atlas
+
+
+@pytest.fixture(scope="module", autouse=True)
+def affichage():
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    yield
+    pg.display.quit()
+
+
+def image(chemin, couleur):
+    surf = pg.Surface((4, 4), pg.SRCALPHA, 32)
+    surf.fill(couleur)
+    pg.image.save(surf, str(chemin))
+
+
+def test_cle_change_avec_une_source_ou_une_taille(tmp_path):
+    image(tmp_path / "a.png", (255, 0, 0, 255))
+    cle = atlas.empreinte(str(tmp_path), [("a.png", 8)])
+    assert atlas.empreinte(str(tmp_path), [("a.png", 8)]) == cle
+    assert atlas.empreinte(str(tmp_path), [("a.png", 16)]) != cle
+    image(tmp_path / "a.png", (0, 255, 0, 255))
+    assert atlas.empreinte(str(tmp_path), [("a.png", 8)]) != cle
+    os.remove(tmp_path / "a.png")
+    assert atlas.empreinte(str(tmp_path), [("a.png", 8)]) != cle
+
+
+def test_atlas_perime_ignore(tmp_path):
+    image(tmp_path / "a.png", (255, 0, 0, 255))
+    demandes = [("a.png", 4)]
+    cle = atlas.empreinte(str(tmp_path), demandes)
+    chemin = str(tmp_path / "atlas.bin")
+    atlas.construire(chemin, {("a.png", 4): pg.image.load(str(tmp_path / "a.png"))}, cle)
+
+    images = atlas.charger(chemin, cle)
+    assert images[("a.png", 4)].get_at((0, 0)) == (255, 0, 0, 255)
+
+    # La source change : l'atlas construit pour l'ancienne clé n'est plus chargé
+    image(tmp_path / "a.png", (0, 0, 255, 255))
+    assert atlas.charger(chemin, atlas.empreinte(str(tmp_path), demandes)) is None
+    with open(chemin, "r+b") as f:
+        f.write(b"XXXX")
+    assert atlas.charger(chemin, cle) is None
@@ -0,0 +1,33 @@
+# =====================================================
+#  test_balayage.py – Axes et cache des balayages
+# =====================================================
+
+import pytest
+
+import balayage
+from balayage import CacheResultats, _lire_axe, balayer, grille
+
+
+def test_valeur_non_entiere_refusee():
+    with pytest.raises(ValueError):
+        _lire_axe("pas_depart=70.5")
+    with pytest.raises(ValueError):
+        _lire_axe("pas_depart=50.5:90")
+    assert _lire_axe("pas_depart=60,70.0") == ("pas_depart", [60, 70])
+    assert _lire_axe("epique_pente=1") == ("epique_pente", [1.0])
+
+
+def test_axe_cout_de_salle():
+    configs = grille(dict([_lire_axe("couts_gemmes.VAULT=0,3"), _lire_axe("pas_depart=60")]))
+    assert [(r.couts_gemmes, r.pas_depart) for r in configs] == [((("VAULT", 0),), 60), ((("VAULT", 3),), 60)]
+    with pytest.raises(ValueError):
+        _lire_axe("couts_gemmes.INCONNUE=1")
+
+
+def test_cache_invalide_par_la_version_du_moteur(tmp_path, monkeypatch):
+    cache = CacheResultats(str(tmp_path))
+    configs = grille({"pas_depart": [60]})
+    assert balayer(configs, "aleatoire", 4, processus=1, cache=cache, taille_bloc=2)[0].blocs_calcules == 2
+    assert balayer(configs, "aleatoire", 4, processus=1, cache=cache, taille_bloc=2)[0].blocs_calcules == 0
+    monkeypatch.setattr(balayage, "VERSION_MOTEUR", balayage.VERSION_MOTEUR + 1)
+    assert balayer(configs, "aleatoire", 4, processus=1, cache=cache, taille_bloc=2)[0].blocs_calcules == 2
@@ -0,0 +1,28 @@
+# =====================================================
+#  test_campagne.py – Reprise d'une campagne interrompue
+# =====================================================
+
+from campagne import Campagne
+
+
+def test_reprise_au_dernier_lot_ecrit(tmp_path):
+    chemin = str(tmp_path / "campagnes.db")
+    with Campagne(str(tmp_path / "temoin.db"), "c", graine=3) as temoin:
+        attendus = temoin.jouer(5, taille_lot=2)
+
+    c = Campagne(chemin, "c", graine=3)
+    c.jouer(2, taille_lot=2)
+    perdu = c.jouer_jour()
+    # Arrêt brutal : le jour 2, joué en mémoire, n'a pas été écrit
+    c.conn.close()
+
+    with Campagne(chemin, "c") as c:
+        assert c.prochain_jour == 2
+        assert c.jour(1) == attendus[1] and c.jour(2) is None
+        rejoues = c.jouer(3, taille_lot=2)
+    assert rejoues[0] == perdu
+    assert rejoues == attendus[2:]
+
+    with Campagne(chemin, "c") as c:
+        assert [c.jour(n) for n in range(5)] == attendus
+        assert c.prochain_jour == 5
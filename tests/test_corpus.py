@@ -0,0 +1,30 @@
+# =====================================================
+#  test_corpus.py – Construction du corpus de rejeux
+# =====================================================
+
+import io
+
+import pytest
+
+from corpus import Corpus, ajouter
+from moteur import Partie
+from politiques import creer_politique
+from rejeu import enregistrer
+
+
+def rejeu(graine: int) -> bytes:
+    partie = Partie(graine)
+    flux = io.BytesIO()
+    enregistrer(partie, flux, "glouton")
+    partie.jouer(creer_politique("glouton", graine))
+    return flux.getvalue()
+
+
+@pytest.mark.parametrize("fin", [lambda d: d[:3], lambda d: d[:12], lambda d: d[:-2], lambda d: d[:len(d) // 2]])
+def test_rejeu_incomplet_en_fin_de_fichier_ignore(tmp_path, fin):
+    chemin = tmp_path / "rejeux.bpr"
+    chemin.write_bytes(rejeu(0) + rejeu(1) + fin(rejeu(2)))
+    assert ajouter(str(tmp_path / "corpus"), [str(chemin)]) == 2
+    with Corpus(str(tmp_path / "corpus")) as corpus:
+        assert len(corpus) == 2
+        assert [r.graine for r in corpus.rejeux()] == [0, 1]
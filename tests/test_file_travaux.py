@@ -0,0 +1,38 @@
+# =====================================================
+#  test_file_travaux.py – Reprise des travaux interrompus
+# =====================================================
+
+from file_travaux import ATTENTE, ECHEC, EN_COURS, FileTravaux
+from regles import Regles
+
+
+def file_un_travail(tmp_path) -> FileTravaux:
+    file = FileTravaux(str(tmp_path / "file.db"))
+    assert file.ajouter("c", [Regles()], "glouton", 10, taille_bloc=10) == 1
+    return file
+
+
+def test_travail_qui_tue_son_travailleur_finit_en_echec(tmp_path):
+    file = file_un_travail(tmp_path)
+    try:
+        # Chaque lancer reprend le travail laissé en cours par un travailleur mort
+        for _ in range(2):
+            assert file.reclamer("mort") is not None
+            assert file.reprendre(delai=0, max_tentatives=2) == 1
+        assert file.etat() == {ECHEC: 1}
+        assert file.reclamer("suivant") is None
+    finally:
+        file.fermer()
+
+
+def test_reprise_laisse_les_travaux_recents(tmp_path):
+    file = file_un_travail(tmp_path)
+    try:
+        assert file.reclamer("vivant") is not None
+        # Un second lancer ne vole pas le travail en cours du premier
+        assert file.reprendre(delai=60) == 0
+        assert file.etat() == {EN_COURS: 1}
+        assert file.reprendre(delai=0) == 1
+        assert file.etat() == {ATTENTE: 1}
+    finally:
+        file.fermer()
@@ -0,0 +1,120 @@
+# =====================================================
+#  test_moteur.py – États terminaux du moteur
+# =====================================================
+
+import random
+
+import pytest
+
+from doors import Door, DoorState, Orientation, Rarity, Room, Rooms
+from evenements import PartieTerminee
+from moteur import ANTI_POS, MAX_ACTIONS, Action, Partie, Phase, TypeAction, apply_room_loot
+from politiques import creer_politique
+from regles import Regles
+
+
+def salle(portes, effets=None, cle="SPARE_ROOM") -> Room:
+    """Salle sans effet dont les portes sont {direction: état}."""
+    doors = {d: Door(Rarity.COMMON, etat) for d, etat in portes.items()}
+    return Room(spec=Rooms.ROOMS_DB[cle], doors=doors, effects=dict(effets or {}))
+
+
+def placer(partie: Partie, r: int, c: int, room: Room) -> None:
+    partie.grille[r][c] = room
+    partie.joueur.ligne, partie.joueur.colonne = r, c
+
+
+def fins(partie: Partie) -> list:
+    resultats = []
+    partie.bus.abonner(PartieTerminee, lambda evt: resultats.append(evt.victoire))
+    return resultats
+
+
+def test_victoire_en_entrant_dans_l_antichambre():
+    partie = Partie(1)
+    placer(partie, ANTI_POS[0] + 1, ANTI_POS[1], salle({Orientation.N: DoorState.UNLOCKED,
+                                                         Orientation.S: DoorState.UNLOCKED}))
+    resultats = fins(partie)
+    partie.appliquer(Action.deplacer(Orientation.N))
+    assert partie.phase == Phase.VICTOIRE
+    assert resultats == [True]
+
+
+def test_defaite_quand_les_pas_sont_epuises():
+    partie = Partie(1)
+    partie.grille[4][2] = salle({Orientation.N: DoorState.UNLOCKED, Orientation.S: DoorState.UNLOCKED})
+    placer(partie, 5, 2, salle({Orientation.N: DoorState.UNLOCKED, Orientation.S: DoorState.UNLOCKED}))
+    partie.joueur.pas = 1
+    resultats = fins(partie)
+    partie.appliquer(Action.deplacer(Orientation.N))
+    assert partie.phase == Phase.DEFAITE
+    assert resultats == [False]
+
+
+def test_defaite_quand_le_joueur_est_bloque():
+    # Seule porte verrouillée, ni clé ni kit, rien à ramasser : plus aucun coup utile
+    partie = Partie(1)
+    placer(partie, 4, 2, salle({Orientation.N: DoorState.LOCKED}))
+    assert partie.deplacements_legaux() == ()
+    assert partie.interactions_utiles() == ()
+    resultats = fins(partie)
+    partie.appliquer(Action.interagir(0))
+    assert partie.phase == Phase.DEFAITE
+    assert resultats == [False]
+
+
+def test_pas_bloque_avec_une_cle():
+    partie = Partie(1)
+    placer(partie, 4, 2, salle({Orientation.N: DoorState.DOUBLE_LOCKED}))
+    partie.joueur.cles = 1
+    partie.appliquer(Action.interagir(0))
+    assert partie.phase == Phase.DEPLACEMENT
+    assert partie.deplacements_legaux() == (Orientation.N,)
+
+
+def test_teleportation_jamais_dans_l_antichambre():
+    partie = Partie(1)
+    pad = salle({Orientation.N: DoorState.UNLOCKED}, {"teleport": True})
+    placer(partie, 4, 2, pad)
+    j = partie.joueur
+    # Seules salles : l'entrée, l'antichambre et la salle courante
+    for graine in range(50):
+        j.ligne, j.colonne = 4, 2
+        apply_room_loot(j, pad, partie.grille, random.Random(graine))
+        assert (j.ligne, j.colonne) != ANTI_POS
+
+    partie.grille[8][2] = None
+    j.ligne, j.colonne = 4, 2
+    assert apply_room_loot(j, pad, partie.grille, random.Random(0)) == \
+        "Teleportation failed (no other room discovered)."
+    assert (j.ligne, j.colonne) == (4, 2)
+
+
+@pytest.mark.parametrize("politique", ["aleatoire", "glouton"])
+def test_les_parties_se_terminent(politique):
+    for graine in range(20):
+        partie = Partie(graine)
+        resultats = fins(partie)
+        partie.jouer(creer_politique(politique, graine))
+        assert partie.terminee
+        assert partie.nb_actions <= MAX_ACTIONS
+        assert len(resultats) == 1
+
+
+def test_glouton_atteint_l_antichambre():
+    # Avec les règles par défaut, aucune porte des lignes 1 et 2 n'est ouverte :
+    # une victoire demande le kit de crochetage et des clés. Portes moins
+    # souvent verrouillées ici (glouton : 8 victoires sur 3000 graines)
+    regles = Regles(commun_pente=0.5, epique_pente=0.5)
+    partie = Partie(59, regles=regles).jouer(creer_politique("glouton", 59))
+    assert partie.phase == Phase.VICTOIRE
+
+
+@pytest.mark.parametrize("action", [Action(TypeAction.DEPLACER, -4), Action(TypeAction.CHOISIR, -1),
+                                    Action(TypeAction.INTERAGIR, -1)])
+def test_argument_negatif_refuse_sans_effet(action):
+    partie = Partie(1)
+    with pytest.raises(ValueError):
+        partie.appliquer(action)
+    assert partie.nb_actions == 0
+    assert (partie.joueur.ligne, partie.joueur.colonne) == (8, 2)
@@ -0,0 +1,86 @@
+# =====================================================
+#  test_rejeu.py – Enregistrement et vérification des rejeux
+# =====================================================
+
+import io
+from typing import Tuple
+
+import pytest
+
+from moteur import Partie
+from politiques import creer_politique
+from rejeu import EtatFinal, enregistrer, lire_rejeux, main, verifier
+
+
+def partie_enregistree(graine: int, politique: str = "glouton") -> Tuple[Partie, bytes]:
+    partie = Partie(graine)
+    flux = io.BytesIO()
+    enregistrer(partie, flux, politique)
+    partie.jouer(creer_politique(politique, graine))
+    return partie, flux.getvalue()
+
+
+@pytest.mark.parametrize("graine", range(5))
+def test_aller_retour(graine):
+    partie, donnees = partie_enregistree(graine)
+    (rejeu,) = lire_rejeux(io.BytesIO(donnees))
+    assert rejeu.graine == graine
+    assert rejeu.politique == "glouton"
+    assert len(rejeu.actions) == partie.nb_actions
+    assert rejeu.etat_final == EtatFinal.depuis(partie)
+    assert verifier(rejeu) == (True, "")
+
+
+def test_rejeux_concatenes():
+    donnees = b"".join(partie_enregistree(g)[1] for g in range(3))
+    rejeux = list(lire_rejeux(io.BytesIO(donnees)))
+    assert [r.graine for r in rejeux] == [0, 1, 2]
+    assert all(verifier(r)[0] for r in rejeux)
+
+
+def test_rejeu_tronque_dans_les_actions():
+    _, donnees = partie_enregistree(0)
+    (rejeu,) = lire_rejeux(io.BytesIO(donnees[:len(donnees) // 2]))
+    assert rejeu.etat_final is None
+    assert verifier(rejeu) == (False, "rejeu incomplet (pas d'état final)")
+
+
+@pytest.mark.parametrize("coupe", [1, 2, 3, 4])
+def test_rejeu_tronque_dans_le_crc(coupe):
+    # Écrivain interrompu entre l'état final et le CRC : rejeu incomplet, pas perdu
+    partie, donnees = partie_enregistree(0)
+    (rejeu,) = lire_rejeux(io.BytesIO(donnees[:-coupe]))
+    assert rejeu.etat_final is None
+    assert len(rejeu.actions) == partie.nb_actions
+
+
+def test_crc_invalide():
+    _, donnees = partie_enregistree(0)
+    donnees = donnees[:-1] + bytes([donnees[-1] ^ 1])
+    with pytest.raises(ValueError, match="CRC"):
+        list(lire_rejeux(io.BytesIO(donnees)))
+
+
+def test_rejeu_tronque_dans_l_entete():
+    _, donnees = partie_enregistree(0)
+    with pytest.raises(ValueError, match="tronqué"):
+        list(lire_rejeux(io.BytesIO(donnees[:8])))
+
+
+def test_verificateur_signale_les_fichiers_tronques(tmp_path, capsys):
+    _, donnees = partie_enregistree(0)
+    (tmp_path / "complet.bpr").write_bytes(donnees)
+    (tmp_path / "entete.bpr").write_bytes(donnees[:8])
+    (tmp_path / "fin.bpr").write_bytes(donnees[:-6])
+    assert main(["verifier", str(tmp_path / "complet.bpr")]) == 0
+    fichiers = [str(tmp_path / n) for n in ("complet.bpr", "entete.bpr", "fin.bpr")]
+    assert main(["verifier"] + fichiers) == 1
+    assert "1/3 rejeux conformes" in capsys.readouterr().out
+
+
+def test_etat_final_modifie_detecte():
+    _, donnees = partie_enregistree(0)
+    (rejeu,) = lire_rejeux(io.BytesIO(donnees))
+    rejeu.actions.pop()
+    ok, raison = verifier(rejeu)
+    assert not ok and raison.startswith("état final")
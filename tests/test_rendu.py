@@ -0,0 +1,88 @@
+# =====================================================
+#  test_rendu.py – Zones redessinées par RenduPartiel
+# =====================================================
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg
+import pytest
+
+import interface
+from doors import Orientation
+from interface import RenduPartiel
+from moteur import Partie
+
+
+@pytest.fixture(scope="module", autouse=True)
+def affichage():
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    yield
+    pg.display.quit()
+
+
+def test_zone_redessinee_seulement_si_sa_signature_change():
+    rendu = RenduPartiel()
+    appels = []
+    rect = pg.Rect(0, 0, 4, 4)
+    rendu.zone("a", rect, 1, appels.append, "dessin")
+    assert appels == ["dessin"] and rendu.zones == [rect]
+    rendu.complet = False
+    rendu.zones.clear()
+
+    rendu.zone("a", rect, 1, appels.append, "dessin")
+    assert len(appels) == 1 and rendu.zones == []
+    rendu.zone("a", rect, 2, appels.append, "dessin")
+    assert len(appels) == 2 and rendu.zones == [rect]
+
+    rendu.invalider()
+    rendu.zone("a", rect, 2, appels.append, "dessin")
+    assert len(appels) == 3
+
+
+def test_plateau_ne_redessine_que_les_cases_modifiees(monkeypatch):
+    dessinees = []
+    monkeypatch.setattr(interface, "draw_cell", lambda screen, r, c, *args: dessinees.append((r, c)))
+    partie = Partie(0)
+    ecran = pg.Surface((interface.W, interface.H))
+    rendu = RenduPartiel()
+
+    def image(direction=Orientation.N):
+        dessinees.clear()
+        interface.render_board(rendu, ecran, partie.grille, partie.joueur, None, None, direction)
+        rendu.complet = False
+        return list(dessinees)
+
+    assert len(image()) == interface.ROWS * interface.COLS
+    assert image() == []
+    # Seule la case du joueur dépend de la direction choisie
+    assert image(Orientation.E) == [(partie.joueur.ligne, partie.joueur.colonne)]
+
+
+def test_barre_laterale_suit_l_inventaire_observe(monkeypatch):
+    dessines = []
+    monkeypatch.setattr(interface, "draw_inventory_header", lambda *args: dessines.append("entete"))
+    monkeypatch.setattr(interface, "draw_permanents", lambda *args: dessines.append("permanents"))
+    monkeypatch.setattr(interface, "draw_counter", lambda *args: dessines.append(interface.INVENTAIRE_CONSOMMABLES[args[-1]][0]))
+    monkeypatch.setattr(interface, "draw_room_name", lambda *args: dessines.append("salle"))
+    monkeypatch.setattr(interface, "draw_message", lambda *args: dessines.append("message"))
+    ecran = pg.Surface((interface.W, interface.H))
+    rendu = RenduPartiel()
+    partie = Partie(0, observe=True)
+
+    def image():
+        dessines.clear()
+        interface.render_sidebar(rendu, ecran, None, None, partie.joueur, "Entrance Hall", {}, "", None, 0)
+        rendu.complet = False
+        return list(dessines)
+
+    assert len(image()) == 4 + len(interface.INVENTAIRE_CONSOMMABLES)
+    assert image() == []
+    partie.joueur.cles += 1
+    assert image() == ["cles"]
+
+    # Un joueur ordinaire ne signale pas ses changements : refusé
+    with pytest.raises(AssertionError):
+        interface.render_sidebar(rendu, ecran, None, None, Partie(0).joueur, "", {}, "", None, 0)
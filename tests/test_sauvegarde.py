@@ -0,0 +1,80 @@
+# =====================================================
+#  test_sauvegarde.py – Instantanés binaires de l'état complet
+# =====================================================
+
+import pytest
+
+from evenements import CoupJoue
+from moteur import Partie, Phase
+from politiques import creer_politique
+from rejeu import EtatFinal
+from sauvegarde import SauvegardeAuto, charger, lire_fichier, sauver
+
+
+def avancer(partie: Partie, politique, nb_actions: int, jusqu_a=None) -> None:
+    """Joue nb_actions coups (moins si la partie se termine ou si jusqu_a(partie) devient vrai)."""
+    vue = partie.vue()
+    for _ in range(nb_actions):
+        if partie.terminee or (jusqu_a is not None and jusqu_a(partie)):
+            return
+        partie.appliquer(politique.decider(vue))
+
+
+def continuer_a_l_identique(originale: Partie, copie: Partie, politique) -> None:
+    """Finit originale avec la politique et applique les mêmes coups à copie."""
+    actions = []
+    originale.bus.abonner(CoupJoue, lambda evt: actions.append(evt.action))
+    originale.jouer(politique)
+    for action in actions:
+        copie.appliquer(action)
+
+
+@pytest.mark.parametrize("crn", [False, True])
+@pytest.mark.parametrize("graine", range(4))
+def test_reencodage_identique_et_suite_identique(graine, crn):
+    partie = Partie(graine, crn=crn)
+    politique = creer_politique("glouton", graine)
+    avancer(partie, politique, 12)
+    instantane = sauver(partie)
+    copie = charger(instantane)
+    assert sauver(copie) == instantane
+
+    continuer_a_l_identique(partie, copie, politique)
+    assert copie.terminee
+    assert EtatFinal.depuis(copie) == EtatFinal.depuis(partie)
+    assert sauver(copie) == sauver(partie)
+
+
+def test_instantane_pendant_un_tirage():
+    for graine in range(20):
+        partie = Partie(graine)
+        politique = creer_politique("aleatoire", graine)
+        avancer(partie, politique, 200, jusqu_a=lambda p: p.phase == Phase.TIRAGE)
+        if partie.phase == Phase.TIRAGE:
+            break
+    else:
+        pytest.skip("aucun tirage atteint")
+    copie = charger(sauver(partie))
+    assert copie.phase == Phase.TIRAGE
+    assert [(s.key, r) for s, r in copie.tirage] == [(s.key, r) for s, r in partie.tirage]
+    continuer_a_l_identique(partie, copie, politique)
+    assert sauver(copie) == sauver(partie)
+
+
+def test_instantane_invalide():
+    donnees = bytearray(sauver(Partie(1)))
+    donnees[:4] = b"XXXX"
+    with pytest.raises(ValueError):
+        charger(bytes(donnees))
+
+
+def test_sauvegarde_automatique(tmp_path):
+    chemin = str(tmp_path / "auto.bps")
+    partie = Partie(3)
+    auto = SauvegardeAuto(chemin)
+    auto.brancher(partie)
+    partie.jouer(creer_politique("glouton", 3))
+    auto.fermer()
+    assert auto.erreur is None
+    # Dernier instantané : celui qui suit la dernière salle posée
+    assert lire_fichier(chemin).nb_salles() == partie.nb_salles()
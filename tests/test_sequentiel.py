@@ -0,0 +1,33 @@
+# =====================================================
+#  test_sequentiel.py – Élimination sur graines communes
+# =====================================================
+
+import math
+import random
+
+from sequentiel import eliminer
+
+
+def bruit(graine: int) -> float:
+    """Aléa commun à tous les bras pour une même graine."""
+    return random.Random(graine).uniform(0, 10)
+
+
+def jouer(decalage, graine_depart, nb):
+    return [bruit(g) + decalage for g in range(graine_depart, graine_depart + nb)]
+
+
+def test_ecart_apparie_elimine_malgre_intervalles_chevauchants():
+    res = eliminer([0.1, 0.0], jouer, metrique=lambda x: x, cible=1e-6,
+                   paquet_initial=1000, max_parties=1000, min_parties=1000)
+    # Intervalles de chaque bras larges et chevauchants, mais l'écart est constant
+    assert res[0.0].haut > res[0.1].bas
+    assert res[0.0].elimine and not res[0.1].elimine
+
+
+def test_bras_unique_donne_un_intervalle_fini():
+    res = eliminer([0.0], jouer, metrique=lambda x: x, cible=0.5,
+                   paquet_initial=200, max_parties=5000, min_parties=200)
+    r = res[0.0]
+    assert r.parties >= 200 and r.cible_atteinte
+    assert math.isfinite(r.bas) and math.isfinite(r.haut)
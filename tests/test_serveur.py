@@ -0,0 +1,167 @@
+# =====================================================
+#  test_serveur.py – Sessions du serveur asyncio, éviction et trames invalides
+# =====================================================
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from moteur import Action, Partie, TypeAction
+from politiques import creer_politique
+from serveur import ACTION, JSON, TRAME_ACTION, Client, Serveur, trame
+from synchro import Spectateur
+
+
+def avec_serveur(dossier, test):
+    """Lance un Serveur en TCP sur un port libre, exécute test(serveur, port) et l'arrête."""
+    async def executer():
+        serveur = Serveur(str(dossier))
+        await serveur.demarrer(port=0)
+        try:
+            await asyncio.wait_for(test(serveur, serveur.adresses[0][1]), 30)
+        finally:
+            await serveur.arreter()
+    asyncio.run(executer())
+
+
+async def requete_brute(client: Client, contenu: bytes) -> dict:
+    """Envoie une trame JSON telle quelle et renvoie la réponse."""
+    futur = asyncio.get_running_loop().create_future()
+    client._reponses.append(futur)
+    client.writer.write(trame(JSON, contenu))
+    return await futur
+
+
+def test_session_jouee_et_suivie(tmp_path):
+    async def test(serveur, port):
+        joueur = await Client.connecter(port=port)
+        spectateur_client = await Client.connecter(port=port)
+        session = await joueur.creer(7)
+        await joueur.delta(session)
+        await spectateur_client.rejoindre(session)
+        spectateur = Spectateur()
+        assert spectateur.recevoir((await spectateur_client.delta(session))[1])
+
+        locale = Partie(7)
+        politique = creer_politique("glouton", 7)
+        vue = locale.vue()
+        while not locale.terminee and locale.nb_actions < 50:
+            action = politique.decider(vue)
+            locale.appliquer(action)
+            await joueur.jouer(session, action)
+            assert spectateur.recevoir((await spectateur_client.delta(session))[1])
+
+        etat = spectateur.etat()
+        j = locale.joueur
+        assert (int(etat["pas"]), int(etat["gemmes"]), int(etat["nb_actions"])) == \
+            (j.pas, j.gemmes, locale.nb_actions)
+        await joueur.fermer()
+        await spectateur_client.fermer()
+
+    avec_serveur(tmp_path, test)
+
+
+def test_eviction_garde_les_abonnes(tmp_path):
+    async def test(serveur, port):
+        joueur = await Client.connecter(port=port)
+        spectateur_client = await Client.connecter(port=port)
+        session = await joueur.creer(3)
+        await joueur.delta(session)
+        await spectateur_client.rejoindre(session)
+        spectateur = Spectateur()
+        spectateur.recevoir((await spectateur_client.delta(session))[1])
+
+        locale = Partie(3)
+        politique = creer_politique("glouton", 3)
+        action = politique.decider(locale.vue())
+        locale.appliquer(action)
+        await joueur.jouer(session, action)
+        spectateur.recevoir((await spectateur_client.delta(session))[1])
+
+        assert await serveur.evincer() == 1
+        assert session not in serveur.sessions
+        assert os.path.exists(serveur._chemin(session))
+
+        # L'action suivante recharge la session ; le spectateur reçoit
+        # encore les deltas et se resynchronise sur l'image clé
+        action = politique.decider(locale.vue())
+        locale.appliquer(action)
+        await joueur.jouer(session, action)
+        assert session in serveur.sessions
+        assert spectateur.recevoir((await spectateur_client.delta(session))[1])
+        assert int(spectateur.etat()["nb_actions"]) == locale.nb_actions
+
+        await joueur.fermer_session(session)
+        assert session not in serveur.abonnes
+        assert not os.path.exists(serveur._chemin(session))
+        await joueur.fermer()
+        await spectateur_client.fermer()
+
+    avec_serveur(tmp_path, test)
+
+
+def test_trames_invalides(tmp_path):
+    async def test(serveur, port):
+        client = await Client.connecter(port=port)
+        session = await client.creer(1)
+        await client.delta(session)
+
+        # Trame ACTION trop courte : erreur, la connexion reste utilisable
+        client.writer.write(trame(ACTION, TRAME_ACTION.pack(session, 0, 0)[:3]))
+        with pytest.raises(RuntimeError, match="Trame ACTION"):
+            await client.delta(None)
+
+        assert "erreur" in await requete_brute(client, b"[1, 2]")
+        assert "erreur" in await requete_brute(client, b"\xff")
+        assert "erreur" in await requete_brute(client, json.dumps({"op": "creer", "regles": 3}).encode())
+        assert "erreur" in await requete_brute(client, json.dumps({"op": "rejoindre", "session": "x"}).encode())
+        with pytest.raises(RuntimeError, match="session inconnue"):
+            await client.rejoindre(session + 1)
+
+        # Identifiant de session en texte
+        reponse = await requete_brute(client, json.dumps({"op": "fermer", "session": str(session)}).encode())
+        assert reponse == {"session": session}
+        assert session not in serveur.sessions
+        await client.fermer()
+
+    avec_serveur(tmp_path, test)
+
+
+@pytest.mark.parametrize("graine", ["abc", 1.5, 2 ** 70, True])
+def test_graine_invalide_refusee(tmp_path, graine):
+    async def test(serveur, port):
+        client = await Client.connecter(port=port)
+        reponse = await requete_brute(client, json.dumps({"op": "creer", "graine": graine}).encode())
+        assert reponse["erreur"].startswith("Graine invalide")
+        assert not serveur.sessions
+        await client.fermer()
+
+    avec_serveur(tmp_path, test)
+
+
+def test_session_non_sauvable_gardee_en_memoire(tmp_path):
+    async def test(serveur, port):
+        bonne = serveur.creer(1)
+        mauvaise = serveur.creer(2)
+        serveur.sessions[mauvaise].partie.graine = "pas un entier"
+        assert await serveur.evincer() == 1
+        assert bonne not in serveur.sessions and os.path.exists(serveur._chemin(bonne))
+        assert mauvaise in serveur.sessions
+        del serveur.sessions[mauvaise]
+
+    avec_serveur(tmp_path, test)
+
+
+def test_action_a_argument_negatif_refusee(tmp_path):
+    async def test(serveur, port):
+        client = await Client.connecter(port=port)
+        session = await client.creer(5)
+        await client.delta(session)
+        texte, _ = await client.jouer(session, Action(TypeAction.DEPLACER, -4))
+        assert texte.startswith("Action refusée")
+        assert serveur.sessions[session].partie.nb_actions == 0
+        await client.fermer()
+
+    avec_serveur(tmp_path, test)
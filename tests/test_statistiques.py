@@ -0,0 +1,20 @@
+# =====================================================
+#  test_statistiques.py – Différences appariées
+# =====================================================
+
+from statistiques import resume_apparie
+
+
+def test_reduction_indefinie_sans_variance():
+    s = resume_apparie([0] * 50, [0] * 50)
+    assert s["correlation"] is None and s["reduction_variance"] is None
+    s = resume_apparie([x % 3 for x in range(50)], [x % 3 + 1 for x in range(50)])
+    assert s["difference"] == -1 and s["reduction_variance"] is None
+    assert abs(s["correlation"] - 1) < 1e-9
+
+
+def test_reduction_par_appariement():
+    a = [x % 7 for x in range(100)]
+    b = [x % 7 + (x % 2) for x in range(100)]
+    s = resume_apparie(a, b)
+    assert s["reduction_variance"] > 1 and s["correlation"] > 0.9
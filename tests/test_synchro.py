@@ -0,0 +1,117 @@
+# =====================================================
+#  test_synchro.py – Deltas, pertes de messages et images clés
+# =====================================================
+
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from moteur import Partie
+from politiques import creer_politique
+from synchro import CLE, DELTA, Chronologie, Emetteur, Spectateur, entete
+
+INTERVALLE = 8
+
+
+def partie_et_messages(graine: int = 0) -> Tuple[Partie, List[bytes], List[np.ndarray]]:
+    """Partie jouée par glouton, ses messages et l'état exact après chacun."""
+    partie = Partie(graine)
+    emetteur = Emetteur(INTERVALLE)
+    messages, etats = [], []
+
+    def envoyer(message: bytes) -> None:
+        messages.append(message)
+        etats.append(etat_exact(partie))
+
+    emetteur.brancher(partie, envoyer)
+    partie.jouer(creer_politique("glouton", graine))
+    assert len(messages) > 2 * INTERVALLE
+    return partie, messages, etats
+
+
+def etat_exact(partie: Partie) -> np.ndarray:
+    spectateur = Spectateur()
+    spectateur.recevoir(Emetteur().message(partie))
+    return spectateur.vecteur
+
+
+def test_types_et_numeros():
+    _, messages, _ = partie_et_messages()
+    for i, message in enumerate(messages):
+        assert entete(message) == (CLE if i % INTERVALLE == 0 else DELTA, i)
+
+
+@pytest.mark.parametrize("graine", range(3))
+def test_spectateur_suit_la_partie(graine):
+    _, messages, etats = partie_et_messages(graine)
+    spectateur = Spectateur()
+    for message, etat in zip(messages, etats):
+        assert spectateur.recevoir(message)
+        assert np.array_equal(spectateur.vecteur, etat)
+
+
+def test_message_perdu_puis_image_cle():
+    _, messages, etats = partie_et_messages()
+    perdu = INTERVALLE + 3
+    spectateur = Spectateur()
+    for i, message in enumerate(messages):
+        if i == perdu:
+            continue
+        recu = spectateur.recevoir(message)
+        if perdu < i < 2 * INTERVALLE:
+            # Deltas ignorés jusqu'à l'image clé suivante
+            assert not recu and not spectateur.synchronise
+        else:
+            assert recu
+            assert np.array_equal(spectateur.vecteur, etats[i])
+
+
+def test_delta_avant_la_premiere_image_cle():
+    _, messages, etats = partie_et_messages()
+    spectateur = Spectateur()
+    assert not spectateur.recevoir(messages[1])
+    with pytest.raises(ValueError):
+        spectateur.etat()
+    assert spectateur.recevoir(messages[INTERVALLE])
+    assert np.array_equal(spectateur.vecteur, etats[INTERVALLE])
+
+
+def test_message_tronque():
+    _, messages, _ = partie_et_messages()
+    for message in (messages[0], messages[1]):
+        for coupe in range(1, len(message)):
+            spectateur = Spectateur()
+            if message[0] == DELTA:
+                spectateur.recevoir(messages[0])
+            with pytest.raises(ValueError):
+                spectateur.recevoir(message[:coupe])
+
+
+def test_arrivee_en_cours_de_partie():
+    partie = Partie(4)
+    emetteur = Emetteur(INTERVALLE)
+    politique = creer_politique("glouton", 4)
+    vue = partie.vue()
+    emetteur.message(partie)
+    for _ in range(INTERVALLE + 2):
+        partie.appliquer(politique.decider(vue))
+        emetteur.message(partie)
+
+    spectateur = Spectateur()
+    assert spectateur.recevoir(emetteur.image_cle(partie))
+    for _ in range(3):
+        partie.appliquer(politique.decider(vue))
+        assert spectateur.recevoir(emetteur.message(partie))
+    assert np.array_equal(spectateur.vecteur, etat_exact(partie))
+
+
+def test_chronologie():
+    _, messages, etats = partie_et_messages()
+    chronologie = Chronologie()
+    for message in messages:
+        chronologie.ajouter(message)
+    for n in (0, 1, INTERVALLE - 1, INTERVALLE, len(messages) - 1):
+        assert np.array_equal(chronologie.vecteur(n), etats[n])
+    with pytest.raises(ValueError):
+        chronologie.ajouter(messages[0])
@@ -0,0 +1,232 @@
+# =====================================================
+#  traces.py – Zones de traçage légères (format Chrome trace)
+# =====================================================
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import collections
+import functools
+import json
+import os
+import re
+import sys
+import threading
+from time import monotonic_ns
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+# Variable d'environnement BLUEPRINCE_TRACES :
+#   absente ou vide : traçage possible mais inactif (voir activer()) ;
+#                     une fonction décorée coûte un appel et un test de plus
+#   "0"             : @trace renvoie la fonction telle quelle, aucun coût
+#   un chemin       : traçage actif dès l'import, exporté dans ce fichier
+#                     à la sortie du programme ; chaque processus de travail
+#                     (multiprocessing, ProcessPoolExecutor) écrit le sien dans
+#                     <chemin>.<pid>, fusionné dans <chemin> par le processus
+#                     principal (voir fusionner)
+#
+# Chaque zone est rangée dans un tampon circulaire (les plus anciennes sont
+# écrasées) sous la forme (nom, début en ns, durée en ns, thread).
+ENV = "BLUEPRINCE_TRACES"
+TRACES_POSSIBLES = os.environ.get(ENV, "") != "0"
+
+Zone = Tuple[str, int, int, int]
+
+_tampon: Optional[Deque[Zone]] = None
+
+
+def activer(capacite: int = 1 << 20) -> None:
+    """Commence à enregistrer les zones (les capacite dernières sont gardées)."""
+    global _tampon
+    _tampon = collections.deque(maxlen=capacite)
+
+
+def desactiver() -> List[Zone]:
+    """Arrête l'enregistrement et renvoie les zones enregistrées."""
+    global _tampon
+    zones, _tampon = list(_tampon or ()), None
+    return zones
+
+
+def actif() -> bool:
+    return _tampon is not None
+
+
+def zones() -> List[Zone]:
+    return list(_tampon or ())
+
+
+# ==========================
+#  INSTRUMENTATION
+# ==========================
+
+def trace(nom: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Décorateur : enregistre une zone à chaque appel de la fonction."""
+    def decorer(f: Callable) -> Callable:
+        if not TRACES_POSSIBLES:
+            return f
+        n = nom or f.__qualname__
+
+        @functools.wraps(f)
+        def enveloppe(*args, **kwargs):
+            t = _tampon
+            if t is None:
+                return f(*args, **kwargs)
+            debut = monotonic_ns()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                t.append((n, debut, monotonic_ns() - debut, threading.get_ident()))
+        return enveloppe
+    return decorer
+
+
+class _Zone:
+    __slots__ = ("nom", "tampon", "debut")
+
+    def __init__(self, nom: str, tampon: Deque[Zone]):
+        self.nom = nom
+        self.tampon = tampon
+
+    def __enter__(self) -> None:
+        self.debut = monotonic_ns()
+
+    def __exit__(self, *exc) -> None:
+        self.tampon.append((self.nom, self.debut, monotonic_ns() - self.debut, threading.get_ident()))
+
+
+class _ZoneVide:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_ZONE_VIDE = _ZoneVide()
+
+
+def zone(nom: str):
+    """Gestionnaire de contexte : with zone("serveur.action"): ..."""
+    t = _tampon
+    return _ZONE_VIDE if t is None else _Zone(nom, t)
+
+
+# ==========================
+#  EXPORT ET LECTURE
+# ==========================
+
+def exporter(chemin: str, zones_: Optional[List[Zone]] = None) -> int:
+    """
+    Écrit les zones au format Chrome trace-event (à ouvrir dans
+    chrome://tracing ou https://ui.perfetto.dev). Renvoie le nombre de zones.
+    """
+    zones_ = zones() if zones_ is None else zones_
+    pid = os.getpid()
+    evenements = [{"name": n, "ph": "X", "ts": debut / 1000, "dur": duree / 1000, "pid": pid, "tid": tid}
+                  for n, debut, duree, tid in zones_]
+    evenements.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": os.path.basename(sys.argv[0])}})
+    tmp = chemin + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": evenements, "displayTimeUnit": "ns"}, f)
+    os.replace(tmp, chemin)
+    return len(zones_)
+
+
+def fusionner(chemin: str) -> int:
+    """
+    Ajoute à chemin les fichiers chemin.<pid> écrits par les processus de
+    travail, puis les supprime. Renvoie le nombre de zones ajoutées.
+    """
+    dossier, nom = os.path.split(os.path.abspath(chemin))
+    motif = re.compile(re.escape(nom) + r"\.\d+")
+    parties = sorted(f for f in os.listdir(dossier) if motif.fullmatch(f))
+    if not parties:
+        return 0
+    with open(chemin, encoding="utf-8") as f:
+        trace_ = json.load(f)
+    ajoutees = 0
+    for partie in parties:
+        with open(os.path.join(dossier, partie), encoding="utf-8") as f:
+            evenements = json.load(f)["traceEvents"]
+        trace_["traceEvents"].extend(evenements)
+        ajoutees += sum(e.get("ph") == "X" for e in evenements)
+    tmp = chemin + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(trace_, f)
+    os.replace(tmp, chemin)
+    for partie in parties:
+        os.remove(os.path.join(dossier, partie))
+    return ajoutees
+
+
+def lire(chemin: str) -> List[Zone]:
+    """Zones d'un fichier écrit par exporter()."""
+    with open(chemin, encoding="utf-8") as f:
+        evenements = json.load(f)["traceEvents"]
+    return [(e["name"], round(e["ts"] * 1000), round(e["dur"] * 1000), e["tid"])
+            for e in evenements if e.get("ph") == "X"]
+
+
+def resume(zones_: List[Zone]) -> Dict[str, Dict[str, float]]:
+    """Par nom de zone : nombre, durée totale (ms), moyenne, p50 et p99 (µs)."""
+    durees: Dict[str, List[int]] = collections.defaultdict(list)
+    for n, _, duree, _ in zones_:
+        durees[n].append(duree)
+    resultat = {}
+    for n, d in durees.items():
+        d.sort()
+        resultat[n] = {
+            "nb": len(d),
+            "total_ms": sum(d) / 1e6,
+            "moyenne_us": sum(d) / len(d) / 1e3,
+            "p50_us": d[len(d) // 2] / 1e3,
+            "p99_us": d[min(len(d) - 1, int(len(d) * 0.99))] / 1e3,
+        }
+    return dict(sorted(resultat.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+
+def _exporter_env() -> None:
+    if multiprocessing.parent_process() is not None:
+        # Processus de travail : fusionné par le processus principal
+        exporter(f"{_chemin_env}.{os.getpid()}")
+        return
+    exporter(_chemin_env)
+    fusionner(_chemin_env)
+
+
+def _apres_fork(_) -> None:
+    # Un processus créé par fork repart d'un tampon vide (les zones héritées
+    # sont celles du parent) et sort sans passer par atexit
+    activer()
+    util.Finalize(None, _exporter_env, exitpriority=0)
+
+
+_chemin_env = os.environ.get(ENV, "")
+if _chemin_env not in ("", "0"):
+    import multiprocessing
+    from multiprocessing import util
+
+    activer()
+    atexit.register(_exporter_env)
+    util.register_after_fork(_apres_fork, _apres_fork)
+
+# ======
+#  MAIN
+# ======
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Résumé d'un fichier de traces (format Chrome).")
+    parser.add_argument("fichier")
+    args = parser.parse_args(argv)
+    print(f"{'zone':<32} {'nb':>9} {'total ms':>10} {'moy µs':>9} {'p50 µs':>9} {'p99 µs':>9}")
+    for n, r in resume(lire(args.fichier)).items():
+        print(f"{n:<32} {r['nb']:>9} {r['total_ms']:>10.1f} {r['moyenne_us']:>9.1f} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())